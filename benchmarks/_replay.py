@@ -0,0 +1,76 @@
+"""Replay console logfiles through the game event handlers, without curses."""
+
+# mypy: ignore-errors
+
+from argparse import Namespace
+from pathlib import Path
+
+from loguru import logger
+
+import tf2mon
+import tf2mon.game
+from tf2mon.database import Database
+from tf2mon.player import Player
+from tf2mon.playeralias import PlayerAlias
+from tf2mon.racist import load_racist_data
+from tf2mon.renderer import Renderer
+from tf2mon.role import load_weapons_data
+from tf2mon.steamplayer import SteamPlayer
+from tf2mon.steamweb import SteamWebAPI
+
+DATADIR = Path(__file__).parent.parent / "tf2mon" / "data"
+TESTDATA = Path(__file__).parent.parent / "tests" / "data"
+
+
+def options(con_logfile: Path, **kwargs) -> Namespace:
+    """Return `tf2mon.options` to run `Monitor.game` over `con_logfile`, without following."""
+
+    return Namespace(
+        **{
+            "con_logfile": con_logfile,
+            "rewind": True,
+            "follow": False,
+            "exclude_file": DATADIR / "exclude.txt",
+            "inject_cmds": None,
+            "inject_file": None,
+            "database": Path(":memory:"),
+            "check_indexes": False,
+            "breakpoint": None,
+            "search": None,
+            "single_step": False,
+            "journal": None,
+            "replay_journal": None,
+            "event_store": None,
+            "chat_history": None,
+            "game": None,
+            "headless": True,
+            "json": False,
+            **kwargs,
+        }
+    )
+
+
+def setup(player_name: str = "Bad Dad") -> None:
+    """Prepare `tf2mon` globals to run game event handlers."""
+
+    logger.remove()
+    load_weapons_data(DATADIR / "weapons.csv")
+    load_racist_data(DATADIR / "racist.txt")
+    Database(Path(":memory:"), [Player, SteamPlayer, PlayerAlias])
+    tf2mon.config = {"player_name": player_name}
+    tf2mon.steam_web_api = SteamWebAPI("")
+    tf2mon.ui = Renderer()
+    tf2mon.reset_game()
+
+
+def replay(lines: list[str]) -> int:
+    """Dispatch `lines` to the game event handlers; return number of events handled."""
+
+    nevents = 0
+    for line in lines:
+        for event in tf2mon.game.events:
+            if match := event.search(line):
+                event.handler(match)
+                nevents += 1
+                break
+    return nevents
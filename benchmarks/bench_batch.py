@@ -0,0 +1,83 @@
+"""Measure scaling of `--batch`; games played in a pool of 1 to N processes.
+
+    python -m benchmarks.bench_batch [--ngames G] [--nfiles F] [--jobs J ...] [FILE]
+
+`G` games, each `FILE` preceded by a connect and `status` rows, are split
+among `F` logfiles, and played by `run_batch` in `J` processes (default:
+1, 2, 4... up to the number of CPUs). Each run starts a new pool, so the
+cost of starting workers is included. Speedup is relative to the first.
+"""
+
+# mypy: ignore-errors
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from tf2mon.batch import run_batch
+
+from ._replay import DATADIR, TESTDATA
+
+PLAYER_NAME = "Bad Dad"
+EXCLUDE_FILE = DATADIR / "exclude.txt"
+
+
+def _game(text: str, number: int) -> str:
+    """Return game `number`; `text` preceded by a connect and `status` rows."""
+
+    names = sorted({x.split(" killed ")[0] for x in text.splitlines() if " killed " in x})
+    rows = [f'#      2 "{PLAYER_NAME}"  [U:1:42708103]  01:00  20    0 active']
+    rows += [
+        f'#    {i + 3:3} "{name}"  [U:1:{1000 * number + i % 50}]  01:00  20    0 active'
+        for i, name in enumerate(names)
+    ]
+    return "\n".join([f"{PLAYER_NAME} connected", *rows, text])
+
+
+def main() -> None:
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ngames", type=int, default=64)
+    parser.add_argument("--nfiles", type=int, default=4)
+    parser.add_argument("--jobs", type=int, nargs="+")
+    parser.add_argument("file", nargs="?", default=TESTDATA / "bots-orig")
+    args = parser.parse_args()
+
+    ncpus = os.cpu_count() or 1
+    jobs = args.jobs or [1 << i for i in range(ncpus.bit_length()) if 1 << i <= ncpus]
+    text = Path(args.file).read_text(encoding="utf-8").rstrip("\n")
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(tmp, f"console-{i}.log") for i in range(args.nfiles)]
+        for i, path in enumerate(paths):
+            games = [_game(text, x) for x in range(i, args.ngames, args.nfiles)]
+            path.write_text("\n".join(games) + "\n", encoding="utf-8")
+
+        # most jobs first; with 1, games are played (and the database opened) in
+        # this process, which later pools would then inherit.
+        results = {}
+        for njobs in sorted(jobs, reverse=True):
+            start = time.perf_counter()
+            stats = run_batch(
+                paths, {"player_name": PLAYER_NAME}, Path(tmp, "none.db"), EXCLUDE_FILE, njobs
+            )
+            results[njobs] = (time.perf_counter() - start, stats)
+
+    print(f"{args.ngames} games in {args.nfiles} files; {ncpus} CPUs")
+    base = results[min(results)][0]
+    for njobs, (elapsed, stats) in sorted(results.items()):
+        print(
+            f"{njobs:3} jobs: {stats.nlines} lines in {elapsed:.2f}s;"
+            f" {stats.nlines / elapsed:,.0f} lines/sec; speedup {base / elapsed:.2f};"
+            f" {len(stats.players)} players"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Measure the chat history; inserting chats, and searching them.
+
+    python -m benchmarks.bench_chathistory [--nchats N] [--nplayers P] [--ndays D] [--repeat R]
+
+`N` synthetic chats by `P` players, over `D` days, are queued to
+`ChatHistoryWriter`, and inserted by its thread; one in 5000 mentions a
+rare word. Each search is timed against the same search by `like` (a
+scan of chats, newest first, until enough match), for comparison. Speed
+is the best of `R` runs.
+"""
+
+# mypy: ignore-errors
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from loguru import logger
+
+from tf2mon.chathistory import ChatHistory, ChatHistoryWriter
+from tf2mon.steamid import steamid64
+
+WORDS = ["gg", "ez", "noob", "medic", "spy", "push", "cart", "nice", "shot", "hacker", "cheater"]
+
+
+def _timed(repeat, func, *args):
+    """Return best elapsed time of `repeat` calls of `func`, and its result."""
+
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed, result
+
+
+def _like(connection, sql, params):
+    """Return rows of `sql` query."""
+
+    return connection.execute(sql, params).fetchall()
+
+
+def main() -> None:
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nchats", type=int, default=500_000)
+    parser.add_argument("--nplayers", type=int, default=5000)
+    parser.add_argument("--ndays", type=int, default=180)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.remove()
+    rand = random.Random(42)
+    users = [
+        SimpleNamespace(steamid=steamid64(1000 + i), username=f"player{i}")
+        for i in range(args.nplayers)
+    ]
+    start_time = time.mktime((2022, 1, 1, 0, 0, 0, 0, 0, -1))
+    step = args.ndays * 86400 / args.nchats
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "chats.db")
+        conlog = SimpleNamespace(lineno=0, timestamp=None)
+        writer = ChatHistoryWriter(path, conlog)
+        start = time.perf_counter()
+        for lineno in range(1, args.nchats + 1):
+            conlog.lineno = lineno
+            conlog.timestamp = start_time + lineno * step
+            msg = " ".join(rand.choices(WORDS, k=rand.randint(1, 8)))
+            if not lineno % 5000:
+                msg += " freehats dot example"
+            writer.append(SimpleNamespace(user=rand.choice(users), teamflag=False, msg=msg))
+        queued = time.perf_counter() - start
+        writer.close()
+        elapsed = time.perf_counter() - start
+        print(
+            f"insert  {writer.ninserted} chats in {elapsed:.2f}s;"
+            f" {writer.ninserted / elapsed:,.0f} chats/sec; queued in {queued:.2f}s;"
+            f" {path.stat().st_size / 1e6:.1f}MB"
+        )
+
+        history = ChatHistory(path)
+        connection = sqlite3.connect(path)
+        steamid = 1007
+        for name, query, steamids, like in (
+            ("rare word", "freehats", [], "% freehats %"),
+            ("common word", "cheater", [], "% cheater %"),
+            ("phrase", '"nice shot"', [], "%nice shot%"),
+            ("steamid", "", [steamid], None),
+            ("word+steamid", "hacker", [steamid], "%hacker%"),
+        ):
+            elapsed, matches = _timed(args.repeat, history.search, query, steamids)
+            line = f"{name:13} {elapsed * 1000:7.2f}ms; {len(matches)} chats"
+            if like:
+                sql = "select * from chats where ' ' || msg || ' ' like ?"
+                params = [like]
+                if steamids:
+                    sql += " and steamid = ?"
+                    params.append(steamid)
+                sql += " order by rowid desc limit 100"
+                scan, _ = _timed(args.repeat, _like, connection, sql, params)
+                line += f"; like {scan * 1000:.2f}ms; speedup {scan / elapsed:.1f}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Measure the event store; appending kills, and querying them.
+
+    python -m benchmarks.bench_eventstore [--nkills N] [--nplayers P] [--ndays D] [--repeat R]
+
+`N` synthetic kills among `P` players (one of them `me`), over `D` days,
+are appended by `EventStoreWriter`. Each query, including reading its
+columns, is timed against the same counts taken row by row in Python.
+Speed is the best of `R` runs.
+"""
+
+# mypy: ignore-errors
+
+import argparse
+import random
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+from loguru import logger
+
+from tf2mon.eventstore import KILL_BY_ME, KILL_OF_ME, EventStore, EventStoreWriter
+from tf2mon.steamid import steamid64
+
+WEAPONS = [
+    "scout scattergun",
+    "scout +crit scattergun",
+    "sniper sniperrifle",
+    "pyro flamethrower",
+]
+
+
+def _timed(repeat, func, *args):
+    """Return best elapsed time of `repeat` calls of `func`."""
+
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed
+
+
+def _rowwise_top_opponents(store: EventStore, _count: int) -> dict:
+    """Return the `top_opponents` counts, a row at a time."""
+
+    kills = store.columns("kills", ("killer", "victim", "killer_name", "victim_name", "flags"))
+    counts = {}
+    for row in zip(*kills.values()):
+        killer, victim, killer_name, victim_name, flags = row
+        if flags & KILL_BY_ME:
+            counts.setdefault(victim or -victim_name, [0, 0])[1] += 1
+        elif flags & KILL_OF_ME:
+            counts.setdefault(killer or -killer_name, [0, 0])[0] += 1
+    return counts
+
+
+def _rowwise_weapon_states(store: EventStore, steamid: int) -> Counter:
+    """Return the `weapon_states` counts, a row at a time."""
+
+    kills = store.columns("kills", ("killer", "weapon"))
+    counts = Counter()
+    for killer, weapon in zip(kills["killer"], kills["weapon"]):
+        if killer == steamid:
+            counts[weapon] += 1
+    return counts
+
+
+def _rowwise_kill_rate(store: EventStore, steamid: int) -> Counter:
+    """Return the `kill_rate` counts, a row at a time."""
+
+    kills = store.columns("kills", ("time", "killer", "victim"))
+    counts = Counter()
+    for when, killer, victim in zip(kills["time"], kills["killer"], kills["victim"]):
+        if killer == steamid:
+            counts[int(when // 3600), 0] += 1
+        elif victim == steamid:
+            counts[int(when // 3600), 1] += 1
+    return counts
+
+
+def main() -> None:
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nkills", type=int, default=1_000_000)
+    parser.add_argument("--nplayers", type=int, default=500)
+    parser.add_argument("--ndays", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.remove()
+    rand = random.Random(42)
+    users = [
+        SimpleNamespace(steamid=steamid64(1000 + i), username=f"player{i}")
+        for i in range(args.nplayers)
+    ]
+    me = users[0]
+    start_time = time.mktime((2022, 6, 1, 0, 0, 0, 0, 0, -1))
+    step = args.ndays * 86400 / args.nkills
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conlog = SimpleNamespace(lineno=0, timestamp=None)
+        writer = EventStoreWriter(Path(tmp), conlog)
+        start = time.perf_counter()
+        for lineno in range(1, args.nkills + 1):
+            conlog.lineno = lineno
+            conlog.timestamp = start_time + lineno * step
+            killer, victim = rand.sample(users, 2)
+            writer.kill(killer, victim, rand.choice(WEAPONS), False, me)
+        writer.close()
+        elapsed = time.perf_counter() - start
+        nbytes = sum(x.stat().st_size for x in Path(tmp).rglob("*") if x.is_file())
+        print(
+            f"append  {args.nkills} kills in {elapsed:.2f}s;"
+            f" {args.nkills / elapsed:,.0f} kills/sec; {nbytes / 1e6:.1f}MB"
+        )
+
+        store = EventStore(Path(tmp))
+        steamid = 1001
+        for func, baseline, arg in (
+            (store.top_opponents, _rowwise_top_opponents, 20),
+            (store.weapon_states, _rowwise_weapon_states, steamid),
+            (store.kill_rate, _rowwise_kill_rate, steamid),
+        ):
+            elapsed = _timed(args.repeat, func, arg)
+            rowwise = _timed(args.repeat, baseline, store, arg)
+            print(
+                f"{func.__name__:13} {elapsed:.3f}s; {args.nkills / elapsed:,.0f} rows/sec;"
+                f" row by row {rowwise:.3f}s; speedup {rowwise / elapsed:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
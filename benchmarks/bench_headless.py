@@ -0,0 +1,55 @@
+"""Measure throughput of `--headless`; the whole game loop, without curses.
+
+    python -m benchmarks.bench_headless [--ntimes N] [--repeat R] [FILE]
+
+`FILE` is concatenated `N` times and played by `Monitor.run` with `--headless`:
+exclude filter, regexes, handlers, kicks/spams queues and database, and
+the final summary (discarded). Speed is the best of `R` runs.
+"""
+
+# mypy: ignore-errors
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+import tf2mon
+from tf2mon.monitor import Monitor
+
+from ._replay import TESTDATA, options, setup
+
+
+def main() -> None:
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ntimes", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("file", nargs="?", default=TESTDATA / "bots-orig")
+    args = parser.parse_args()
+
+    setup()
+    monitor = Monitor()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "console.log")
+        path.write_text(Path(args.file).read_text(encoding="utf-8") * args.ntimes)
+        nlines = len(path.read_text(encoding="utf-8").splitlines())
+        tf2mon.options = options(path)
+
+        elapsed = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                monitor.run()
+            elapsed = min(elapsed, time.perf_counter() - start)
+
+    nkills = len(tf2mon.users.kills)
+    print(f"{nlines} lines in {elapsed:.2f}s; {nlines / elapsed:,.0f} lines/sec; {nkills} kills")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Compare replaying a game from its console logfile against replaying its journal.
+
+    python -m benchmarks.bench_journal [--ntimes N] [--repeat R] [FILE]
+
+`FILE` is concatenated `N` times and played through `Monitor.game` once
+to write the journal. Then each is replayed through the game handlers,
+without curses or logging: the logfile by `Monitor.game` (exclude filter
+and regexes) and the journal by `Monitor.replay_journal`. Speed is the
+best of `R` runs.
+"""
+
+# mypy: ignore-errors
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import tf2mon
+from tf2mon.conlog import Conlog
+from tf2mon.journal import SUFFIX, JournalWriter
+from tf2mon.monitor import Monitor
+
+from ._replay import TESTDATA, options, setup
+
+
+def _play(monitor: Monitor, journals: list[Path]) -> tuple[float, int]:
+    """Play conlog, or `journals` if any; return elapsed time and number of kills."""
+
+    tf2mon.reset_game()
+    tf2mon.conlog = Conlog(tf2mon.options)
+    start = time.perf_counter()
+    if journals:
+        for path in journals:
+            monitor.replay_journal(path)
+    else:
+        monitor.game()
+    return time.perf_counter() - start, len(tf2mon.users.kills)
+
+
+def main() -> None:
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ntimes", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("file", nargs="?", default=TESTDATA / "bots-orig")
+    args = parser.parse_args()
+
+    setup()
+    monitor = Monitor()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "console.log")
+        path.write_text(Path(args.file).read_text(encoding="utf-8") * args.ntimes)
+        tf2mon.options = options(path)
+        tf2mon.SingleStepControl.start()
+
+        tf2mon.journal = JournalWriter(Path(tmp))
+        _play(monitor, [])
+        tf2mon.journal.close()
+        tf2mon.journal = None
+        journals = sorted(Path(tmp).glob(f"*{SUFFIX}"))
+
+        nbytes = path.stat().st_size
+        nlines = len(path.read_text(encoding="utf-8").splitlines())
+        print(f"conlog  {nbytes / 1e6:6.2f}MB {nlines} lines")
+        nbytes = sum(x.stat().st_size for x in journals)
+        print(f"journal {nbytes / 1e6:6.2f}MB {len(journals)} files")
+
+        for name, _journals in (("conlog", []), ("journal", journals)):
+            elapsed = float("inf")
+            for _ in range(args.repeat):
+                _elapsed, nkills = _play(monitor, _journals)
+                elapsed = min(elapsed, _elapsed)
+            rate = nlines / elapsed
+            print(f"{name:7} {elapsed:.2f}s; {rate:,.0f} lines/sec; {nkills} kills")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure replay throughput of `Monitor.game` at each log window level.
+
+    python -m benchmarks.bench_logging [--ntimes N] [--repeat R] [FILE]
+
+The console logfile is read through `Conlog`, as when monitoring a game,
+and messages are written to `/dev/null` by a sink at each level the
+curses log window takes from `--verbose` (default `INFO`, `-v` `DEBUG`,
+`-vv` `TRACE`); as when log files are not written. Speed is the best of
+`R` runs.
+"""
+
+# mypy: ignore-errors
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+import tf2mon
+from tf2mon._logger import add_logging_levels
+from tf2mon.conlog import Conlog
+from tf2mon.monitor import Monitor
+
+from ._replay import TESTDATA, options, setup
+
+#    (dflt)  -v       -vv
+VERBOSE_LEVELS = ["INFO", "DEBUG", "TRACE"]
+
+
+def main() -> None:
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ntimes", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("file", nargs="?", default=TESTDATA / "bots-orig")
+    args = parser.parse_args()
+
+    setup()
+    add_logging_levels()
+    monitor = Monitor()
+
+    with open(os.devnull, "w", encoding="utf-8") as null, tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "console.log")
+        path.write_text(Path(args.file).read_text(encoding="utf-8") * args.ntimes)
+        tf2mon.options = options(path)
+        tf2mon.SingleStepControl.start()
+
+        for verbose, level in enumerate(VERBOSE_LEVELS):
+            logger.remove()
+            logger.add(null, level=level)
+
+            elapsed = float("inf")
+            for _ in range(args.repeat):
+                tf2mon.reset_game()
+                tf2mon.conlog = Conlog(tf2mon.options)
+                start = time.perf_counter()
+                monitor.game()
+                elapsed = min(elapsed, time.perf_counter() - start)
+
+            nlines = tf2mon.conlog.lineno
+            flag = f"-{'v' * verbose}" if verbose else "(dflt)"
+            rate = nlines / elapsed
+            print(f"{flag:6} {level:5} {nlines} lines in {elapsed:.2f}s; {rate:,.0f} lines/sec")
+
+        logger.remove()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Measure memory used per kill and per user, with `tracemalloc`.
+
+    python -m benchmarks.bench_memory [--ntimes N] [--nusers M] [FILE]
+
+Replays `FILE` once, then `N` more times into the same game; bytes per
+kill is the growth over those `N` replays divided by the kills they
+added. Bytes per user is the growth from adding `M` users that chat
+once and kill each other once; and again after they leave the game and
+are archived.
+"""
+
+# mypy: ignore-errors
+
+import argparse
+import gc
+import tracemalloc
+from pathlib import Path
+
+import tf2mon
+from tf2mon.user import UserKey
+
+from ._replay import TESTDATA, replay, setup
+
+
+def _traced() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main() -> None:
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ntimes", type=int, default=50)
+    parser.add_argument("--nusers", type=int, default=100)
+    parser.add_argument("file", nargs="?", default=TESTDATA / "bots-orig")
+    args = parser.parse_args()
+
+    lines = Path(args.file).read_text(encoding="utf-8").splitlines()
+    setup()
+    tracemalloc.start()
+
+    replay(lines)
+    before, nkills = _traced(), len(tf2mon.users.kills)
+    for _ in range(args.ntimes):
+        replay(lines)
+    after = _traced()
+    nkills = len(tf2mon.users.kills) - nkills
+    print(f"{nkills} kills: {(after - before) / nkills:.1f} bytes/kill")
+
+    tf2mon.reset_game()
+    names = [f"user-{i}" for i in range(args.nusers)]
+    before = _traced()
+    lines = [f"{x} :  hello" for x in names]
+    lines += [f"{x} killed {y} with scattergun." for x, y in zip(names, names[1:] + names[:1])]
+    replay(lines)
+    for name in names:
+        _ = tf2mon.users[UserKey(name)]
+    after = _traced()
+    print(f"{args.nusers} users: {(after - before) / args.nusers:.1f} bytes/user")
+
+    for _ in range(tf2mon.users.archive_after + 2):
+        tf2mon.users.check_status()
+    archived = _traced()
+    nusers = len(tf2mon.users.archived)
+    print(f"{nusers} archived users: {(archived - before) / nusers:.1f} bytes/user")
+
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Measure name-clone detection: `NameIndex.search` vs `fuzz.ratio` against every name.
+
+    python -m benchmarks.bench_names [--sizes N ...] [--nqueries Q] [--repeat R]
+
+For each number of active names `N`, times `Q` queries, half of them
+clones (one character changed) of active names; speed is the best of `R`
+runs.
+"""
+
+# mypy: ignore-errors
+
+import argparse
+import random
+import string
+import time
+
+from fuzzywuzzy import fuzz
+
+from tf2mon.nameindex import NameIndex
+
+
+def _names(rng: random.Random, count: int) -> list[str]:
+    alphabet = string.ascii_letters + string.digits + " ._-"
+    return ["".join(rng.choices(alphabet, k=rng.randint(4, 24))) for _ in range(count)]
+
+
+def _clone(rng: random.Random, name: str) -> str:
+    i = rng.randrange(len(name))
+    return name[:i] + rng.choice("._-") + name[i + 1 :]
+
+
+def _scan(names: list[str], queries: list[str]) -> None:
+    for query in queries:
+        _ = [x for x in names if fuzz.ratio(query, x) > 80]
+
+
+def _search(index: NameIndex[int], queries: list[str]) -> None:
+    for query in queries:
+        index.search(query)
+
+
+def _best(repeat: int, func, *args) -> float:
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed
+
+
+def main() -> None:
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32, 100, 1000])
+    parser.add_argument("--nqueries", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    for size in args.sizes:
+        names = _names(rng, size)
+        queries = [_clone(rng, x) for x in rng.sample(names, min(size, args.nqueries // 2))]
+        queries += _names(rng, args.nqueries - len(queries))
+
+        index: NameIndex[int] = NameIndex()
+        for key, name in enumerate(names):
+            index.add(key, name)
+
+        linear = _best(args.repeat, _scan, names, queries) / len(queries) * 1e6
+        indexed = _best(args.repeat, _search, index, queries) / len(queries) * 1e6
+        print(
+            f"{size:5} names: scan {linear:8.1f}us/query  "
+            f"index {indexed:8.1f}us/query  ({linear / indexed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
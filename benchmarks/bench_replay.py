@@ -0,0 +1,50 @@
+"""Measure speed and memory of replaying a console logfile N times in one game.
+
+    python -m benchmarks.bench_replay [--ntimes N] [--repeat R] [FILE]
+
+Speed is the best of `R` runs; memory is measured on one more run.
+"""
+
+# mypy: ignore-errors
+
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+import tf2mon
+
+from ._replay import TESTDATA, replay, setup
+
+
+def main() -> None:
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ntimes", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("file", nargs="?", default=TESTDATA / "bots-orig")
+    args = parser.parse_args()
+
+    lines = Path(args.file).read_text(encoding="utf-8").splitlines()
+    setup()
+
+    elapsed = float("inf")
+    for _ in range(args.repeat):
+        tf2mon.reset_game()
+        start = time.perf_counter()
+        nevents = sum(replay(lines) for _ in range(args.ntimes))
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print(f"{nevents} events in {elapsed:.2f}s; {nevents / elapsed:,.0f} events/sec")
+
+    tf2mon.reset_game()
+    tracemalloc.start()
+    for _ in range(args.ntimes):
+        replay(lines)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"memory current={current / 1e6:.1f}MB peak={peak / 1e6:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Measure known-player lookups: `SteamidSet` vs `select` from `players`.
+
+    python -m benchmarks.bench_steamids [--size N] [--nqueries Q]
+
+Builds `N` random account ids, reports the memory used by a `SteamidSet`
+and a `set` of them, scaled to a million entries, then times `Q`
+lookups, all but one in a hundred of unknown steamids (the common case,
+in `User.vet`), against the set and against an indexed sqlite table on disk.
+"""
+
+# mypy: ignore-errors
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+from tf2mon.steamidset import SteamidSet
+
+
+def _measure(func, *args):
+    tracemalloc.start()
+    result = func(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def _time(func, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main() -> None:
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--nqueries", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    steamids = rng.sample(range(1, 1 << 32), args.size)
+    scale = 1_000_000 / args.size
+
+    known, nbytes = _measure(SteamidSet, steamids)
+    _, set_nbytes = _measure(set, steamids)
+    print(f"{args.size} steamids, per million: ", end="")
+    print(f"SteamidSet {nbytes * scale / 1e6:.1f}MB  set {set_nbytes * scale / 1e6:.1f}MB")
+
+    queries = [
+        rng.choice(steamids) if i % 100 == 0 else rng.randrange(1, 1 << 32)
+        for i in range(args.nqueries)
+    ]
+
+    tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+    conn = sqlite3.connect(f"{tmpdir.name}/players.db")
+    cursor = conn.cursor()
+    cursor.execute("create table players (steamid integer primary key)")
+    cursor.executemany("insert into players values(?)", ((x,) for x in steamids))
+    conn.commit()
+
+    def _select(steamid):
+        cursor.execute("select * from players where steamid=?", (steamid,))
+        return cursor.fetchone()
+
+    indexed = _time(_select, queries)
+    filtered = _time(known.__contains__, queries)
+    print(
+        f"lookup: sqlite {indexed:.2f}us  SteamidSet {filtered:.2f}us"
+        f"  ({indexed / filtered:.1f}x)"
+    )
+    conn.close()
+    tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,25 @@
 from pathlib import Path
 
 import pytest
+from loguru import logger
 
+from tf2mon._logger import add_logging_levels
 from tf2mon.database import Database
 from tf2mon.player import Player
+from tf2mon.playeralias import PlayerAlias
 from tf2mon.steamplayer import SteamPlayer
 
 
 @pytest.fixture(scope="session")
 def session():
 
-    return Database(Path(".cache/tf2mon.db"), [Player, SteamPlayer])
+    return Database(Path(".cache/tf2mon.db"), [Player, SteamPlayer, PlayerAlias])
+
+
+@pytest.fixture
+def _logging_levels():
+
+    try:
+        logger.level("ADDUSER")
+    except ValueError:
+        add_logging_levels()
@@ -0,0 +1,103 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import tf2mon
+from tf2mon.batch import BatchStats, batch_games, run_batch
+from tf2mon.database import Database
+from tf2mon.player import Player, forget_known_steamids
+from tf2mon.playeralias import PlayerAlias, forget_banned_aliases
+from tf2mon.steamplayer import SteamPlayer
+
+pytestmark = pytest.mark.usefixtures("_logging_levels")
+
+DATADIR = Path(__file__).parent.parent / "tf2mon" / "data"
+
+STATUS = '#      {} "{}"  [U:1:{}]  01:00  20    0 active'
+
+LOG1 = [
+    "Dave killed Bob with scattergun.",  # before the first game.
+    "Bob connected",
+    STATUS.format(2, "Bob", 77777700),
+    STATUS.format(3, "Alice", 77777701),
+    STATUS.format(4, "Mallory", 77777702),
+    "Bob killed Alice with scattergun.",
+    "Alice killed Bob with scattergun.",
+    "Alice killed Bob with scattergun.",
+    "Mallory killed Alice with scattergun.",
+    "Bob connected",
+    STATUS.format(2, "Bob", 77777700),
+    STATUS.format(3, "Alicia", 77777701),
+    "Alicia killed Bob with scattergun.",
+]
+
+LOG2 = [
+    "Bob connected",
+    STATUS.format(2, "Bob", 77777700),
+    STATUS.format(4, "Mallory", 77777702),
+    "Bob killed Mallory with scattergun.",
+]
+
+
+@pytest.fixture(name="logs")
+def fixture_logs(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Iterator[list[Path]]:
+    db = Database(Path(":memory:"), [Player, SteamPlayer, PlayerAlias])
+    assert db
+    Player(77777702, cheater="cheater").upsert()
+    for name in ("config", "conlog", "users", "ui", "steam_web_api"):
+        monkeypatch.setattr(tf2mon, name, getattr(tf2mon, name, None), raising=False)
+
+    paths = [tmp_path / "console.log", tmp_path / "console-2.log"]
+    for path, lines in zip(paths, (LOG1, LOG2)):
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    yield paths
+
+    for table in ("players", "player_aliases"):
+        db.execute(f"delete from {table} where steamid=77777702")
+    forget_known_steamids()
+    forget_banned_aliases()
+
+
+def _run(paths: list[Path]) -> BatchStats:
+    return run_batch(paths, {"player_name": "Bob"}, Path(":memory:"), DATADIR / "exclude.txt", 1)
+
+
+def test_batch_games(logs: list[Path]) -> None:
+    games = batch_games(logs, "Bob")
+    assert [(x.path.name, x.game.lineno, x.end_lineno) for x in games] == [
+        ("console.log", 1, 2),
+        ("console.log", 2, 10),
+        ("console.log", 10, None),
+        ("console-2.log", 1, None),
+    ]
+
+
+def test_run_batch(logs: list[Path]) -> None:
+    stats = _run(logs)
+    assert (stats.ngames, stats.nlines, stats.nkills) == (4, len(LOG1) + len(LOG2), 7)
+
+    alice = stats.players[77777701]
+    assert (alice.ngames, alice.nkills, alice.ndeaths) == (2, 3, 2)
+    assert (alice.nkilled_me, alice.nkilled_by_me) == (3, 1)
+    assert alice.aliases == {"Alice": 1, "Alicia": 1}
+    assert not alice.levels
+
+    mallory = stats.players[77777702]
+    assert (mallory.ngames, mallory.nkills, mallory.ndeaths) == (2, 1, 1)
+    assert (mallory.nkilled_me, mallory.nkilled_by_me) == (0, 1)
+    assert mallory.levels == {"CHEATER": 2}
+
+    # not `player_name`, nor users without steamids.
+    assert set(stats.players) == {77777701, 77777702}
+
+    lines = list(stats.format())
+    assert lines[0] == f"4 games, {len(LOG1) + len(LOG2)} lines, 7 kills"
+    assert lines[2].split() == ["77777701", "2", "3", "2", "3", "1", "'Alice',", "'Alicia'"]
+    assert lines[3].split()[-2:] == ["CHEATER", "'Mallory'"]
+
+
+def test_batch_stats_merge(logs: list[Path]) -> None:
+    stats = _run(logs[:1])
+    stats.merge(_run(logs[1:]))
+    assert stats.summary() == _run(logs).summary()
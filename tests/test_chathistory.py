@@ -0,0 +1,129 @@
+import sqlite3
+import time
+from argparse import Namespace
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import tf2mon
+from tf2mon.chat import Chat
+from tf2mon.chathistory import ChatHistory, ChatHistoryWriter
+from tf2mon.monitor import Monitor
+from tf2mon.renderer import Renderer
+from tf2mon.steamid import steamid64
+from tf2mon.user import User, UserHandle, UserKey
+from tf2mon.users import Users
+
+pytestmark = pytest.mark.usefixtures("_logging_levels")
+
+MIDNIGHT = time.mktime((2022, 6, 2, 0, 0, 0, 0, 0, -1))
+
+
+def _write(path: Path, chats: list[tuple[int, float, str, str, bool]]) -> ChatHistoryWriter:
+    """Insert `chats`, of (lineno, timestamp, username, msg, teamflag), into `path`."""
+
+    conlog = SimpleNamespace(lineno=0, timestamp=None)
+    writer = ChatHistoryWriter(path, conlog)  # type: ignore[arg-type]
+    users = Users()
+    alice = User("Alice", UserHandle(0), users)
+    alice.steamid = steamid64(77777801)
+    bob = User("Bob", UserHandle(1), users)
+    for lineno, timestamp, username, msg, teamflag in chats:
+        conlog.lineno, conlog.timestamp = lineno, timestamp
+        writer.append(Chat(alice if username == "Alice" else bob, teamflag, msg))
+    writer.close()
+    return writer
+
+
+@pytest.fixture(name="history")
+def fixture_history(tmp_path: Path) -> ChatHistory:
+    chats = [
+        (1, MIDNIGHT - 60, "Alice", "free hats at example dot com", False),
+        (2, MIDNIGHT - 30, "Bob", "no free lunch", False),
+        (3, MIDNIGHT + 30, "Alice", "push the cart", True),
+        (2, MIDNIGHT - 30, "Bob", "no free lunch", False),  # seek back; skipped.
+        (4, MIDNIGHT + 60, "Bob", "Free Hats? really", False),
+    ]
+    writer = _write(tmp_path / "chats.db", chats)
+    assert writer.ninserted == 4
+    return ChatHistory(tmp_path / "chats.db")
+
+
+def test_search(history: ChatHistory) -> None:
+    assert [x.msg for x in history.search()] == [
+        "Free Hats? really",
+        "push the cart",
+        "no free lunch",
+        "free hats at example dot com",
+    ]
+
+    matches = history.search('"free hats"')
+    assert [(x.username, x.steamid) for x in matches] == [("Bob", 0), ("Alice", 77777801)]
+    assert matches[-1].time == "2022-06-01T23:59:00"
+
+    assert [x.msg for x in history.search("free", [77777801])] == [
+        "free hats at example dot com"
+    ]
+    assert [x.msg for x in history.search(steamids=[77777801], since="2022-06-02")] == [
+        "push the cart"
+    ]
+    assert [x.msg for x in history.search("username:bob", limit=1)] == ["Free Hats? really"]
+    assert not history.search("nonexistent")
+    assert not history.search("77777801")  # not `steamid`, unless filtered by.
+
+    with pytest.raises(sqlite3.Error):
+        history.search('"unbalanced')
+
+
+def test_format(history: ChatHistory) -> None:
+    lines = list(history.format(history.search("cart")))
+    assert lines[0].split() == ["TIME", "STEAMID", "USERNAME", "MSG"]
+    assert lines[1].split(maxsplit=3) == [
+        "2022-06-02T00:00:30",
+        "77777801",
+        "Alice",
+        "(TEAM) push the cart",
+    ]
+
+
+def test_replayed_logfile(history: ChatHistory) -> None:
+    writer = _write(
+        history.path, [(1, MIDNIGHT - 60, "Alice", "free hats at example dot com", False)]
+    )
+    assert writer.ninserted == 0
+    assert len(ChatHistory(history.path).search("hats")) == 2
+
+
+def test_no_history(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        ChatHistory(tmp_path / "chats.db")
+
+
+class _Journal(Renderer):
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def show_journal(self, level: str, line: str) -> None:
+        self.lines.append(line)
+
+
+def test_admin_chats(history: ChatHistory, monkeypatch: pytest.MonkeyPatch) -> None:
+    journal = _Journal()
+    users = Users()
+    alice = users[UserKey("Alice")]
+    alice.userid = 7
+    alice.steamid = steamid64(77777801)
+    monkeypatch.setattr(tf2mon, "ui", journal, raising=False)
+    monkeypatch.setattr(tf2mon, "users", users, raising=False)
+    monkeypatch.setattr(
+        tf2mon, "options", Namespace(chat_history=history.path, max_chats=10), raising=False
+    )
+
+    Monitor().search_chats("#7 hats")
+    assert [x.split()[-1] for x in journal.lines] == ["MSG", "com"]
+
+    journal.lines.clear()
+    Monitor().search_chats("#8 hats")  # no such userid.
+    Monitor().search_chats('"hats')  # syntax error.
+    assert not journal.lines
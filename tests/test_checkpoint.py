@@ -0,0 +1,141 @@
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+import tf2mon
+import tf2mon.game
+from tf2mon.checkpoint import Checkpoints
+from tf2mon.conlog import Conlog
+from tf2mon.database import Database
+from tf2mon.killledger import KillLedger
+from tf2mon.player import Player
+from tf2mon.playeralias import PlayerAlias
+from tf2mon.renderer import Renderer
+from tf2mon.steamplayer import SteamPlayer
+from tf2mon.steamweb import SteamWebAPI
+from tf2mon.user import UserKey
+
+pytestmark = pytest.mark.usefixtures("_logging_levels")
+
+DATADIR = Path(__file__).parent.parent / "tf2mon" / "data"
+
+LINES = [
+    "Bob killed Alice with scattergun.",  # 1
+    "Alice :  gg",  # 2
+    "Alice killed Bob with scattergun.",  # 3
+    "Bob killed Alice with scattergun.",  # 4
+    "Bob connected",  # 5; reset_game
+    "Bob killed Carol with scattergun.",  # 6
+    "Carol :  wow",  # 7
+]
+
+
+@pytest.fixture(name="conlog")
+def fixture_conlog(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Conlog:
+    path = tmp_path / "console.log"
+    path.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+
+    Database(Path(":memory:"), [Player, SteamPlayer, PlayerAlias])
+    monkeypatch.setattr(tf2mon, "config", {"player_name": "Bob"}, raising=False)
+    monkeypatch.setattr(tf2mon, "steam_web_api", SteamWebAPI(""), raising=False)
+    monkeypatch.setattr(tf2mon, "ui", Renderer(), raising=False)
+    monkeypatch.setattr(tf2mon, "users", getattr(tf2mon, "users", None), raising=False)
+    options = Namespace(
+        con_logfile=path,
+        rewind=True,
+        follow=False,
+        exclude_file=DATADIR / "exclude.txt",
+        inject_cmds=None,
+        inject_file=None,
+    )
+    conlog = Conlog(options)
+    monkeypatch.setattr(tf2mon, "conlog", conlog)
+    tf2mon.reset_game()
+    conlog.open()
+    return conlog
+
+
+def _play(conlog: Conlog, checkpoints: Checkpoints, nlines: int) -> None:
+    for _ in range(nlines):
+        line = conlog.readline()
+        assert line
+        for event in tf2mon.game.events:
+            if match := event.search(line):
+                event.handler(match)
+                break
+        if checkpoints.is_due():
+            checkpoints.take()
+
+
+def _state() -> tuple[int, list[str], int]:
+    alice = tf2mon.users.users_by_username.get(UserKey("Alice"))
+    return (
+        len(tf2mon.users.kills),
+        [x.msg for x in alice.chats] if alice else [],
+        len(tf2mon.ChatsControl._chats),  # pylint: disable=protected-access
+    )
+
+
+def test_checkpoints(conlog: Conlog) -> None:
+    checkpoints = Checkpoints(interval=2)
+    checkpoints.take()
+    _play(conlog, checkpoints, 3)
+    state3 = _state()
+    _play(conlog, checkpoints, len(LINES) - 3)
+    assert conlog.readline() is None
+
+    # taken at lines 0, 2, 4, 5 (reset) and 7.
+    assert len(checkpoints) == 5
+    assert checkpoints.nbytes > 0
+
+    # restore line 2; replay line 3.
+    assert checkpoints.restore(4) == 2
+    assert conlog.lineno == 2
+    assert _state() == (1, ["gg"], 1)
+    _play(conlog, checkpoints, 1)
+    assert _state() == state3
+    assert tf2mon.users.users_by_username[UserKey("Alice")].chats[0] is (
+        tf2mon.ChatsControl._chats[0]  # pylint: disable=protected-access
+    )
+
+    # later checkpoints are taken again, replacing those from the first pass.
+    _play(conlog, checkpoints, len(LINES) - 3)
+    assert len(checkpoints) == 5
+    assert _state() == (1, [], 1)
+
+    assert checkpoints.restore(100) == 7
+    assert conlog.readline() is None
+
+    assert checkpoints.restore(1) == 0
+    assert (conlog.lineno, conlog.readline()) == (0, LINES[0])
+
+
+def test_checkpoints_empty() -> None:
+    with pytest.raises(ValueError, match="No checkpoints"):
+        Checkpoints().restore(1)
+
+
+def test_checkpoints_spilled_kills(conlog: Conlog) -> None:
+    tf2mon.users.kills = KillLedger(max_rows=2)
+    checkpoints = Checkpoints(interval=1)
+    _play(conlog, checkpoints, 4)
+    assert tf2mon.users.kills.nspilled > 0
+
+    assert checkpoints.restore(4) == 3
+    kills = tf2mon.users.kills
+    assert len(kills) == 2
+    assert kills[0].killer == tf2mon.users.users_by_username[UserKey("Bob")].handle
+    _play(conlog, checkpoints, 1)
+    assert len(tf2mon.users.kills) == 3
+
+
+def test_checkpoints_thinned(conlog: Conlog) -> None:
+    checkpoints = Checkpoints(interval=1, max_checkpoints=4)
+    checkpoints.take()
+    _play(conlog, checkpoints, len(LINES))
+
+    # taken at lines 0 to 7; the older thinned out, keeping the first.
+    assert checkpoints._linenos == [0, 5, 6, 7]  # pylint: disable=protected-access
+    assert checkpoints.restore(5) == 0
+    assert checkpoints.restore(6) == 5
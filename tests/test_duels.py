@@ -0,0 +1,71 @@
+from tf2mon.duels import DuelMatrix
+from tf2mon.role import WeaponState
+from tf2mon.user import UserHandle
+
+A, B, C = UserHandle(0), UserHandle(1), UserHandle(2)
+ROCKET = WeaponState(3)
+
+
+def test_empty() -> None:
+    duels = DuelMatrix()
+    assert duels.duel(A, B) == (0, 0)
+    assert duels.kdratio(A, B) == 0
+    assert not list(duels.opponents(A))
+    assert duels.weapons(A, B) == {}
+    assert duels.nkills(UserHandle(1000), A) == 0
+
+
+def test_add_kill() -> None:
+    duels = DuelMatrix()
+    duels.add_kill(A, B, ROCKET)
+    duels.add_kill(A, B, ROCKET)
+    duels.add_kill(B, A, None)
+    duels.add_kill(C, B, ROCKET)
+
+    assert duels.duel(A, B) == (2, 1)
+    assert duels.duel(B, A) == (1, 2)
+    assert duels.kdratio(A, B) == 2.0
+    assert duels.kdratio(C, B) == 1.0
+    assert list(duels.opponents(A)) == [B]
+    assert list(duels.opponents(B)) == [A, C]
+    assert duels.weapons(A, B) == {ROCKET: 2}
+    assert duels.weapons(B, A) == {}
+
+
+def test_grow_preserves_counts() -> None:
+    duels = DuelMatrix(capacity=2)
+    duels.add_kill(A, B, None)
+    duels.add_kill(B, A, None)
+    duels.add_kill(A, C, None)  # grows for the victim.
+    big = UserHandle(37)
+    duels.add_kill(big, A, None)
+    duels.add_kill(B, big, None)
+
+    assert duels.duel(A, B) == (1, 1)
+    assert duels.duel(A, C) == (1, 0)
+    assert duels.duel(big, A) == (1, 0)
+    assert duels.duel(big, B) == (0, 1)
+    assert list(duels.opponents(big)) == [A, B]
+
+
+def test_archive_reuses_slot() -> None:
+    duels = DuelMatrix(capacity=2)
+    duels.add_kill(A, B, ROCKET)
+    duels.add_kill(B, A, None)
+    duels.archive(A)
+    duels.archive(UserHandle(1000))  # never killed nor died.
+
+    duels.add_kill(C, B, None)  # in A's slot.
+    assert len(duels._kills) == 4  # pylint: disable=protected-access
+    assert duels.duel(A, B) == (1, 1)
+    assert duels.duel(C, B) == (1, 0)
+    assert duels.duel(C, A) == (0, 0)
+    assert list(duels.opponents(A)) == [B]
+    assert list(duels.opponents(B)) == [A, C]
+    assert duels.weapons(A, B) == {ROCKET: 1}
+
+    duels.add_kill(A, B, None)  # restored; in a new slot.
+    assert duels.duel(A, B) == (2, 1)
+    assert list(duels.opponents(A)) == [B]
+    duels.archive(A)
+    assert duels.duel(B, A) == (1, 2)
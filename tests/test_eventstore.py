@@ -0,0 +1,164 @@
+import time
+from argparse import Namespace
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import tf2mon
+from tf2mon.chat import Chat
+from tf2mon.eventstore import STRINGS, EventStore, EventStoreWriter
+from tf2mon.monitor import Monitor
+from tf2mon.steamweb import SteamWebAPI
+from tf2mon.user import User, UserHandle
+from tf2mon.users import Users
+
+pytestmark = pytest.mark.usefixtures("_logging_levels")
+
+DATADIR = Path(__file__).parent.parent / "tf2mon" / "data"
+
+DAY1 = "06/01/2022 - 23:59:58: "
+DAY2 = "06/02/2022 - 00:00:01: "
+
+LINES = [
+    DAY1 + "Bob connected",
+    DAY1 + '#      2 "Bob"    [U:1:77777800]  01:00  20    0 active',
+    DAY1 + '#      3 "Alice"  [U:1:77777801]  01:00  20    0 active',
+    DAY1 + "Bob killed Alice with scattergun. (crit)",
+    DAY1 + "Alice killed Bob with scattergun.",
+    DAY1 + "Alice :  gg",
+    DAY2 + "Alice killed Bob with scattergun.",
+    DAY2 + "Carol killed Bob with scattergun.",  # no steamid.
+    DAY2 + "Alice killed Carol with sniperrifle.",
+    DAY2 + "Alice captured Control Point A for team #2",
+]
+
+
+@pytest.fixture(name="store")
+def fixture_store(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> EventStore:
+    path = tmp_path / "console.log"
+    path.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+
+    monkeypatch.setattr(tf2mon, "config", {"player_name": "Bob"}, raising=False)
+    monkeypatch.setattr(tf2mon, "steam_web_api", SteamWebAPI(""), raising=False)
+    for name in ("ui", "conlog", "users", "journal", "event_store"):
+        monkeypatch.setattr(tf2mon, name, getattr(tf2mon, name, None), raising=False)
+    monkeypatch.setattr(
+        tf2mon,
+        "options",
+        Namespace(
+            con_logfile=path,
+            rewind=True,
+            follow=False,
+            exclude_file=DATADIR / "exclude.txt",
+            inject_cmds=None,
+            inject_file=None,
+            database=Path(":memory:"),
+            check_indexes=False,
+            breakpoint=None,
+            search=None,
+            single_step=False,
+            journal=None,
+            replay_journal=None,
+            event_store=tmp_path / "events",
+            chat_history=None,
+            game=None,
+            headless=True,
+            json=True,
+        ),
+        raising=False,
+    )
+    Monitor().run()
+    return EventStore(tmp_path / "events")
+
+
+def test_event_store(store: EventStore) -> None:
+    assert [x.name for x in store.days] == ["2022-06-01", "2022-06-02"]
+
+    kills = store.columns("kills", ("time", "killer", "victim", "flags"))
+    assert list(kills["killer"]) == [77777800, 77777801, 77777801, 0, 77777801]
+    assert list(kills["flags"]) == [1 | 2, 4, 4, 4, 0]
+    assert kills["time"][0] == time.mktime((2022, 6, 1, 23, 59, 58, 0, 0, -1))
+
+    chats = store.columns("chats", ("steamid",))
+    assert list(chats["steamid"]) == [77777801]
+    assert store.texts("chats", "msg") == ["gg"]
+
+    captures = store.columns("captures", ("steamid", "point", "team"))
+    assert store.strings[captures["point"][0]] == "Control Point A"
+    assert list(captures["team"]) == [2]
+
+    assert len(store.columns("status", ("steamid",))["steamid"]) == 2
+
+    assert store.top_opponents(10) == [
+        (77777801, "Alice", 2, 1, 2.0),
+        (0, "Carol", 1, 0, 1.0),
+    ]
+    assert [(x.weapon, x.nkills) for x in store.weapon_states(77777801)] == [
+        ("scout scattergun", 2),
+        ("sniper sniperrifle", 1),
+    ]
+    assert [tuple(x) for x in store.kill_rate(77777801)] == [
+        ("2022-06-01 23:00", 1, 1),
+        ("2022-06-02 00:00", 2, 0),
+    ]
+
+    assert [x.name for x in EventStore(store.directory, since="2022-06-02").days] == [
+        "2022-06-02"
+    ]
+
+
+def test_event_store_torn_rows(store: EventStore) -> None:
+    day = store.days[-1]
+    with open(day / "kills.killer", "ab") as file:
+        file.write(bytes(4))  # a row torn by a crash.
+    assert len(store.columns("kills", ("killer", "victim"))["killer"]) == 5
+
+    with pytest.raises(FileNotFoundError):
+        EventStore(day / "nonexistent")
+
+
+def test_event_store_writer_replayed_lines(tmp_path: Path) -> None:
+    conlog = SimpleNamespace(lineno=0, timestamp=None)
+    writer = EventStoreWriter(tmp_path, conlog)  # type: ignore[arg-type]
+    users = Users()
+    users.me = bob = User("Bob", UserHandle(0), users)
+    alice = User("Alice", UserHandle(1), users)
+
+    for lineno in (1, 2, 2, 3, 1, 2, 3, 4):  # seek back to line 1 after line 3.
+        conlog.lineno = lineno
+        writer.kill(bob, alice, "scattergun", False, bob)
+    writer.close()
+    writer.kill(bob, alice, "scattergun", False, bob)
+
+    kills = EventStore(tmp_path).columns("kills", ("victim_name",))
+    assert len(kills["victim_name"]) == 5
+    assert EventStoreWriter(tmp_path, conlog)._string_id("Alice") == 2  # type: ignore[arg-type]
+
+
+def test_event_store_line_separators(tmp_path: Path) -> None:
+    conlog = SimpleNamespace(lineno=0, timestamp=None)
+    writer = EventStoreWriter(tmp_path, conlog)  # type: ignore[arg-type]
+    users = Users()
+    users.me = bob = User("Bob", UserHandle(0), users)
+    evil = User("Ev\u2028il\x0c\r", UserHandle(1), users)
+
+    conlog.lineno = 1
+    writer.kill(evil, bob, "scattergun", False, bob)
+    conlog.lineno = 2
+    writer.chat(Chat(evil, False, "a b\x1cc\x85d"), False, bob)
+    conlog.lineno = 3
+    writer.chat(Chat(bob, False, "gg"), False, bob)
+    writer.close()
+    with open(tmp_path / STRINGS, "ab") as file:
+        file.write(b"torn")  # a string torn by a crash.
+
+    store = EventStore(tmp_path)
+    kills = store.columns("kills", ("killer_name", "victim_name"))
+    assert store.strings[kills["killer_name"][0]] == "Ev\u2028il\x0c\r"
+    assert store.strings[kills["victim_name"][0]] == "Bob"
+    assert store.texts("chats", "msg") == ["a b\x1cc\x85d", "gg"]
+
+    writer = EventStoreWriter(tmp_path, conlog)  # type: ignore[arg-type]
+    assert writer._string_id("Bob") == store.strings.index("Bob")
+    assert writer._string_id("Alice") == len(store.strings)
@@ -0,0 +1,98 @@
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from tf2mon.conlog import Conlog
+from tf2mon.gameindex import SUFFIX, GameIndex
+
+pytestmark = pytest.mark.usefixtures("_logging_levels")
+
+DATADIR = Path(__file__).parent.parent / "tf2mon" / "data"
+
+GAME1 = [
+    "Alice killed Bob with scattergun.",  # 1; before the first game.
+    "06/01/2022 - 13:54:20: Bob connected",  # 2
+    "06/01/2022 - 13:54:20: hostname: Valve Matchmaking Server (Virginia #1)",  # 3
+    "06/01/2022 - 13:54:20: map     : pl_badwater at: 0 x, 0 y, 0 z",  # 4
+    "06/01/2022 - 13:54:20: players : 20 humans, 0 bots (32 max)",  # 5
+    "Bob killed Alice with scattergun.",  # 6
+]
+
+GAME2 = [
+    "Bob connected",  # 7
+    "hostname: Valve (Chile #2)",  # 8
+    "Alice killed Bob with scattergun.",  # 9
+    "Bobby connected",  # 10; not a new game.
+    "hostname: not the first",  # 11
+]
+
+
+def _write(path: Path, lines: list[str], mode: str = "w") -> None:
+    with open(path, mode, encoding="utf-8", newline="") as file:
+        file.write("\r\n".join(lines) + "\r\n")
+
+
+def test_game_index(tmp_path: Path) -> None:
+    path = tmp_path / "console.log"
+    _write(path, GAME1)
+
+    index = GameIndex.load(path, "Bob")
+    assert (tmp_path / ("console.log" + SUFFIX)).exists()
+    assert len(index.games) == 1
+    game, end = index.game(1)
+    assert (game.lineno, end) == (2, None)
+    assert game.offset == len(GAME1[0]) + 2
+    assert game.time == "06/01/2022 - 13:54:20"
+    assert game.hostname == "Valve Matchmaking Server (Virginia #1)"
+    assert game.map == "pl_badwater"
+    assert game.players == "20 humans, 0 bots (32 max)"
+
+    # extended from the cache.
+    _write(path, GAME2, "a")
+    with open(path, "a", encoding="utf-8") as file:
+        file.write("Bob conn")  # being written.
+    index = GameIndex.load(path, "Bob")
+    assert [x.lineno for x in index.games] == [2, 7]
+    assert index.game(1)[1] == 7
+    game, end = index.game(-1)
+    assert (game.lineno, game.time, game.hostname, end) == (7, "", "Valve (Chile #2)", None)
+    assert index.game(2)[0] is game
+
+    for number in (0, 3, -3):
+        with pytest.raises(IndexError):
+            index.game(number)
+
+    lines = list(index.format())
+    assert lines[0].split() == ["GAME", "LINENO", "TIME", "MAP", "PLAYERS", "HOSTNAME"]
+    assert lines[2].split() == ["2", "7", "Valve", "(Chile", "#2)"]
+
+    # rebuilt when truncated, or for another player.
+    _write(path, GAME2)
+    assert [x.lineno for x in GameIndex.load(path, "Bob").games] == [1]
+    assert [x.lineno for x in GameIndex.load(path, "Bobby").games] == [4]
+
+
+def test_conlog_select_game(tmp_path: Path) -> None:
+    path = tmp_path / "console.log"
+    _write(path, GAME1 + GAME2)
+    index = GameIndex.load(path, "Bob")
+
+    options = Namespace(
+        con_logfile=path,
+        rewind=True,
+        follow=False,
+        exclude_file=DATADIR / "exclude.txt",
+        inject_cmds=None,
+        inject_file=None,
+    )
+    conlog = Conlog(options)
+    conlog.select_game(*index.game(1))
+    conlog.open()
+
+    lines = []
+    while (line := conlog.readline()) is not None:
+        lines.append(line)
+    assert lines == [x.removeprefix("06/01/2022 - 13:54:20: ") for x in GAME1[1:]]
+    assert conlog.lineno == 6
+    assert conlog.is_eof
@@ -0,0 +1,149 @@
+import json
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from tf2mon.database import Database
+from tf2mon.hackers import import_playerlist, iter_playerlist, parse_entry
+from tf2mon.player import Player
+from tf2mon.playeralias import PlayerAlias
+
+# pylint: disable=unused-argument
+
+# Account ids unlikely to be in the test database.
+STEAMIDS = (4_000_000_001, 4_000_000_002, 4_000_000_003)
+
+pytestmark = pytest.mark.usefixtures("_logging_levels", "_cleanup")
+
+
+@pytest.fixture
+def _cleanup(session: str) -> Iterator[None]:
+    def _delete() -> None:
+        db = Database()
+        assert db
+        for table in ("players", "player_aliases"):
+            db.execute(f"delete from {table} where steamid in (?,?,?)", STEAMIDS)
+        db.connection.commit()
+
+    _delete()
+    yield
+    _delete()
+
+
+def _entry(steamid: int, attributes: list[str], name: str = "", seconds: int = 0) -> Any:
+    entry: dict[str, Any] = {"steamid": f"[U:1:{steamid}]", "attributes": attributes}
+    if name:
+        entry["last_seen"] = {"player_name": name, "time": seconds}
+    return entry
+
+
+def _playerlist(path: Path, players: list[Any]) -> Path:
+    path.write_text(
+        json.dumps(
+            {
+                "$schema": "https://example.com/playerlist.schema.json",
+                "file_info": {"authors": ["test"], "title": "test", "version": 1.5},
+                "players": players,
+            },
+            indent=4,
+        )
+    )
+    return path
+
+
+def test_iter_playerlist(tmp_path: Path) -> None:
+    players = [_entry(x, ["cheater"], f"name{x}", x) for x in range(1, 500)]
+    path = _playerlist(tmp_path / "playerlist.json", players)
+    # tiny chunks, so values straddle chunk boundaries.
+    assert list(iter_playerlist(path, chunk_size=7)) == players
+
+
+def test_iter_playerlist_players_first(tmp_path: Path) -> None:
+    path = tmp_path / "playerlist.json"
+    path.write_text('{"players":[{"steamid":1},{"steamid":2}],"version":12345}')
+    assert list(iter_playerlist(path, chunk_size=3)) == [{"steamid": 1}, {"steamid": 2}]
+
+
+def test_iter_playerlist_truncated(tmp_path: Path) -> None:
+    path = tmp_path / "playerlist.json"
+    path.write_text('{"players":[{"steamid":1},{"steam')
+    with pytest.raises(ValueError, match="Expecting|Unterminated"):
+        list(iter_playerlist(path, chunk_size=5))
+
+
+def test_parse_entry() -> None:
+    assert parse_entry(_entry(123, ["suspicious", "racist"], "Bob", 0)) == (
+        123,
+        ["", Player.SUSPECT, "", Player.RACIST],
+        "Bob",
+        "",
+    )
+    assert parse_entry({"steamid": "76561197960265851", "attributes": ["cheater"]}) == (
+        123,
+        [Player.CHEATER, "", "", ""],
+        "",
+        "",
+    )
+    assert parse_entry(_entry(123, ["unknown"])) is None
+    assert parse_entry({"steamid": "junk", "attributes": ["cheater"]}) is None
+    assert parse_entry({"attributes": ["cheater"]}) is None
+
+
+def test_import_playerlist(tmp_path: Path) -> None:
+    a, b, c = STEAMIDS
+
+    # locally set tf2mon attribute.
+    player = Player(b, suspect=Player.SUSPECT, milenko=Player.MILENKO, last_name="Local")
+    player.upsert()
+
+    path = _playerlist(
+        tmp_path / "playerlist.json",
+        [
+            _entry(a, ["cheater"], "Alice", 1_700_000_000),
+            _entry(b, ["racist"], "Bob", 1_700_000_000),
+            _entry(c, ["unknown"], "Carol", 1_700_000_000),
+        ],
+    )
+    assert import_playerlist(path, batch_size=1) == 2
+
+    alice = Player.fetch_steamid(a)
+    assert alice
+    assert alice._cheater == Player.CHEATER  # pylint: disable=protected-access
+    assert alice.display_level == "CHEATER"
+    assert alice.is_banned
+    assert alice.aliases == ["Alice"]
+
+    bob = Player.fetch_steamid(b)
+    assert bob
+    assert bob._racist == Player.RACIST  # pylint: disable=protected-access
+    assert bob.suspect == Player.SUSPECT
+    assert bob.milenko == Player.MILENKO
+    assert bob.last_name == "Local"
+    assert [x.name for x in PlayerAlias.fetch_steamid(b)] == ["Bob"]
+
+    assert Player.fetch_steamid(c) is None
+
+
+def test_import_playerlist_merge(tmp_path: Path) -> None:
+    a = STEAMIDS[0]
+    path = tmp_path / "playerlist.json"
+
+    _playerlist(path, [_entry(a, ["cheater"], "Newer", 1_700_000_100)])
+    import_playerlist(path)
+
+    _playerlist(path, [_entry(a, ["racist"], "Older", 1_700_000_000)])
+    import_playerlist(path)
+
+    player = Player.fetch_steamid(a)
+    assert player
+    # pylint: disable=protected-access
+    assert (player._cheater, player._racist) == (Player.CHEATER, Player.RACIST)
+    assert player._last_name == "Newer"
+    assert player.aliases == ["Newer", "Older"]
+
+    import_playerlist(path, replace=True)
+    player = Player.fetch_steamid(a)
+    assert player
+    assert (player._cheater, player._racist) == ("", Player.RACIST)
+    assert player._last_name == "Newer"
@@ -0,0 +1,105 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from tf2mon.game.kill import GameKillEvent
+from tf2mon.game.misc import GameLobbyFailedEvent, GameUserSwitchedEvent
+from tf2mon.journal import SUFFIX, JournalWriter, iter_journal
+
+pytestmark = pytest.mark.usefixtures("_logging_levels")
+
+KILL = GameKillEvent()
+FAILED = GameLobbyFailedEvent()
+SWITCHED = GameUserSwitchedEvent()
+EVENTS = [KILL, FAILED, SWITCHED]
+
+LINES = [
+    (KILL, "Bob killed Alice with scattergun. (crit)"),
+    (KILL, "Alice killed Bob with scattergun."),
+    (FAILED, "Failed to find lobby shared object"),
+    (SWITCHED, "You have switched to team RED and will receive 500 experience points"),
+]
+
+
+# logged by TF2 with lines 1 and 2; not with lines 3 and 4.
+TIMESTAMPS = [1654120798.0, 1654120801.0, None, None]
+
+
+def _write(directory: Path) -> JournalWriter:
+    journal = JournalWriter(directory)
+    for lineno, (event, line) in enumerate(LINES, start=1):
+        match = event.search(line)
+        assert match
+        journal.write(event, match, lineno, TIMESTAMPS[lineno - 1])
+    return journal
+
+
+def test_journal(tmp_path: Path) -> None:
+    start = time.time()
+    journal = _write(tmp_path)
+    journal.close()
+    assert journal.path
+
+    records = list(iter_journal(journal.path, EVENTS))
+    assert [(event, lineno) for event, _, lineno, _ in records] == [
+        (KILL, 1),
+        (KILL, 2),
+        (FAILED, 3),
+        (SWITCHED, 4),
+    ]
+
+    _, match, _, _ = records[0]
+    assert match.groups() == ("Bob", "Alice", "scattergun", " (crit)")
+    assert match.group("killer", "weapon") == ("Bob", "scattergun")
+    assert match["victim"] == "Alice"
+
+    # as logged; else by the clock.
+    timestamps = [timestamp for _, _, _, timestamp in records]
+    assert timestamps[:2] == TIMESTAMPS[:2]
+    assert all(start <= x <= time.time() for x in timestamps[2:])
+
+    # interned; the same object each time.
+    assert records[0][1].group("weapon") is records[1][1].group("weapon")
+    assert records[1][1].group("crit") is None
+
+    assert records[2][1].group(0) == "Failed to find lobby shared object"
+    assert records[3][1].group("teamname") == "RED"
+
+
+def test_journal_rotate(tmp_path: Path) -> None:
+    journal = _write(tmp_path)
+    journal.rotate()
+    journal.rotate()  # nothing written; no new file.
+    _write(tmp_path).close()
+    journal.close()
+    assert len(list(tmp_path.glob(f"*{SUFFIX}"))) == 2
+
+
+def test_journal_errors(tmp_path: Path) -> None:
+    journal = _write(tmp_path)
+    journal.close()
+    assert journal.path
+    data = journal.path.read_bytes()
+
+    journal.path.write_bytes(data[:-3])
+    with pytest.raises(ValueError, match="Truncated"):
+        list(iter_journal(journal.path, EVENTS))
+
+    with pytest.raises(ValueError, match="Unknown event"):
+        list(iter_journal(journal.path, [KILL]))
+
+    journal.path.write_bytes(b"junk")
+    with pytest.raises(ValueError, match="Not a journal"):
+        list(iter_journal(journal.path, EVENTS))
+
+
+def test_journal_replayed_lines(tmp_path: Path) -> None:
+    journal = _write(tmp_path)
+    for lineno, (event, line) in enumerate(LINES, start=1):
+        match = event.search(line)
+        assert match
+        journal.write(event, match, lineno, None)  # already written; not again.
+    journal.close()
+    assert journal.path
+    assert len(list(iter_journal(journal.path, EVENTS))) == len(LINES)
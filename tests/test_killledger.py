@@ -0,0 +1,74 @@
+import pickle
+
+import pytest
+
+from tf2mon.killledger import KillLedger
+from tf2mon.role import WeaponState
+from tf2mon.user import UserHandle
+
+A, B = UserHandle(0), UserHandle(1)
+SHOTGUN = WeaponState(1)
+BAT = WeaponState(2)
+
+
+def _fill(ledger: KillLedger, nrows: int) -> None:
+    for i in range(nrows):
+        killer, victim = (A, B) if i % 2 == 0 else (B, A)
+        ledger.append(
+            float(i), killer, victim, SHOTGUN if i % 3 else BAT, i % 5 == 0, (i, 1), (2, i)
+        )
+
+
+def test_append_and_getitem() -> None:
+    ledger = KillLedger()
+    _fill(ledger, 10)
+    assert len(ledger) == 10
+    kill = ledger[3]
+    assert kill.timestamp == 3.0
+    assert (kill.killer, kill.victim) == (B, A)
+    assert kill.weapon_state == BAT
+    assert kill.crit is False
+    assert (kill.killer_nkills, kill.killer_ndeaths) == (3, 1)
+    assert (kill.victim_nkills, kill.victim_ndeaths) == (2, 3)
+    assert ledger[-1].timestamp == 9.0
+    with pytest.raises(IndexError):
+        _ = ledger[10]
+
+
+def test_last_kill_and_death() -> None:
+    ledger = KillLedger()
+    assert ledger.last_kill(A) is None
+    _fill(ledger, 5)
+    kill = ledger.last_kill(A)
+    assert kill
+    assert kill.timestamp == 4.0
+    death = ledger.last_death(A)
+    assert death
+    assert death.timestamp == 3.0
+
+
+def test_spill() -> None:
+    ledger = KillLedger(max_rows=8)
+    _fill(ledger, 50)
+    assert len(ledger) == 50
+    assert ledger.nspilled > 0
+    assert len(ledger.timestamp) <= 8
+    unspilled = KillLedger(max_rows=None)
+    _fill(unspilled, 50)
+    for row in range(50):
+        assert ledger[row] == unspilled[row]
+    _fill(ledger, 1)
+    assert ledger[50].timestamp == 0.0
+
+
+def test_pickle_spilled() -> None:
+    ledger = KillLedger(max_rows=8)
+    _fill(ledger, 50)
+    nspilled = ledger.nspilled
+    copy = pickle.loads(pickle.dumps(ledger))
+    _fill(ledger, 10)  # the original goes on; the copy is unchanged.
+    assert (len(copy), copy.nspilled) == (50, nspilled)
+    for row in range(50):
+        assert copy[row] == ledger[row]
+    _fill(copy, 10)
+    assert [copy[x] for x in range(60)] == [ledger[x] for x in range(60)]
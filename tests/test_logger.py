@@ -0,0 +1,47 @@
+import io
+
+import pytest
+from loguru import logger
+
+from tf2mon._logger import ENABLED
+
+pytestmark = pytest.mark.usefixtures("_logging_levels")
+
+
+def test_enabled() -> None:
+    handler_ids = []
+    try:
+        logger.remove()
+        assert not ENABLED["KILL"]
+
+        handler_ids.append(logger.add(io.StringIO(), level="INFO"))
+        assert ENABLED["KILL"]
+        assert ENABLED["duel"]
+        assert not ENABLED["logline"]
+        assert not ENABLED["regex"]
+
+        handler_ids.append(logger.add(io.StringIO(), level="TRACE"))
+        assert ENABLED["logline"]
+        assert ENABLED["regex"]
+
+        logger.remove(handler_ids.pop())
+        assert not ENABLED["regex"]
+    finally:
+        for handler_id in handler_ids:
+            logger.remove(handler_id)
+
+
+def test_enabled_suspend() -> None:
+    handler_id = logger.add(io.StringIO(), level="TRACE")
+    try:
+        ENABLED.suspend()
+        assert not ENABLED["KILL"]
+        assert not ENABLED["regex"]
+        assert ENABLED["ADDUSER"]
+
+        ENABLED.suspend(False)
+        assert ENABLED["KILL"]
+        assert ENABLED["regex"]
+    finally:
+        ENABLED.suspend(False)
+        logger.remove(handler_id)
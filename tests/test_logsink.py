@@ -0,0 +1,57 @@
+import libcurses
+import pytest
+from loguru import logger
+
+from tf2mon.logsink import LogBuffer, LogRecord, LogSink
+
+
+def _record(message: str, level: str = "INFO", time: str = "00:00:00.000") -> LogRecord:
+    return LogRecord(time, "", level, message)
+
+
+def test_collapse() -> None:
+    buffer = LogBuffer()
+    buffer.append(_record("a"))
+    buffer.append(_record("b"))
+    buffer.append(_record("b", time="00:00:01.000"))
+    buffer.append(_record("b", level="WARNING"))
+    buffer.append(_record("b"))
+
+    records, ndropped = buffer.drain()
+    assert [(x.message, x.level, x.count) for x in records] == [
+        ("a", "INFO", 1),
+        ("b", "INFO", 2),
+        ("b", "WARNING", 1),
+        ("b", "INFO", 1),
+    ]
+    assert records[1].time == "00:00:01.000"
+    assert ndropped == 0
+    assert buffer.drain() == ([], 0)
+
+
+def test_drop_oldest() -> None:
+    buffer = LogBuffer(maxlen=3)
+    for i in range(10):
+        buffer.append(_record(str(i)))
+
+    records, ndropped = buffer.drain()
+    assert [x.message for x in records] == ["7", "8", "9"]
+    assert ndropped == 7
+    assert buffer.drain() == ([], 0)
+
+
+def test_close(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _init(self: LogSink, _logwin: object) -> None:
+        # pylint: disable=protected-access
+        self.delim = "|"
+        self._id = logger.add(self._sink, format="{time:HH:mm:ss.SSS}||{level}|{message}")
+
+    monkeypatch.setattr(libcurses.LogSink, "__init__", _init)
+    sink = LogSink(None)  # type: ignore[arg-type]
+    logger.info("a")
+    sink.close()
+    logger.info("b")  # after curses has ended.
+    sink.flush()  # displays nothing; no window.
+
+    records, _ = sink.buffer.drain()
+    assert [x.message.strip() for x in records] == ["a"]
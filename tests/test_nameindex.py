@@ -0,0 +1,45 @@
+import random
+
+from fuzzywuzzy import fuzz  # type: ignore
+
+from tf2mon.nameindex import NameIndex
+
+
+def test_add_remove() -> None:
+    index: NameIndex[int] = NameIndex()
+    index.add(1, "Bob")
+    index.add(2, "Sue")
+    assert len(index) == 2
+    assert index.get(1) == "Bob"
+    index.add(1, "Bobby")
+    assert index.get(1) == "Bobby"
+    index.remove(1)
+    index.remove(1)
+    assert 1 not in index
+    assert index.get(1) is None
+    assert index.search("Bobby") == []
+    assert index.search("Sue") == [(2, 100)]
+
+
+def test_search_order() -> None:
+    index: NameIndex[int] = NameIndex()
+    index.add(3, "Engineer Gaming")
+    index.add(1, "Engineer Gamimg")
+    index.add(2, "Scout")
+    assert [x for x, _ in index.search("Engineer Gaming")] == [3, 1]
+
+
+def test_search_matches_linear_scan() -> None:
+    rng = random.Random(42)
+    alphabet = "abcdefghij ."
+    names = ["".join(rng.choices(alphabet, k=rng.randint(1, 20))) for _ in range(300)]
+    names += [x[:-1] + "x" for x in names[:100]]
+    names += [x + "." for x in names[:100]]
+
+    index: NameIndex[int] = NameIndex()
+    for key, name in enumerate(names):
+        index.add(key, name)
+
+    for query in names[::7] + ["", "a", "ab"]:
+        expected = [(k, r) for k, x in enumerate(names) if (r := fuzz.ratio(query, x)) > 80]
+        assert index.search(query) == expected
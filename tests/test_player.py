@@ -1,6 +1,7 @@
 import pytest
 
-from tf2mon.player import Player
+from tf2mon.database import Database
+from tf2mon.player import Player, known_steamids
 
 # pylint: disable=unused-argument
 
@@ -30,3 +31,20 @@ def _test_fetch_steamid_found(session: str, steamid: int) -> None:
     result = Player.fetch_steamid(steamid)
     assert result
     print(result)
+
+
+def test_known_steamids(session: str) -> None:
+    db = Database()
+    assert db
+    db.execute("delete from players where steamid=-104")
+    db.connection.commit()
+
+    assert -104 not in known_steamids()
+    player = Player(-104, cheater=Player.CHEATER)
+    player.upsert()
+    assert -104 in known_steamids()
+    assert Player.fetch_steamid(-104) == player
+
+    db.execute("delete from players where steamid=-104")
+    db.connection.commit()
+    assert Player.fetch_steamid(-104) is None
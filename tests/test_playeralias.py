@@ -0,0 +1,65 @@
+import json
+from typing import Iterator
+
+import pytest
+
+import tf2mon.playeralias
+from tf2mon.database import Database
+from tf2mon.player import Player
+from tf2mon.playeralias import PlayerAlias, search_banned_aliases
+
+# pylint: disable=unused-argument
+
+STEAMIDS = (-101, -102, -103)
+
+pytestmark = pytest.mark.usefixtures("_logging_levels", "_cleanup")
+
+
+@pytest.fixture
+def _cleanup(session: str, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    def _delete() -> None:
+        db = Database()
+        assert db
+        for table in ("players", "player_aliases"):
+            db.execute(f"delete from {table} where steamid in (?,?,?)", STEAMIDS)
+        db.connection.commit()
+
+    monkeypatch.setattr(tf2mon.playeralias, "_BANNED_ALIASES", None)
+    _delete()
+    yield
+    _delete()
+
+
+def test_track() -> None:
+    assert PlayerAlias.track(-101, "Bob", "2024-01-01T00:00:00")
+    assert not PlayerAlias.track(-101, "Bob", "2024-01-02T00:00:00")
+    assert PlayerAlias.track(-101, "Robert", "2024-01-03T00:00:00")
+    assert PlayerAlias.fetch_steamid(-101) == [
+        PlayerAlias(-101, "Bob", "2024-01-01T00:00:00", "2024-01-02T00:00:00"),
+        PlayerAlias(-101, "Robert", "2024-01-03T00:00:00", "2024-01-03T00:00:00"),
+    ]
+    assert [x.steamid for x in PlayerAlias.fetch_name("Robert")] == [-101]
+
+
+def test_track_appearance() -> None:
+    player = Player.new_player(-102, [], "Bob")
+    player.track_appearance("Robert")
+    assert player.last_name == "Robert"
+    assert player.aliases == ["Bob", "Robert"]
+
+
+def test_migrate() -> None:
+    player = Player(-103, last_name="Carol", names=json.dumps({"json": ["Alice", "Bob", ""]}))
+    player.upsert()
+    PlayerAlias._migrate()  # pylint: disable=protected-access
+    assert player.aliases == ["Alice", "Bob", "Carol"]
+
+
+def test_search_banned_aliases() -> None:
+    Player.new_player(-101, [], "Innocent Name")
+    Player.new_player(-102, [Player.CHEATER], "Sneaky Name")
+    assert search_banned_aliases("Sneaky Nane") == [(-102, "Sneaky Name", 91)]
+
+    Player.new_player(-103, [Player.CHEATER], "Sneakier Name")  # after index loaded
+    assert search_banned_aliases("Sneakier Nane") == [(-103, "Sneakier Name", 92)]
+    assert not search_banned_aliases("Innocent Name")
@@ -0,0 +1,83 @@
+import json
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+import tf2mon
+from tf2mon.monitor import Monitor
+from tf2mon.renderer import HeadlessRenderer
+from tf2mon.steamweb import SteamWebAPI
+
+pytestmark = pytest.mark.usefixtures("_logging_levels")
+
+DATADIR = Path(__file__).parent.parent / "tf2mon" / "data"
+
+LINES = [
+    "Bob killed Alice with scattergun. (crit)",
+    "Alice killed Bob with scattergun.",
+    "Bob killed Alice with scattergun.",
+    "Bob killed Carol with scattergun.",
+]
+
+
+@pytest.fixture(name="headless")
+def fixture_headless(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    path = tmp_path / "console.log"
+    path.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+
+    monkeypatch.setattr(tf2mon, "config", {"player_name": "Bob"}, raising=False)
+    monkeypatch.setattr(tf2mon, "steam_web_api", SteamWebAPI(""), raising=False)
+    for name in ("ui", "conlog", "users", "journal"):
+        monkeypatch.setattr(tf2mon, name, getattr(tf2mon, name, None), raising=False)
+    monkeypatch.setattr(
+        tf2mon,
+        "options",
+        Namespace(
+            con_logfile=path,
+            rewind=True,
+            follow=False,
+            exclude_file=DATADIR / "exclude.txt",
+            inject_cmds=None,
+            inject_file=None,
+            database=Path(":memory:"),
+            check_indexes=False,
+            breakpoint=None,
+            search=None,
+            single_step=False,
+            journal=None,
+            replay_journal=None,
+            event_store=None,
+            chat_history=None,
+            game=None,
+            headless=True,
+            json=True,
+        ),
+        raising=False,
+    )
+    return path
+
+
+def test_headless_json(headless: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert headless.exists()
+    Monitor().run()
+    assert isinstance(tf2mon.ui, HeadlessRenderer)
+
+    summary = json.loads(capsys.readouterr().out)
+    assert (summary["lines"], summary["kills"]) == (len(LINES), len(LINES))
+
+    users = {x["username"]: x for x in summary["users"]}
+    assert (users["Bob"]["kills"], users["Bob"]["deaths"]) == (3, 1)
+    assert (users["Alice"]["kills"], users["Alice"]["deaths"]) == (1, 2)
+    assert users["Bob"]["level"] == "user"
+    assert summary["flagged"] == []
+
+
+def test_headless_text(headless: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert headless.exists()
+    tf2mon.options.json = False
+    Monitor().run()
+
+    out = capsys.readouterr().out.splitlines()
+    assert out[0] == f"{len(LINES)} lines, {len(LINES)} kills"
+    assert out[2].startswith("Bob ")
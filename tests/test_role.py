@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import tf2mon
+from tf2mon.role import (
+    UNMAPPED_WEAPONS,
+    Role,
+    get_role_weapon_state,
+    load_weapons_data,
+    weapon_state_name,
+)
+
+WEAPONS = Path(tf2mon.__file__).parent / "data" / "weapons.csv"
+
+
+def test_mapped_weapon() -> None:
+    load_weapons_data(WEAPONS)
+    role, state = get_role_weapon_state(Role.unknown, "scattergun", False, "")
+    assert role == Role.scout
+    assert weapon_state_name(state) == "scout          scattergun"
+    assert get_role_weapon_state(Role.spy, "scattergun", False, "") == (role, state)
+
+    role, crit = get_role_weapon_state(Role.unknown, "scattergun", True, "")
+    assert crit != state
+    assert weapon_state_name(crit) == "scout    +crit scattergun"
+
+    role, perk = get_role_weapon_state(Role.unknown, "scattergun", False, "Haste")
+    assert perk not in (state, crit)
+    assert weapon_state_name(perk).endswith("scattergun                 +Haste")
+    assert get_role_weapon_state(Role.unknown, "scattergun", False, "Haste") == (role, perk)
+    assert not UNMAPPED_WEAPONS
+
+
+def test_unmapped_weapon() -> None:
+    load_weapons_data(WEAPONS)
+    role, state = get_role_weapon_state(Role.medic, "no_such_weapon", False, "")
+    assert role == Role.medic
+    assert weapon_state_name(state) == "medic          no_such_weapon"
+    role, other = get_role_weapon_state(Role.pyro, "no_such_weapon", False, "")
+    assert role == Role.pyro
+    assert other != state
+    assert get_role_weapon_state(Role.medic, "no_such_weapon", False, "") == (Role.medic, state)
+    assert UNMAPPED_WEAPONS["no_such_weapon"] == 3
+
+
+def test_not_weapons() -> None:
+    load_weapons_data(WEAPONS)
+    for weapon in ("player", "world"):
+        role, state = get_role_weapon_state(Role.sniper, weapon, False, "")
+        assert role == Role.sniper
+        assert weapon_state_name(state).endswith(weapon)
+        assert weapon not in UNMAPPED_WEAPONS
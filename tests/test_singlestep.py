@@ -0,0 +1,75 @@
+from argparse import Namespace
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+import pytest
+
+import tf2mon
+from tf2mon._logger import ENABLED
+from tf2mon.renderer import Renderer
+
+pytestmark = pytest.mark.usefixtures("_logging_levels")
+
+
+class _Renderer(Renderer):
+    def __init__(self) -> None:
+        self.nupdates = 0
+
+    def update_display(self) -> None:
+        self.nupdates += 1
+
+
+@pytest.fixture(name="renderer")
+def fixture_renderer(monkeypatch: pytest.MonkeyPatch) -> Iterator[_Renderer]:
+    renderer = _Renderer()
+    monkeypatch.setattr(tf2mon, "ui", renderer, raising=False)
+    monkeypatch.setattr(
+        tf2mon, "conlog", SimpleNamespace(lineno=0, inject_cmd=lambda *_: None), raising=False
+    )
+    monkeypatch.setattr(
+        tf2mon,
+        "options",
+        Namespace(rewind=True, breakpoint=None, search=None, single_step=False),
+        raising=False,
+    )
+    yield renderer
+    tf2mon.SingleStepControl.stop_fast_forward()
+
+
+@pytest.mark.parametrize(
+    ("options", "expected"),
+    [
+        ({}, False),
+        ({"breakpoint": 100}, True),
+        ({"search": "/Bob/i"}, True),
+        ({"breakpoint": 100, "rewind": False}, False),
+        ({"breakpoint": 100, "single_step": True}, False),
+    ],
+)
+def test_fast_forward_start(
+    renderer: _Renderer, options: dict[str, Any], expected: bool
+) -> None:
+    vars(tf2mon.options).update(options)
+    tf2mon.SingleStepControl.start()
+    assert tf2mon.SingleStepControl.is_fast_forward == expected
+    assert ENABLED.is_suspended == expected
+    assert renderer.nupdates == 0
+
+
+def test_fast_forward_stop(renderer: _Renderer) -> None:
+    tf2mon.options.breakpoint = 100
+    stepper = tf2mon.SingleStepControl
+    stepper.start()
+    assert stepper.is_fast_forward
+
+    assert tf2mon.conlog
+    tf2mon.conlog.lineno = 99
+    assert stepper.fast_forward_status().startswith("to line 99 at ")
+
+    stepper.start_single_stepping()
+    assert (stepper.is_fast_forward, stepper.is_stepping) == (False, True)
+    assert not ENABLED.is_suspended
+    assert renderer.nupdates == 1  # one full redraw.
+
+    stepper.stop_fast_forward()
+    assert renderer.nupdates == 1
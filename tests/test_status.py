@@ -0,0 +1,87 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import tf2mon
+from tf2mon.database import Database
+from tf2mon.game.status import GameStatusEvent
+from tf2mon.player import Player
+from tf2mon.playeralias import PlayerAlias
+from tf2mon.steamplayer import SteamPlayer
+from tf2mon.steamweb import SteamWebAPI
+from tf2mon.user import UserKey
+from tf2mon.users import Users
+
+pytestmark = pytest.mark.usefixtures("_logging_levels")
+
+ROW = '#     29 "Bob"               [U:1:99999999]      {}       67    0 active'
+
+
+@pytest.fixture(name="users")
+def fixture_users(monkeypatch: pytest.MonkeyPatch) -> Users:
+    Database(Path(":memory:"), [Player, SteamPlayer, PlayerAlias])
+    monkeypatch.setattr(tf2mon, "steam_web_api", SteamWebAPI(""), raising=False)
+    monkeypatch.setattr(
+        tf2mon,
+        "ui",
+        SimpleNamespace(notify_operator=False, sound_alarm=False, show_player_intel=print),
+        raising=False,
+    )
+    users = Users()
+    users.me = users.my = users[UserKey("me")]
+    monkeypatch.setattr(tf2mon, "users", users)
+    return users
+
+
+def _status(elapsed: str, row: str = ROW) -> None:
+    event = GameStatusEvent()
+    match = event.search(row.format(elapsed))
+    assert match
+    event.handler(match)
+
+
+def test_unchanged_row(users: Users) -> None:
+    _status("01:24")
+    bob = users.users_by_username[UserKey("Bob")]
+    assert (bob.userid, bob.elapsed, bob.s_elapsed) == (29, 84, "    1:24")
+    assert bob.steamplayer
+
+    # nothing displayed changed; row need not be redisplayed.
+    bob.dirty = False
+    _status("01:24")
+    assert (bob.elapsed, bob.s_elapsed, bob.dirty) == (84, "    1:24", False)
+
+    # elapsed changed.
+    _status("01:59")
+    assert (bob.elapsed, bob.s_elapsed, bob.dirty) == (119, "    1:59", True)
+
+    bob.dirty = False
+    _status("1:05:00")
+    assert (bob.elapsed, bob.s_elapsed, bob.dirty) == (3900, " 1:05:00", True)
+
+
+def test_changed_row(users: Users) -> None:
+    _status("01:24")
+    bob = users.users_by_username[UserKey("Bob")]
+    bob.dirty = False
+    _status("01:25", ROW.replace("#     29", "#     30"))
+    assert (bob.userid, bob.dirty) == (30, True)
+    assert users.users_by_userid[30] is bob
+
+
+def test_seen_in_status(users: Users) -> None:
+    _status("01:24")
+    bob = users.users_by_username[UserKey("Bob")]
+    for elapsed in ("01:30", "01:40", "01:50"):
+        users.check_status()
+        _status(elapsed)
+        assert bob.is_active
+
+    users.check_status()
+    users.check_status()
+    assert not bob.is_active
+
+    _status("02:00")
+    assert bob.is_active
+    assert not users.check_indexes()
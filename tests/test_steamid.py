@@ -0,0 +1,36 @@
+import pytest
+
+from tf2mon.steamid import (
+    BOT_STEAMID,
+    SteamID,
+    accountid,
+    community_url,
+    parse_steamid,
+    steamid64,
+)
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["[U:1:42708103]", "STEAM_0:1:21354051", "76561198002973831", 76561198002973831],
+)
+def test_steamid64(value: str | int) -> None:
+    assert steamid64(value) == SteamID("[U:1:42708103]").as_64
+
+
+@pytest.mark.parametrize("value", ["[U:1:0]", "[U:1:4294967296]", "junk", "", None])
+def test_steamid64_invalid(value: str | None) -> None:
+    assert steamid64(value) is None
+
+
+def test_parse_steamid() -> None:
+    steamid = parse_steamid("[U:1:42708103]")
+    assert steamid is not None
+    assert type(steamid) is int  # pylint: disable=unidiomatic-typecheck
+    assert accountid(steamid) == 42708103
+    assert parse_steamid("BOT") == BOT_STEAMID
+    assert parse_steamid("[U:1:bad]") is None
+
+
+def test_community_url() -> None:
+    assert community_url(42708103) == SteamID(42708103).community_url
@@ -0,0 +1,19 @@
+from tf2mon.steamidset import SteamidSet
+
+
+def test_contains() -> None:
+    steamids = SteamidSet([5, 3, 9, 3, -1])
+    assert len(steamids) == 4
+    assert list(steamids) == [-1, 3, 5, 9]
+    assert all(x in steamids for x in (-1, 3, 5, 9))
+    assert not any(x in steamids for x in (-2, 0, 4, 10, "3", None))
+    assert steamids.nbytes == 32
+
+
+def test_add() -> None:
+    steamids = SteamidSet()
+    assert 7 not in steamids
+    for steamid in (7, 2, 11, 7):
+        steamids.add(steamid)
+    assert list(steamids) == [2, 7, 11]
+    assert 7 in steamids
@@ -4,6 +4,7 @@ from pathlib import Path
 import pytest
 import tomli
 
+from tf2mon.steamid import SteamID
 from tf2mon.steamplayer import SteamPlayer
 from tf2mon.steamweb import SteamWebAPI
 
@@ -71,3 +72,13 @@ def test_fetch_steamid_found(api: SteamWebAPI, steamid: int) -> None:
     steamplayer = api.fetch_steamid(steamid)
     assert steamplayer
     # print(steamplayer)
+
+
+@pytest.mark.parametrize(
+    "jdoc",
+    [{"response": {}}, {"error": "Forbidden"}, {"response": {"players": 5}}, ["players"]],
+)
+def test_get_player_summaries_malformed(monkeypatch: pytest.MonkeyPatch, jdoc: object) -> None:
+    api = SteamWebAPI("key")
+    monkeypatch.setattr(api.transport, "get", lambda *_args: jdoc)
+    assert api._get_player_summaries([SteamID(2)]) == []  # pylint: disable=protected-access
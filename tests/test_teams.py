@@ -0,0 +1,77 @@
+from tf2mon.teams import TeamInference
+from tf2mon.user import Team, UserHandle
+
+# pylint: disable=invalid-name
+
+A, B, C, D, E = (UserHandle(x) for x in range(5))
+
+
+def test_resolve_component() -> None:
+    teams = TeamInference()
+    assert teams.opposite(A, B) == []
+    assert teams.same(B, C) == []
+    assert teams.opposite(C, D) == []
+    assert teams.team(A) is None
+
+    assert sorted(teams.assign(C, Team.RED)) == [A, B, C, D]
+    assert [teams.team(x) for x in (A, B, C, D)] == [Team.BLU, Team.RED, Team.RED, Team.BLU]
+    assert teams.assign(D, Team.BLU) == []
+
+
+def test_merge_known_with_unknown() -> None:
+    teams = TeamInference()
+    teams.assign(A, Team.BLU)
+    teams.same(C, D)
+    assert sorted(teams.opposite(A, C)) == [C, D]
+    assert teams.team(D) == Team.RED
+
+    # and the other way around.
+    teams.same(E, B)
+    assert sorted(teams.opposite(E, A)) == [B, E]
+    assert teams.team(B) == Team.RED
+
+
+def test_contradictions_ignored() -> None:
+    teams = TeamInference()
+    teams.assign(A, Team.BLU)
+    teams.assign(B, Team.BLU)
+    assert teams.opposite(A, B) == []
+    assert teams.team(B) == Team.BLU
+
+    teams.same(C, D)
+    assert teams.opposite(C, D) == []
+    assert teams.opposite(C, C) == []
+
+
+def test_changed_team() -> None:
+    teams = TeamInference()
+    teams.opposite(A, B)
+    teams.assign(A, Team.BLU)
+    assert teams.assign(A, Team.RED) == [A]
+    assert (teams.team(A), teams.team(B)) == (Team.RED, Team.RED)
+
+    # B's constraint with A's old node remains, but A is not resolved with it.
+    assert teams.opposite(B, C) == [C]
+    assert teams.team(C) == Team.BLU
+    assert teams.team(A) == Team.RED
+
+
+def test_switch() -> None:
+    teams = TeamInference()
+    teams.opposite(A, B)
+    teams.assign(A, Team.BLU)
+    teams.switch()
+    assert (teams.team(A), teams.team(B), teams.team(C)) == (Team.RED, Team.BLU, None)
+    assert teams.assign(B, Team.BLU) == []
+    assert teams.assign(C, Team.RED) == [C]
+    teams.switch()
+    assert (teams.team(A), teams.team(B), teams.team(C)) == (Team.BLU, Team.RED, Team.BLU)
+
+
+def test_long_chain() -> None:
+    teams = TeamInference()
+    n = 10_000
+    for x in range(n - 1):
+        teams.opposite(UserHandle(x), UserHandle(x + 1))
+    assert len(teams.assign(UserHandle(n - 1), Team.RED)) == n
+    assert teams.team(UserHandle(0)) == Team.BLU
@@ -0,0 +1,159 @@
+import pytest
+import requests
+
+from tf2mon.transport import LatencyHistogram, TokenBucket, Transport
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeResponse:
+    def __init__(
+        self, status_code: int, headers: dict[str, str] | None = None, body: str = ""
+    ) -> None:
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body
+
+    def json(self) -> dict[str, str]:
+        if self.body:
+            raise requests.JSONDecodeError("Expecting value", self.body, 0)
+        return {"status": str(self.status_code)}
+
+
+def _transport(
+    responses: list[object], elapsed: float = 0
+) -> tuple[Transport, list[float], list[tuple[float, float]]]:
+    """Return transport responding with `responses`, each taking `elapsed` seconds.
+
+    Also return the sleeps taken, and the timeouts given to each attempt.
+    """
+
+    # pylint: disable=protected-access
+    transport = Transport(max_attempts=3)
+    clock = FakeClock()
+    transport._clock = clock
+    sleeps: list[float] = []
+    timeouts: list[tuple[float, float]] = []
+
+    def _sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        clock.now += seconds
+
+    transport._sleep = _sleep
+
+    def _get(*_args: object, timeout: tuple[float, float], **_kwargs: object) -> object:
+        timeouts.append(timeout)
+        clock.now += elapsed
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    transport.session.get = _get  # type: ignore[method-assign,assignment]
+    return transport, sleeps, timeouts
+
+
+def test_token_bucket_burst_then_refill() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    clock.now += 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now += 100
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+
+def test_histogram() -> None:
+    hist = LatencyHistogram()
+    assert str(hist) == "n=0"
+    for seconds in (0.010, 0.030, 0.030, 10.0):
+        hist.add(seconds)
+    assert hist.counts[0] == 1
+    assert hist.counts[1] == 2
+    assert hist.counts[-1] == 1
+    assert "n=4" in str(hist)
+    assert ">6400ms:1" in str(hist)
+
+
+def test_get_ok() -> None:
+    transport, sleeps, _ = _transport([FakeResponse(200)])
+    assert transport.get("A/B/v1", {}) == {"status": "200"}
+    assert not sleeps
+    assert transport.latencies["A/B/v1"].ncalls == 1
+
+
+def test_get_retries_then_ok() -> None:
+    transport, sleeps, _ = _transport(
+        [requests.ConnectionError("boom"), FakeResponse(503), FakeResponse(200)]
+    )
+    assert transport.get("A/B/v1", {}) == {"status": "200"}
+    assert len(sleeps) == 2
+    assert all(0 <= x <= transport.max_backoff for x in sleeps)
+    assert transport.errors["A/B/v1 503"] == 1
+
+
+def test_get_gives_up() -> None:
+    transport, sleeps, _ = _transport([FakeResponse(500)] * 3)
+    assert transport.get("A/B/v1", {}) is None
+    assert len(sleeps) == 2
+
+
+def test_get_not_retryable() -> None:
+    transport, sleeps, _ = _transport([FakeResponse(403)])
+    assert transport.get("A/B/v1", {}) is None
+    assert not sleeps
+
+
+@pytest.mark.parametrize(("retry_after", "expected"), [("1", [1.0]), ("3600", [])])
+def test_get_429_retry_after(retry_after: str, expected: list[float]) -> None:
+    transport, sleeps, _ = _transport(
+        [FakeResponse(429, {"Retry-After": retry_after}), FakeResponse(200)]
+    )
+    result = transport.get("A/B/v1", {})
+    assert sleeps == expected
+    if expected:
+        assert result == {"status": "200"}
+    else:
+        assert result is None
+        # cooling down; fail fast without calling
+        assert transport.get("A/B/v1", {}) is None
+        assert transport.errors["A/B/v1 cooldown"] == 1
+
+
+def test_get_rate_limited() -> None:
+    transport, _, _ = _transport([FakeResponse(200)] * 20)
+    results = [transport.get("A/B/v1", {}) for _ in range(12)]
+    assert results.count(None) == 2
+    assert transport.errors["A/B/v1 ratelimited"] == 2
+
+
+@pytest.mark.parametrize(
+    "error", [requests.exceptions.InvalidURL("bad"), requests.TooManyRedirects("loop")]
+)
+def test_get_request_exception(error: Exception) -> None:
+    transport, _, _ = _transport([error, FakeResponse(200)])
+    assert transport.get("A/B/v1", {}) == {"status": "200"}
+    assert transport.errors[f"A/B/v1 {error.__class__.__name__}"] == 1
+
+
+def test_get_not_json() -> None:
+    transport, sleeps, _ = _transport([FakeResponse(200, body="<html>")])
+    assert transport.get("A/B/v1", {}) is None
+    assert not sleeps
+    assert transport.errors["A/B/v1 JSONDecodeError"] == 1
+
+
+def test_get_deadline() -> None:
+    transport, sleeps, timeouts = _transport([requests.Timeout("slow")] * 3, elapsed=6)
+    assert transport.get("A/B/v1", {}) is None
+    # 6s, backoff, then the rest of the 10s deadline; no time left to back off again.
+    assert len(sleeps) == 1
+    assert timeouts == [(3.05, 10), (3.05, pytest.approx(4 - sleeps[0]))]
+    assert transport.errors["A/B/v1 deadline"] == 1
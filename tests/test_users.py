@@ -0,0 +1,169 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import tf2mon
+from tf2mon.database import Database
+from tf2mon.player import Player
+from tf2mon.playeralias import PlayerAlias
+from tf2mon.role import WeaponState
+from tf2mon.steamid import parse_steamid
+from tf2mon.steamplayer import SteamPlayer
+from tf2mon.user import ArchivedUser, Team, UserKey
+from tf2mon.users import Users
+
+pytestmark = pytest.mark.usefixtures("_logging_levels")
+
+
+@pytest.fixture(name="users")
+def fixture_users() -> Users:
+    Database(Path(":memory:"), [Player, SteamPlayer, PlayerAlias])
+    users = Users()
+    users.me = users.my = users[UserKey("me")]
+    return users
+
+
+def test_userid_and_steamid_indexes(users: Users) -> None:
+    user = users[UserKey("bob")]
+    user.userid = 29
+    assert users.users_by_userid[29] is user
+    user.userid = 30
+    assert 29 not in users.users_by_userid
+    assert users.users_by_userid[30] is user
+
+    steamid = parse_steamid("[U:1:99999999]")
+    assert steamid is not None
+    user.steamid = steamid
+    assert users.users_by_steamid[steamid] is user
+    assert not users.check_indexes()
+
+
+def test_active_and_team_indexes(users: Users) -> None:
+    bob = users[UserKey("bob")]
+    assert list(users.team_users(None)) == [users.me, bob]
+
+    bob.team = Team.RED
+    assert list(users.team_users(Team.RED)) == [bob]
+    assert bob not in users.team_users(None)
+
+    users.check_status()
+    users.check_status()
+    assert not bob.is_active
+    assert list(users.active_users()) == [users.me]
+    assert not list(users.team_users(Team.RED))
+
+    bob.team = Team.BLU  # while inactive
+    assert not list(users.team_users(Team.BLU))
+    assert users[UserKey("bob")] is bob
+    assert list(users.team_users(Team.BLU)) == [bob]
+    assert not users.check_indexes()
+
+
+def test_check_indexes(users: Users) -> None:
+    bob = users[UserKey("bob")]
+    del users.active[bob.handle]
+    assert users.check_indexes()
+
+
+def test_reset_game_indexes() -> None:
+    tf2mon.config = {"player_name": "me"}
+    tf2mon.reset_game()
+    assert list(tf2mon.users.team_users(Team.BLU)) == [tf2mon.users.me]
+
+
+def _depart(users: Users, user_key: str) -> None:
+    user = users.users_by_username[UserKey(user_key)]
+    while user.is_active or user.handle in users.inactive:
+        users.check_status()
+
+
+def test_archive_and_restore(users: Users) -> None:
+    bob = users[UserKey("bob")]
+    sue = users[UserKey("sue")]
+    bob.userid = 29
+    bob.steamid = parse_steamid("[U:1:99999999]")
+    bob.team = Team.RED
+    bob.nkills = 3
+    users.duels.add_kill(bob.handle, sue.handle, WeaponState(7))
+    users.duels.add_kill(sue.handle, bob.handle, WeaponState(8))
+
+    _depart(users, "bob")
+    record = users.users_by_handle[bob.handle]
+    assert isinstance(record, ArchivedUser)
+    assert UserKey("bob") not in users.users_by_username
+    assert 29 not in users.users_by_userid
+    assert not users.duels.weapons(bob.handle, sue.handle)
+    assert users.duels.duel(sue.handle, bob.handle) == (1, 1)
+    assert list(sue.opponents) == []
+    assert not users.check_indexes()
+
+    assert bob.steamid is not None
+    restored = users.find_steamid(bob.steamid)
+    assert restored
+    assert restored is not bob
+    assert restored is users[UserKey("bob")]
+    assert restored.handle == bob.handle
+    assert restored.is_active
+    assert (restored.userid, restored.team, restored.nkills) == (29, Team.RED, 3)
+    assert users.duels.weapons(bob.handle, sue.handle) == {WeaponState(7): 1}
+    assert users.duels.weapons(sue.handle, bob.handle) == {WeaponState(8): 1}
+    assert list(sue.opponents) == [restored]
+    assert not users.check_indexes()
+
+
+def test_rename_and_archive(users: Users) -> None:
+    bob = users[UserKey("bob")]
+    sue = users[UserKey("sue")]
+    bob.username = "robert"
+    assert users.users_by_username.get(UserKey("robert")) is bob
+    assert users.users_by_username.get(UserKey("bob")) is None
+    sue.username = "robert"  # a clone; not indexed by a name already taken.
+    assert users.users_by_username.get(UserKey("robert")) is bob
+    sue.username = "sue"
+    assert users.users_by_username.get(UserKey("sue")) is sue
+
+    _depart(users, "robert")
+    assert users.users_by_username.get(UserKey("robert")) is None
+    assert isinstance(users.users_by_handle[bob.handle], ArchivedUser)
+    assert users[UserKey("robert")].handle == bob.handle
+    assert not users.check_indexes()
+
+
+def test_restore_by_name(users: Users) -> None:
+    bob = users[UserKey("bob")]
+    _depart(users, "bob")
+    assert isinstance(users.users_by_handle[bob.handle], ArchivedUser)
+    assert users[UserKey("bob")].handle == bob.handle
+    assert len(users.users_by_handle) == 2
+    assert not users.check_indexes()
+
+
+def test_banned_alias(users: Users, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        sys.modules["tf2mon.users"],
+        "search_banned_aliases",
+        lambda name: [(-1, "Sneaky", 92)] if name == "Sneaky." else [],
+    )
+    monkeypatch.setattr(tf2mon, "ui", SimpleNamespace(notify_operator=False))
+    assert users[UserKey("Sneaky.")].display_level == "SUSPECT"
+    assert tf2mon.ui.notify_operator
+    assert not users[UserKey("Bob")].display_level
+
+
+def test_team_inference(users: Users) -> None:
+    users.me.team = Team.BLU
+    bob = users[UserKey("bob")]
+    sue = users[UserKey("sue")]
+    users.opposite_teams(bob, sue)
+    assert (bob.team, sue.team) == (None, None)
+
+    users.same_team(bob, users.me)
+    assert (bob.team, sue.team) == (Team.BLU, Team.RED)
+    assert list(users.team_users(Team.RED)) == [sue]
+
+    users.switch_teams()
+    assert (users.me.team, bob.team, sue.team) == (Team.RED, Team.RED, Team.BLU)
+    assert list(users.team_users(Team.BLU)) == [sue]
+    assert not users.check_indexes()
@@ -7,18 +7,24 @@ from typing import Any
 
 from loguru import logger
 
+from tf2mon.chathistory import ChatHistoryWriter
 from tf2mon.conlog import Conlog
 from tf2mon.controller import Controller
+from tf2mon.eventstore import EventStoreWriter
+from tf2mon.journal import JournalWriter
+from tf2mon.renderer import Renderer
 from tf2mon.steamweb import SteamWebAPI
-from tf2mon.ui import UI
 from tf2mon.user import Team, UserKey
 from tf2mon.users import Users
 
+chat_history: ChatHistoryWriter | None = None
 config: dict[str, Any] = {}
 conlog: Conlog | None = None
+event_store: EventStoreWriter | None = None
+journal: JournalWriter | None = None
 options: Namespace
 steam_web_api: SteamWebAPI
-ui: UI
+ui: Renderer
 users: Users
 
 from tf2mon.controls.chats import ChatsControl as _ChatsControl  # noqa
@@ -145,6 +151,10 @@ def reset_game() -> None:
     users.my.display_level = "user"
     ChatsControl.clear()
     MsgQueuesControl.clear()
+    if journal:
+        journal.rotate()
+    if event_store:
+        event_store.rotate()
 
 
 def debugger() -> None:
@@ -166,4 +176,4 @@ def dump() -> None:
 
     logger.success(pformat(users.__dict__))
     for user in users.users_by_username.values():
-        logger.success(pformat(user.__dict__))
+        logger.success(pformat({x: getattr(user, x) for x in user.__slots__}))
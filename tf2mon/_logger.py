@@ -32,25 +32,90 @@ class InterceptHandler(logging.Handler):
 
 logging.basicConfig(handlers=[InterceptHandler()], level=0)
 
+# levels logged for (nearly) every line read, all guarded by `ENABLED`;
+# suspended while fast-forwarding.
+PER_LINE_LEVELS = frozenset(
+    [
+        "exclude",
+        "ignore",
+        "regex",
+        "logline",
+        "nextline",
+        "KILL",
+        "KILLBLU",
+        "KILLRED",
+        "STATUS",
+        "ADDLOBBY",
+    ]
+)
+
+
+class _Enabled:
+    """Whether messages at each level would reach any sink, by level name.
+
+    Loguru creates the record, and inspects the caller's frame, before it
+    learns that no sink wants it. Guard messages on the per-line hot path
+    with `if ENABLED["regex"]: logger.log("regex", ...)`, so that a level
+    filtered by every sink costs a dict lookup, and the message is never
+    built. The flags are recomputed whenever loguru's minimum level
+    changes, i.e., when a sink is added or removed, or a level is added,
+    and when `PER_LINE_LEVELS` are suspended or resumed.
+    """
+
+    def __init__(self) -> None:
+        """Create flags, computed on first use."""
+
+        self._min_level: float | None = None
+        self._nlevels = 0
+        self._enabled: dict[str, bool] = {}
+        self.is_suspended = False
+
+    def suspend(self, is_suspended: bool = True) -> None:
+        """Disable `PER_LINE_LEVELS` if `is_suspended`, else restore them."""
+
+        self.is_suspended = is_suspended
+        self._min_level = None  # recompute.
+
+    def __getitem__(self, level: str) -> bool:
+        """Return True if messages at `level` would be logged."""
+
+        core = logger._core  # type: ignore # noqa: protected-access
+        if core.min_level != self._min_level or len(core.levels) != self._nlevels:
+            self._min_level = core.min_level
+            self._nlevels = len(core.levels)
+            self._enabled = {
+                x.name: x.no >= core.min_level
+                and not (self.is_suspended and x.name in PER_LINE_LEVELS)
+                for x in core.levels.values()
+            }
+        return self._enabled.get(level, False)
+
+
+ENABLED = _Enabled()
+
 
 def configure_logger() -> None:
     """Logger config."""
 
     logger.remove()
-    logger.add(sys.stderr, level="TRACE", colorize=False)
+    # log files are written by loguru's thread, never dropped nor waited on.
+    logger.add(sys.stderr, level="TRACE", colorize=False, enqueue=True)
 
     with contextlib.suppress(OSError):
         if stat.S_ISREG(os.stat(3).st_mode):
-            logger.add(os.fdopen(3, mode="w"), level="TRACE", colorize=True)
+            logger.add(os.fdopen(3, mode="w"), level="TRACE", colorize=True, enqueue=True)
 
     add_logging_levels()
 
 
 def add_logging_levels() -> None:
-    """Add custom logging levels."""
+    """Add custom logging levels, unless already added."""
 
     # pylint: disable=too-many-statements
 
+    if "ADMIN" in logger._core.levels:  # type: ignore # noqa: protected-access
+        return
+
     # remove bold from loguru default colors
     for lvl in logger._core.levels.values():  # type: ignore # noqa: protected-access
         logger.level(lvl.name, color=lvl.color.replace("<bold>", ""))
@@ -0,0 +1,279 @@
+"""Lifetime stats of many console logfiles; their games played in parallel (`--batch`).
+
+Each logfile is split at its game boundaries (`GameIndex`), and each game
+is played in a process pool by the same `GameEvent` handlers as the
+monitor, without rendering. Each game yields its own `BatchStats`, which
+are merged, in logfile order, into one.
+
+Workers vet players against a private in-memory copy of `--database`,
+taken when the worker starts; anything the handlers write to it is
+discarded. The steam web api is not called.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from loguru import logger
+
+import tf2mon
+import tf2mon.game
+from tf2mon._logger import ENABLED
+from tf2mon.conlog import Conlog
+from tf2mon.database import Database
+from tf2mon.gameindex import GameBoundary, GameIndex
+from tf2mon.player import Player, known_steamids
+from tf2mon.playeralias import PlayerAlias
+from tf2mon.racist import load_racist_data
+from tf2mon.renderer import Renderer
+from tf2mon.role import load_weapons_data
+from tf2mon.steamid import accountid
+from tf2mon.steamplayer import SteamPlayer
+from tf2mon.steamweb import SteamWebAPI
+from tf2mon.texttable import TextColumn, TextTable
+
+DATADIR = Path(__file__).parent / "data"
+
+# `Conlog` options of this (worker) process; see `init_worker`.
+_options = Namespace()
+
+
+class BatchGame(NamedTuple):
+    """A game to play; in `path`, from `game` to before line `end_lineno`, if given."""
+
+    path: Path
+    game: GameBoundary
+    end_lineno: int | None
+
+
+@dataclass(slots=True)
+class PlayerStats:
+    """Lifetime stats of a player, by steamid (`accountid`, as `Player`)."""
+
+    steamid: int
+    ngames: int = 0
+    nkills: int = 0
+    ndeaths: int = 0
+    nkilled_me: int = 0  # duels against `player_name`.
+    nkilled_by_me: int = 0
+    # number of games flagged, by display level ("CHEATER", "RACIST"...)
+    levels: dict[str, int] = field(default_factory=dict)
+    # number of games played, by name; in order of first appearance.
+    aliases: dict[str, int] = field(default_factory=dict)
+
+    def merge(self, other: PlayerStats) -> None:
+        """Add `other` (of the same player) to these stats."""
+
+        self.ngames += other.ngames
+        self.nkills += other.nkills
+        self.ndeaths += other.ndeaths
+        self.nkilled_me += other.nkilled_me
+        self.nkilled_by_me += other.nkilled_by_me
+        for level, count in other.levels.items():
+            self.levels[level] = self.levels.get(level, 0) + count
+        for alias, count in other.aliases.items():
+            self.aliases[alias] = self.aliases.get(alias, 0) + count
+
+
+@dataclass(slots=True)
+class BatchStats:
+    """Stats of one or more games."""
+
+    ngames: int = 0
+    nlines: int = 0
+    nkills: int = 0
+    players: dict[int, PlayerStats] = field(default_factory=dict)
+
+    table = TextTable(
+        [
+            TextColumn(-10, "STEAMID"),
+            TextColumn(-5, "GAMES"),
+            TextColumn(-6, "K"),
+            TextColumn(-6, "D"),
+            TextColumn(-6, "KME"),  # killed me.
+            TextColumn(-6, "DME"),  # killed by me.
+            TextColumn(10, "LEVEL"),
+            TextColumn(0, "ALIASES"),
+        ]
+    )
+
+    def merge(self, other: BatchStats) -> None:
+        """Add `other` to these stats."""
+
+        self.ngames += other.ngames
+        self.nlines += other.nlines
+        self.nkills += other.nkills
+        for steamid, stats in other.players.items():
+            if player := self.players.get(steamid):
+                player.merge(stats)
+            else:
+                self.players[steamid] = stats
+
+    def summary(self) -> dict[str, Any]:
+        """Return stats as a json-able dict."""
+
+        return {
+            "games": self.ngames,
+            "lines": self.nlines,
+            "kills": self.nkills,
+            "players": [asdict(x) for x in self._sorted()],
+        }
+
+    def format(self) -> Iterator[str]:
+        """Yield lines of a table of the players."""
+
+        yield f"{self.ngames} games, {self.nlines} lines, {self.nkills} kills"
+        yield self.table.formatted_header.rstrip()
+        for player in self._sorted():
+            yield self.table.format_detail(
+                player.steamid,
+                player.ngames,
+                player.nkills,
+                player.ndeaths,
+                player.nkilled_me,
+                player.nkilled_by_me,
+                max(player.levels, key=player.levels.__getitem__) if player.levels else "",
+                ", ".join(repr(x) for x in player.aliases),
+            ).rstrip()
+
+    def _sorted(self) -> list[PlayerStats]:
+        return sorted(self.players.values(), key=lambda x: (-x.ngames, x.steamid))
+
+
+def batch_games(paths: Iterable[Path], player_name: str) -> list[BatchGame]:
+    """Return the games in logfiles `paths`.
+
+    Lines before the first game of a logfile (of a game joined before the
+    logfile was truncated) are played as a game of their own.
+    """
+
+    games = []
+    for path in paths:
+        index = GameIndex.load(path, player_name)
+        first = index.games[0].lineno if index.games else None
+        if first != 1 and index.path.stat().st_size:
+            games.append(BatchGame(index.path, GameBoundary(1, 0), first))
+        for number in range(1, len(index.games) + 1):
+            games.append(BatchGame(index.path, *index.game(number)))
+    return games
+
+
+def init_worker(config: dict[str, Any], database: Path, exclude_file: Path) -> None:
+    """Prepare `tf2mon` globals in this (worker) process to play games."""
+
+    global _options  # pylint: disable=global-statement
+    _options = Namespace(
+        rewind=True,
+        follow=False,
+        exclude_file=exclude_file,
+        inject_cmds=None,
+        inject_file=None,
+    )
+    logger.disable("tf2mon")  # repeated by every worker.
+    try:
+        tf2mon.config = config
+        tf2mon.ui = Renderer()
+        tf2mon.steam_web_api = SteamWebAPI("")
+        load_weapons_data(DATADIR / "weapons.csv")
+        load_racist_data(DATADIR / "racist.txt")
+
+        if not Database():
+            db = Database(Path(":memory:"))
+            assert db
+            path = database.expanduser()
+            if path.exists():
+                source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+                source.backup(db.connection)
+                source.close()
+            for table in (Player, SteamPlayer, PlayerAlias):
+                table.create_table()
+        known_steamids()
+    finally:
+        logger.enable("tf2mon")
+
+
+def play_game(batch_game: BatchGame) -> BatchStats:
+    """Play `batch_game`, without logging; return its stats."""
+
+    logger.disable("tf2mon")
+    ENABLED.suspend(True)
+    try:
+        tf2mon.conlog = conlog = Conlog(Namespace(con_logfile=batch_game.path, **vars(_options)))
+        conlog.select_game(batch_game.game, batch_game.end_lineno)
+        tf2mon.reset_game()
+        conlog.open()
+        events = tf2mon.game.events
+        while (line := conlog.readline()) is not None:
+            if not line:
+                continue
+            for event in events:
+                if match := event.search(line):
+                    event.handler(match)
+                    break
+    finally:
+        ENABLED.suspend(False)
+        logger.enable("tf2mon")
+
+    return _game_stats(conlog.lineno - batch_game.game.lineno + 1)
+
+
+def _game_stats(nlines: int) -> BatchStats:
+    """Return stats of the game just played."""
+
+    users = tf2mon.users
+    stats = BatchStats(1, nlines, len(users.kills))
+    for user in users.users_by_handle:
+        if not user.steamid or user.handle == users.me.handle:
+            continue
+        steamid = accountid(user.steamid)
+        if not (player := stats.players.get(steamid)):
+            player = stats.players[steamid] = PlayerStats(steamid, 1)
+        player.nkills += user.nkills
+        player.ndeaths += user.ndeaths
+        nkilled_by_me, nkilled_me = users.duels.duel(users.me.handle, user.handle)
+        player.nkilled_me += nkilled_me
+        player.nkilled_by_me += nkilled_by_me
+        if user.display_level not in ("", "user"):
+            player.levels[user.display_level] = 1
+        player.aliases[user.username] = 1
+    return stats
+
+
+def run_batch(
+    paths: Iterable[Path],
+    config: dict[str, Any],
+    database: Path,
+    exclude_file: Path,
+    jobs: int | None = None,
+) -> BatchStats:
+    """Play the games in logfiles `paths`, in `jobs` processes; return merged stats.
+
+    `jobs` defaults to the number of CPUs; with 1, games are played in this
+    process, whose `tf2mon` globals are left as the last game left them.
+    Must be called before this process opens the database, so that workers
+    do not inherit its connection.
+    """
+
+    games = batch_games(paths, str(config.get("player_name")))
+    jobs = min(jobs or os.cpu_count() or 1, len(games)) or 1
+    logger.info(f"Playing {len(games)} games in {jobs} processes")
+
+    stats = BatchStats()
+    initargs = (config, database, exclude_file)
+    if jobs == 1:
+        init_worker(*initargs)
+        for game in games:
+            stats.merge(play_game(game))
+        return stats
+
+    with ProcessPoolExecutor(jobs, initializer=init_worker, initargs=initargs) as pool:
+        chunksize = max(1, len(games) // (jobs * 4))
+        for game_stats in pool.map(play_game, games, chunksize=chunksize):
+            stats.merge(game_stats)
+    return stats
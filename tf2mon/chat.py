@@ -10,16 +10,15 @@ if TYPE_CHECKING:
     from tf2mon.user import User, UserStats
 
 
-@dataclass
+@dataclass(slots=True)
 class Chat:
     """Player `Chat` message."""
 
     user: User
     teamflag: bool
     msg: str
-    timestamp: float | None = field(default=None)
+    timestamp: float = field(default=0)
     #
-    s_timestamp: str | None = field(default=None, init=False)
     stats: UserStats | None = field(default=None, init=False)
 
     def __post_init__(self) -> None:
@@ -28,8 +27,12 @@ class Chat:
         if not self.timestamp:
             self.timestamp = time.time()
 
-        self.s_timestamp = time.strftime("%T", time.localtime(self.timestamp))
-        # _dt = datetime.datetime.fromtimestamp(self.timestamp)
-        # self.s_timestamp = _dt.strftime("%T.%f")  # [:-4]
-
         self.stats = self.user.snap_stats()
+
+    @property
+    def s_timestamp(self) -> str:
+        """Return time of chat formatted for display."""
+
+        return time.strftime("%T", time.localtime(self.timestamp))
+        # _dt = datetime.datetime.fromtimestamp(self.timestamp)
+        # return _dt.strftime("%T.%f")  # [:-4]
@@ -0,0 +1,247 @@
+"""Full-text searchable history of the chats of every game (`--chat-history`).
+
+Chats are inserted into table `chats` of an SQLite database of their own,
+indexed by FTS5 table `chats_fts` (external content; kept in sync by a
+trigger), and by steamid. A chat is identified by its time,
+steamid, username and message, so a logfile replayed again does not
+duplicate its chats, if TF2 logs timestamps (`con_timestamp 1`);
+otherwise chats are timed by the clock.
+"""
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple
+
+from loguru import logger
+
+from tf2mon.steamid import accountid
+from tf2mon.texttable import TextColumn, TextTable
+
+if TYPE_CHECKING:
+    from tf2mon.chat import Chat
+    from tf2mon.conlog import Conlog
+
+# Most rows inserted by one transaction.
+BATCH_ROWS = 1000
+
+SCHEMA = (
+    """create table if not exists chats(
+        time text,
+        steamid integer,
+        username text,
+        teamflag integer,
+        msg text,
+        unique (time, steamid, username, msg)
+    )""",
+    "create index if not exists chats_steamid on chats(steamid)",
+    # `steamid` is indexed as a token too, to intersect with `username` and `msg`.
+    """create virtual table if not exists chats_fts
+        using fts5(username, msg, steamid, content=chats, content_rowid=rowid)""",
+    """create trigger if not exists chats_insert after insert on chats begin
+        insert into chats_fts(rowid, username, msg, steamid)
+            values (new.rowid, new.username, new.msg, new.steamid);
+    end""",
+)
+
+
+def strftime(seconds: float) -> str:
+    """Return `seconds` since the epoch, formatted as a `chats.time`."""
+
+    return time.strftime("%FT%T", time.localtime(seconds))
+
+
+class ChatHistoryWriter:
+    """Insert chats into a chat history database; in batches, by a thread of its own.
+
+    The game thread only queues rows. The writer thread inserts whatever
+    rows are queued, up to `BATCH_ROWS`, in each transaction; one at a
+    time when live, in bulk when replaying a logfile.
+    """
+
+    def __init__(self, path: Path, conlog: Conlog) -> None:
+        """Open, or create, database `path` and start writer thread."""
+
+        self.path = path.expanduser()
+        self.conlog = conlog
+        self.ninserted = 0  # not counting duplicates.
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # created here, to fail early; used only by the writer thread.
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        for statement in SCHEMA:
+            self._connection.execute(statement)
+        self._connection.commit()
+
+        self._queue: queue.SimpleQueue[tuple[str, int, str, int, str] | None]
+        self._queue = queue.SimpleQueue()
+        self._lineno = 0  # of last chat; chats replayed after seeking back are skipped.
+        self._closed = False
+        self._thread = threading.Thread(name="CHATHISTORY", target=self._run, daemon=True)
+        self._thread.start()
+
+    def append(self, chat: Chat) -> None:
+        """Queue `chat` to be inserted."""
+
+        if self._closed or (lineno := self.conlog.lineno) <= self._lineno:
+            return
+        self._lineno = lineno
+
+        user = chat.user
+        self._queue.put(
+            (
+                strftime(self.conlog.timestamp or chat.timestamp),
+                accountid(user.steamid) if user.steamid else 0,
+                user.username,
+                int(chat.teamflag),
+                chat.msg,
+            )
+        )
+
+    def _run(self) -> None:
+        """Insert queued rows until closed."""
+
+        done = False
+        while not done:
+            rows = [self._queue.get()]
+            while len(rows) < BATCH_ROWS:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in rows:
+                rows.remove(None)
+                done = True
+            if rows:
+                self._insert(rows)  # type: ignore[arg-type]
+        self._connection.close()
+
+    def _insert(self, rows: list[tuple[str, int, str, int, str]]) -> None:
+        """Insert `rows` in one transaction."""
+
+        try:
+            with self._connection:
+                cursor = self._connection.executemany(
+                    "insert or ignore into chats values(?,?,?,?,?)", rows
+                )
+                ninserted = cursor.rowcount  # not counting duplicates, nor the trigger.
+        except sqlite3.Error as err:
+            logger.error(f"`{self.path}`: {err}; {len(rows)} chats lost")
+            return
+
+        self.ninserted += ninserted
+        logger.debug(f"Inserted {ninserted} of {len(rows)} chats into `{self.path}`")
+
+    def close(self) -> None:
+        """Insert the chats queued, and no more."""
+
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+
+class ChatMatch(NamedTuple):
+    """A chat found in the chat history."""
+
+    time: str  # "YYYY-MM-DDTHH:MM:SS", local.
+    steamid: int  # accountid; 0 if not known.
+    username: str
+    teamflag: int
+    msg: str
+
+
+class ChatHistory:
+    """Search a chat history database."""
+
+    table = TextTable(
+        [
+            TextColumn(19, "TIME"),
+            TextColumn(-10, "STEAMID"),
+            TextColumn(20, "USERNAME"),
+            TextColumn(0, "MSG"),
+        ]
+    )
+
+    def __init__(self, path: Path) -> None:
+        """Open chat history database `path`, read-only."""
+
+        self.path = path.expanduser()
+        if not self.path.is_file():
+            raise FileNotFoundError(f"No chat history `{self.path}`")
+        self._connection = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+
+    def search(
+        self,
+        query: str = "",
+        steamids: Iterable[int] = (),
+        since: str | None = None,
+        limit: int = 100,
+    ) -> list[ChatMatch]:
+        """Return the last `limit` chats recorded, newest first, that match all criteria given.
+
+        Chats are ordered as recorded (by rowid), not by time; so that
+        searches for common words need not sort every chat that matches.
+
+        Args:
+            query: FTS5 query of the `username` and `msg` columns; e.g.,
+                `"free hats" OR msg:bot*`.
+            steamids: chatted by any of these (accountids).
+            since: on or after day `YYYY-MM-DD`.
+            limit: most chats returned.
+
+        Raises:
+            sqlite3.Error: e.g., `query` syntax error.
+        """
+
+        where = []
+        params: list[str | int] = []
+        steamids = list(steamids)
+        if query:
+            sql = "select chats.* from chats_fts join chats on chats.rowid = chats_fts.rowid"
+            where.append("chats_fts match ?")
+            # not `steamid`, unless given; then intersected by the index.
+            query = f"{{username msg}} : ({query})"
+            if steamids:
+                query += f" AND steamid : ({' OR '.join(map(str, steamids))})"
+            params.append(query)
+            order = "chats_fts.rowid"
+        else:
+            sql = "select * from chats"
+            order = "chats.rowid"
+        if steamids:
+            where.append(f"chats.steamid in ({','.join('?' * len(steamids))})")
+            params.extend(steamids)
+        if since:
+            where.append("chats.time >= ?")
+            params.append(since)
+
+        if where:
+            sql += " where " + " and ".join(where)
+        sql += f" order by {order} desc limit ?"
+        params.append(limit)
+
+        return [ChatMatch(*row) for row in self._connection.execute(sql, params)]
+
+    def format(self, matches: Iterable[ChatMatch]) -> Iterator[str]:
+        """Yield lines of a table of `matches`."""
+
+        yield self.table.formatted_header.rstrip()
+        for match in matches:
+            yield self.table.format_detail(
+                match.time,
+                match.steamid or "",
+                match.username,
+                ("(TEAM) " if match.teamflag else "") + match.msg,
+            ).rstrip()
+
+    def close(self) -> None:
+        """Close database."""
+
+        self._connection.close()
@@ -0,0 +1,135 @@
+"""Checkpoints of game state, to seek backward while replaying."""
+
+from __future__ import annotations
+
+import bisect
+import pickle
+import zlib
+from dataclasses import dataclass
+
+from loguru import logger
+
+import tf2mon
+from tf2mon.users import Users
+
+# Lines between checkpoints.
+INTERVAL = 1000
+
+# Checkpoints kept before the older are thinned out.
+MAX_CHECKPOINTS = 100
+
+
+@dataclass(slots=True)
+class Checkpoint:
+    """Game state after line `lineno` was handled."""
+
+    lineno: int
+    data: bytes  # compressed pickle; see `Checkpoints.take`.
+
+
+class Checkpoints:
+    """Checkpoints of game state, taken every `interval` lines and after every `reset_game`.
+
+    A checkpoint holds the `Users` model (with its duels, kills and teams),
+    the kicks and spams queues, the chats, and the position of `conlog`;
+    pickled together, so that objects shared among them remain shared when
+    restored, and compressed. A checkpoint is restored by replacing these
+    globals with unpickled copies, which the game goes on to modify; the
+    checkpoint itself is never modified.
+
+    When more than `max_checkpoints` are held, every other checkpoint of
+    the older half is dropped (but never the first); so that memory is
+    bounded when following a live logfile, and checkpoints thin out as
+    they age.
+    """
+
+    def __init__(self, interval: int = INTERVAL, max_checkpoints: int = MAX_CHECKPOINTS) -> None:
+        """Create empty list of checkpoints."""
+
+        self.interval = interval
+        self.max_checkpoints = max_checkpoints
+        self._checkpoints: list[Checkpoint] = []
+        self._linenos: list[int] = []
+        self._next_lineno = 0  # when next due.
+        self._users: Users | None = None  # as of last taken or restored.
+
+    def __len__(self) -> int:
+        return len(self._checkpoints)
+
+    @property
+    def nbytes(self) -> int:
+        """Return size of all checkpoints."""
+
+        return sum(len(x.data) for x in self._checkpoints)
+
+    def is_due(self) -> bool:
+        """Return True if a checkpoint should be taken now."""
+
+        assert tf2mon.conlog
+        return tf2mon.users is not self._users or tf2mon.conlog.lineno >= self._next_lineno
+
+    def take(self) -> None:
+        """Take checkpoint of game state now.
+
+        Replaces any taken at the same line; by an earlier reset at this
+        line, or before seeking backward and replaying this line again.
+        """
+
+        assert tf2mon.conlog
+        lineno = tf2mon.conlog.lineno
+
+        state = (
+            tf2mon.users,
+            list(tf2mon.KicksControl.msgs),
+            list(tf2mon.SpamsControl.msgs),
+            tf2mon.ChatsControl._chats,  # pylint: disable=protected-access
+            tf2mon.conlog.tell(),
+        )
+        checkpoint = Checkpoint(
+            lineno, zlib.compress(pickle.dumps(state, pickle.HIGHEST_PROTOCOL), 1)
+        )
+
+        index = bisect.bisect_left(self._linenos, lineno)
+        if index < len(self._linenos) and self._linenos[index] == lineno:
+            self._checkpoints[index] = checkpoint
+        else:
+            self._checkpoints.insert(index, checkpoint)
+            self._linenos.insert(index, lineno)
+            if len(self._checkpoints) > self.max_checkpoints:
+                self._thin()
+
+        self._next_lineno = lineno + self.interval
+        self._users = tf2mon.users
+
+    def _thin(self) -> None:
+        """Drop every other checkpoint of the older half, keeping the first."""
+
+        half = len(self._checkpoints) // 2
+        del self._checkpoints[1:half:2]
+        del self._linenos[1:half:2]
+        logger.debug(f"thinned checkpoints to {len(self._checkpoints)}")
+
+    def restore(self, lineno: int) -> int:
+        """Restore the last checkpoint taken before line `lineno`; return its lineno.
+
+        The earliest checkpoint is restored if none was taken before `lineno`.
+        """
+
+        if not self._checkpoints:
+            raise ValueError("No checkpoints")
+
+        index = max(0, bisect.bisect_left(self._linenos, lineno) - 1)
+        checkpoint = self._checkpoints[index]
+
+        users, kicks, spams, chats, position = pickle.loads(zlib.decompress(checkpoint.data))
+        tf2mon.users = self._users = users
+        for control, msgs in ((tf2mon.KicksControl, kicks), (tf2mon.SpamsControl, spams)):
+            control.msgs.clear()
+            control.msgs.extend(msgs)
+        tf2mon.ChatsControl._chats = chats  # pylint: disable=protected-access
+        assert tf2mon.conlog
+        tf2mon.conlog.seek(position)
+        self._next_lineno = checkpoint.lineno + self.interval
+
+        logger.log("ADMIN", f"restored checkpoint at line {checkpoint.lineno}")
+        return checkpoint.lineno
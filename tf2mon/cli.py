@@ -1,7 +1,10 @@
 """Command line interface."""
 
+import json
+import sqlite3
 import threading
 from pathlib import Path
+from typing import Any
 
 import xdg
 from libcli import BaseCLI
@@ -10,9 +13,19 @@ from loguru import logger
 import tf2mon
 import tf2mon.layouts
 from tf2mon._logger import configure_logger
+from tf2mon.batch import run_batch
+from tf2mon.chathistory import ChatHistory
 from tf2mon.conlog import Conlog
 from tf2mon.database import Database
+from tf2mon.eventstore import EventStore
+from tf2mon.gameindex import GameIndex
+from tf2mon.hackers import import_playerlist, print_playerlist
 from tf2mon.monitor import Monitor
+from tf2mon.player import Player
+from tf2mon.playeralias import PlayerAlias
+from tf2mon.role import UNMAPPED_WEAPONS
+from tf2mon.steamid import accountid, steamid64
+from tf2mon.steamplayer import SteamPlayer
 from tf2mon.steamweb import SteamWebAPI
 
 __all__ = ["Tf2monCLI"]
@@ -97,6 +110,9 @@ class Tf2monCLI(BaseCLI):
         tf2mon.controller.add_arguments_to(self.parser)
         self._add_debug_args()
         self._add_database_args()
+        self._add_event_store_args()
+        self._add_chat_history_args()
+        self._add_config_file()
         self._add_fkeys_args()
         self._add_numpad()
         self._add_duels()
@@ -168,6 +184,19 @@ class Tf2monCLI(BaseCLI):
             help="show path to logfile and exit",
         )
 
+        self.parser.add_argument(
+            "--list-games",
+            action="store_true",
+            help="list games in logfile and exit",
+        )
+
+        self.parser.add_argument(
+            "--game",
+            metavar="N",
+            type=int,
+            help="replay only game `N` of logfile (`-1` is the last); implies `--rewind`",
+        )
+
         self.parser.add_argument(
             "--trunc-con-logfile",
             action="store_true",
@@ -189,6 +218,47 @@ class Tf2monCLI(BaseCLI):
         )
         self.add_default_to_help(arg)
 
+        self.parser.add_argument(
+            "--journal",
+            metavar="DIR",
+            type=Path,
+            help="write a journal of parsed game events to `DIR`, one file per game",
+        )
+
+        self.parser.add_argument(
+            "--replay-journal",
+            metavar="FILE",
+            type=Path,
+            help="replay game from journal `FILE` instead of `con_logfile`; implies `--no-follow`",
+        )
+
+        self.parser.add_argument(
+            "--headless",
+            action="store_true",
+            help="play game without curses and print a summary; implies `--rewind --no-follow`",
+        )
+
+        self.parser.add_argument(
+            "--batch",
+            metavar="FILE",
+            nargs="+",
+            type=Path,
+            help="play every game of logfiles `FILE` in parallel; print lifetime stats and exit",
+        )
+
+        self.parser.add_argument(
+            "--jobs",
+            metavar="N",
+            type=int,
+            help="play `--batch` games in `N` processes (default: number of CPUs)",
+        )
+
+        self.parser.add_argument(
+            "--json",
+            action="store_true",
+            help="print `--headless` or `--batch` summary as json",
+        )
+
     def _add_debug_args(self) -> None:
 
         group = self.parser.add_argument_group("Debugging options")
@@ -234,6 +304,12 @@ class Tf2monCLI(BaseCLI):
         )
         self.add_default_to_help(arg)
 
+        group.add_argument(
+            "--check-indexes",
+            action="store_true",
+            help="verify user indexes after every event (slow)",
+        )
+
     def _add_database_args(self) -> None:
 
         group = self.parser.add_argument_group("Database options")
@@ -269,6 +345,21 @@ class Tf2monCLI(BaseCLI):
             help="print hackers database and exit",
         )
 
+        group.add_argument(
+            "--import-hackers",
+            action="store_true",
+            help="import hackers database (TF2BD playerlist json) and exit",
+        )
+
+        group.add_argument(
+            "--replace-hackers",
+            action="store_true",
+            help="with `--import-hackers`, replace previously imported attributes"
+            " instead of merging",
+        )
+
+    def _add_config_file(self) -> None:
+
         self.parser.add_argument_group(
             "Configuration file",
             self.dedent(
@@ -360,6 +451,83 @@ class Tf2monCLI(BaseCLI):
             ),
         )
 
+    def _add_event_store_args(self) -> None:
+
+        group = self.parser.add_argument_group("Event store options")
+
+        group.add_argument(
+            "--event-store",
+            metavar="DIR",
+            type=Path,
+            help="append kills, chats, captures and status samples of every game to `DIR`",
+        )
+
+        group.add_argument(
+            "--top-opponents",
+            metavar="N",
+            type=int,
+            nargs="?",
+            const=20,
+            help="print `N` opponents with the best k/d against you in `--event-store` and exit",
+        )
+
+        group.add_argument(
+            "--weapon-states",
+            metavar="STEAMID",
+            nargs="?",
+            const="",
+            help="print kills by weapon state, of all players or of `STEAMID`, and exit",
+        )
+
+        group.add_argument(
+            "--kill-rate",
+            metavar="STEAMID",
+            help="print kills and deaths of `STEAMID` per hour and exit",
+        )
+
+        group.add_argument(
+            "--since",
+            metavar="YYYY-MM-DD",
+            help="query `--event-store` or `--chat-history` from day `YYYY-MM-DD`",
+        )
+
+    def _add_chat_history_args(self) -> None:
+
+        group = self.parser.add_argument_group("Chat history options")
+
+        group.add_argument(
+            "--chat-history",
+            metavar="FILE",
+            type=Path,
+            help="insert chats of every game into full-text searchable database `FILE`",
+        )
+
+        group.add_argument(
+            "--search-chats",
+            metavar="QUERY",
+            nargs="?",
+            const="",
+            help="print latest chats in `--chat-history` that match FTS5 `QUERY`, or all,"
+            " and exit",
+        )
+
+        group.add_argument(
+            "--chats-by",
+            nargs="+",
+            metavar="STEAMID",
+            help="print latest chats by `STEAMID` in `--chat-history` and exit;"
+            " with `--search-chats`, only theirs",
+        )
+
+        arg = group.add_argument(
+            "--max-chats",
+            metavar="N",
+            type=int,
+            default=100,
+            help="print at most `N` chats",
+        )
+        self.add_default_to_help(arg)
+
     def _add_fkeys_args(self) -> None:
 
         self.parser.add_argument_group(
@@ -378,6 +546,11 @@ class Tf2monCLI(BaseCLI):
     messages during the game. `%(prog)s` can either "tail -f" an active
     game, or `--rewind` and replay saved logfiles. Press `Enter` in the
     admin console to process the next line when in `--single-step` mode.
+    With `--rewind`, lines before `--break` or `--search` are played
+    without updating the display, which then starts single-stepping.
+    Enter `back N` or `goto LINENO` to seek there, from the nearest
+    checkpoint of the game, taken every 1000 lines. Enter `chats [#USERID]
+    [QUERY]` to search the `--chat-history`.
     Type `quit` or press `^D` to exit.
 
         `One-machine, Two-monitors`
@@ -469,10 +642,38 @@ class Tf2monCLI(BaseCLI):
         if self.options.single_step and not self.options.follow:
             self.parser.error("--no-follow not allowed with --single-step")
 
+        if self.options.replay_journal:
+            self.options.follow = False
+
+        if self.options.headless:
+            if self.options.single_step or self.options.breakpoint or self.options.search:
+                self.parser.error("--single-step, --break and --search not allowed with --headless")
+            self.options.rewind = True
+            self.options.follow = False
+
         if self.options.list_con_logfile:
             print(self.options.con_logfile)
             self.parser.exit()
 
+        if self.options.list_games or self.options.game is not None:
+            self._games()
+
+        if self.options.batch:
+            self._batch()
+            self.parser.exit()
+
+        if (
+            self.options.top_opponents is not None
+            or self.options.weapon_states is not None
+            or self.options.kill_rate
+        ):
+            self._query_event_store()
+            self.parser.exit()
+
+        if self.options.search_chats is not None or self.options.chats_by:
+            self._search_chats()
+            self.parser.exit()
+
         if self.options.trunc_con_logfile:
             Conlog(self.options).trunc()
             logger.info(f"con_logfile {str(self.options.con_logfile)!r} truncated; Exiting.")
@@ -491,8 +692,133 @@ class Tf2monCLI(BaseCLI):
                 print(tf2mon.steam_web_api.fetch_steamid(steamid))
             self.parser.exit()
 
+        if self.options.print_hackers or self.options.import_hackers:
+            self._hackers()
+            self.parser.exit()
+
         self.monitor.run()
 
+        for line in tf2mon.steam_web_api.transport.report():
+            logger.info(f"webapi {line}")
+
+        for weapon, count in UNMAPPED_WEAPONS.most_common():
+            logger.info(f"unmapped weapon {weapon!r}: {count} kills")
+
+    def _games(self) -> None:
+        """List the games in the logfile and exit, or check `--game`."""
+
+        try:
+            index = GameIndex.load(
+                self.options.con_logfile, str(self.config.get("player_name"))
+            )
+        except OSError as err:
+            self.parser.error(f"{str(self.options.con_logfile)!r}: {err}")
+
+        if self.options.list_games:
+            for line in index.format():
+                print(line)
+            self.parser.exit()
+
+        try:
+            index.game(self.options.game)
+        except IndexError:
+            self.parser.error(f"--game {self.options.game}: {len(index.games)} games in logfile")
+        self.options.rewind = True
+
+    def _batch(self) -> None:
+        """Print lifetime stats of the games in the `--batch` logfiles."""
+
+        try:
+            stats = run_batch(
+                self.options.batch,
+                self.config,
+                self.options.database,
+                self.options.exclude_file,
+                self.options.jobs,
+            )
+        except OSError as err:
+            self.parser.error(str(err))
+
+        if self.options.json:
+            print(json.dumps(stats.summary(), indent=4))
+        else:
+            for line in stats.format():
+                print(line)
+
+    def _query_event_store(self) -> None:
+        """Print results of queries of the `--event-store`."""
+
+        if not self.options.event_store:
+            self.parser.error("--top-opponents, --weapon-states and --kill-rate need --event-store")
+
+        try:
+            store = EventStore(self.options.event_store, self.options.since)
+        except OSError as err:
+            self.parser.error(str(err))
+
+        rows: list[tuple[Any, ...]]
+        if self.options.top_opponents is not None:
+            table = store.opponents_table
+            rows = [
+                (x.steamid or "", x.nkills, x.ndeaths, x.kdratio, x.name)
+                for x in store.top_opponents(self.options.top_opponents)
+            ]
+        elif self.options.weapon_states is not None:
+            table = store.weapon_states_table
+            steamid = self._accountid(self.options.weapon_states)
+            rows = [(x.nkills, x.percent, x.weapon) for x in store.weapon_states(steamid)]
+        else:
+            table = store.kill_rate_table
+            steamid = self._accountid(self.options.kill_rate)
+            rows = list(store.kill_rate(steamid or 0))
+
+        print(table.formatted_header.rstrip())
+        for row in rows:
+            print(table.format_detail(*row).rstrip())
+
+    def _search_chats(self) -> None:
+        """Print chats in the `--chat-history` that match `--search-chats` and `--chats-by`."""
+
+        if not self.options.chat_history:
+            self.parser.error("--search-chats and --chats-by need --chat-history")
+
+        steamids = [self._accountid(x) or 0 for x in self.options.chats_by or []]
+        try:
+            history = ChatHistory(self.options.chat_history)
+            matches = history.search(
+                self.options.search_chats or "",
+                steamids,
+                self.options.since,
+                self.options.max_chats,
+            )
+        except (OSError, sqlite3.Error) as err:
+            self.parser.error(str(err))
+
+        for line in history.format(matches):
+            print(line)
+        history.close()
+
+    def _accountid(self, s_steamid: str) -> int | None:
+        """Return accountid of `s_steamid`, in any form; None if empty."""
+
+        if not s_steamid:
+            return None
+        if not (steamid := steamid64(s_steamid if not s_steamid.isdigit() else int(s_steamid))):
+            self.parser.error(f"invalid steamid {s_steamid!r}")
+        return accountid(steamid)
+
+    def _hackers(self) -> None:
+        """Print or import the hackers database."""
+
+        try:
+            if self.options.print_hackers:
+                print_playerlist(self.options.hackers)
+            else:
+                Database(self.options.database, [Player, SteamPlayer, PlayerAlias])
+                import_playerlist(self.options.hackers, self.options.replace_hackers)
+        except (OSError, ValueError) as err:
+            self.parser.error(f"{str(self.options.hackers)!r}: {err}")
+
 
 def main(args: list[str] | None = None) -> None:
     """Command line interface entry point (function)."""
@@ -1,5 +1,6 @@
 """TF2's console logfile."""
 
+import functools
 import re
 import time
 from argparse import Namespace
@@ -7,6 +8,8 @@ from typing import IO, NamedTuple
 
 from loguru import logger
 
+from tf2mon._logger import ENABLED
+from tf2mon.gameindex import GameBoundary
 from tf2mon.pkg import APPTAG
 
 
@@ -15,6 +18,23 @@ class _CMD(NamedTuple):
     cmd: str
 
 
+class ConlogPosition(NamedTuple):
+    """Where `Conlog` is reading; see `Conlog.tell` and `Conlog.seek`."""
+
+    offset: int
+    lineno: int
+    buffer: str | None
+    inject_cmds: tuple[_CMD, ...]
+    is_inject_paused: bool
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_timestamp(text: str) -> float:
+    """Return seconds since the epoch of console timestamp `text` (`MM/DD/YYYY - hh:mm:ss`)."""
+
+    return time.mktime(time.strptime(text, "%m/%d/%Y - %H:%M:%S"))
+
+
 class Conlog:
     """TF2 writes console output to the file named in its `con_logfile` variable.
 
@@ -31,11 +51,16 @@ class Conlog:
         self.rewind = options.rewind
         self.follow = options.follow
         self.is_eof: bool = True
-        self.last_line: str | None = None
         self.lineno: int = 0
 
-        # strip optional timestamp; value not used.
-        self._re_timestamp = re.compile(r"^\d{2}/\d{2}/\d{4} - \d{2}:\d{2}:\d{2}: ")
+        # last line read, and its number; formatted by `last_line` only when needed.
+        self._last_lineno = 0
+        self._last_text: str | None = None
+
+        # strip optional timestamp; see `timestamp`.
+        self._re_timestamp = re.compile(r"^(\d{2}/\d{2}/\d{4} - \d{2}:\d{2}:\d{2}): ")
+        # time the last line was logged, when TF2 logs timestamps (`con_timestamp 1`).
+        self.timestamp: float | None = None
 
         logger.info(f"Reading `{options.exclude_file}`")
         self.re_exclude = re.compile(
@@ -47,6 +72,11 @@ class Conlog:
         self._inject_cmds: list[_CMD] = []
         self._is_inject_paused = False
         self._is_inject_sorted = False
+        self._is_interrupted = False
+
+        # `select_game`
+        self._game: GameBoundary | None = None
+        self._end_lineno = 0
 
         if options.inject_cmds:
             self._inject_cmd_list(options.inject_cmds)
@@ -72,6 +102,33 @@ class Conlog:
         self._inject_cmds.append(_CMD(lineno - 1, cmd))
         self._is_inject_sorted = False
 
+    def select_game(self, game: GameBoundary, end_lineno: int | None) -> None:
+        """Read only `game`, from its first line, to before line `end_lineno` if given.
+
+        Requires `rewind`.
+        """
+
+        self._game = game
+        self._end_lineno = end_lineno or 0
+
+    def uninject_cmd(self, cmd: str, before: int) -> None:
+        """Remove `cmd` injected before line `before`."""
+
+        if not cmd.startswith(APPTAG):
+            cmd = APPTAG + cmd
+
+        self._inject_cmds = [
+            x for x in self._inject_cmds if x.cmd != cmd or x.lineno >= before - 1
+        ]
+
+    @property
+    def last_line(self) -> str | None:
+        """Return last line read, prefixed with its line number."""
+
+        if self._last_text is None:
+            return None
+        return f"{self._last_lineno}: {self._last_text}"
+
     def open(self) -> None:
         """Wait for existence of and open console logfile."""
 
@@ -85,6 +142,10 @@ class Conlog:
 
         if self.rewind:
             self.is_eof = False
+            if self._game:
+                self._file.seek(self._game.offset)
+                self.lineno = self._game.lineno - 1
+                logger.log("ADMIN", f"game at lineno={self._game.lineno}")
         else:
             while self._file.readline() != "":
                 self.lineno += 1
@@ -96,6 +157,7 @@ class Conlog:
         """Read and return next line from console lofgile.
 
         Return None on end-of-file, else line.strip() (which may evaluate False).
+        When following, return "" on reaching end-of-file, and when interrupted.
         """
 
         assert self._file
@@ -104,7 +166,7 @@ class Conlog:
 
             if _buffer := self._buffer:
                 self._buffer = None
-                self.last_line = f"{self.lineno}: {_buffer}"
+                self._last_lineno, self._last_text = self.lineno, _buffer
                 return _buffer
 
             if not self._is_inject_sorted:
@@ -119,12 +181,16 @@ class Conlog:
 
                 line = self._inject_cmds.pop(0).cmd
                 self._is_inject_paused = True
-                self.last_line = f"{self.lineno + 1}: {line}"
+                self._last_lineno, self._last_text = self.lineno + 1, line
                 logger.log("injected", self.last_line)
                 return line
 
             self._is_inject_paused = False
 
+            if self.lineno + 1 == self._end_lineno:
+                self.is_eof = True
+                return None  # end of selected game.
+
             try:
                 line = self._file.readline()
             except UnicodeDecodeError as err:
@@ -138,25 +204,64 @@ class Conlog:
                 if line.startswith(APPTAG) and " " in line:
                     # sometimes newlines get dropped and lines are combined
                     cmd, self._buffer = line.split(sep=" ", maxsplit=1)
-                    self.last_line = f"{self.lineno}: {cmd}"
+                    self._last_lineno, self._last_text = self.lineno, cmd
                     return cmd
 
                 if match := self._re_timestamp.search(line):
                     line = line[match.end() :]
+                    self.timestamp = _parse_timestamp(match.group(1))
+                else:
+                    self.timestamp = None
 
                 if self.re_exclude.search(line):
-                    logger.log("exclude", f"{self.lineno}: {line}")
+                    if ENABLED["exclude"]:
+                        logger.log("exclude", f"{self.lineno}: {line}")
                     continue
 
-                self.last_line = f"{self.lineno}: {line}"
+                self._last_lineno, self._last_text = self.lineno, line
                 return line
 
-            self.is_eof = True
+            was_eof, self.is_eof = self.is_eof, True
             if not self.follow:
                 return None  # eof
 
+            if not was_eof or self._is_interrupted:
+                # let caller know it caught up, or why it was interrupted.
+                self._is_interrupted = False
+                return ""
+
             time.sleep(1)  # hello
 
+    def interrupt(self) -> None:
+        """Make `readline`, if following at end-of-file, return `""` to its caller."""
+
+        self._is_interrupted = True
+
+    def tell(self) -> ConlogPosition:
+        """Return position of next line to be read."""
+
+        assert self._file
+        return ConlogPosition(
+            self._file.tell(),
+            self.lineno,
+            self._buffer,
+            tuple(self._inject_cmds),
+            self._is_inject_paused,
+        )
+
+    def seek(self, position: ConlogPosition) -> None:
+        """Continue reading from `position`, returned by `tell`."""
+
+        assert self._file
+        self._file.seek(position.offset)
+        self.lineno = position.lineno
+        self._buffer = position.buffer
+        self._inject_cmds = list(position.inject_cmds)
+        self._is_inject_paused = position.is_inject_paused
+        self._is_inject_sorted = False
+        self._is_interrupted = False
+        self.is_eof = False
+
     def trunc(self) -> None:
         """Truncate console logfile."""
 
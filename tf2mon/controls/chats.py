@@ -16,7 +16,8 @@ class ChatsControl(Control):
 
     def append(self, chat: Chat) -> None:
         self._chats.append(chat)
-        tf2mon.ui.show_chat(chat)
+        if not tf2mon.SingleStepControl.is_fast_forward:
+            tf2mon.ui.show_chat(chat)
 
     def clear(self) -> None:
         self._chats = []
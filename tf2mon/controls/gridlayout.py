@@ -13,6 +13,7 @@ from tf2mon.layouts.full import FullLayout
 from tf2mon.layouts.tall import TallLayout
 from tf2mon.layouts.tallchat import TallChatLayout
 from tf2mon.layouts.wide import WideLayout
+from tf2mon.ui import UI
 
 
 class GridLayoutControl(CycleControl):
@@ -32,10 +33,13 @@ class GridLayoutControl(CycleControl):
 
     def start(self) -> None:
         self.cycle.start(self.enum.__dict__[tf2mon.options.layout])
+        assert isinstance(tf2mon.ui, UI)
         tf2mon.ui.grid.handle_term_resized_event()
 
     def handler(self, _match: Match[str] | None) -> None:
         _ = self.cycle.next
+        if not isinstance(tf2mon.ui, UI):
+            return  # headless
         tf2mon.ui.grid.handle_term_resized_event()
         tf2mon.ui.update_display()
 
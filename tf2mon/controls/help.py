@@ -28,6 +28,9 @@ class HelpControl(Control):
             Enter "/pattern[/i]" to set search pattern.
             Enter "/" to clear search pattern.
             Enter "c" to continue.
+            Enter "back 50" to go back 50 lines.
+            Enter "goto 500" to go to line 500.
+            Enter "chats #7 free hats" to search chats of userid 7 for "free hats".
             Enter "quit" or press ^D to quit."
                 """
             )
@@ -9,6 +9,7 @@ from loguru import logger as _logger
 import tf2mon
 from tf2mon.control import Control, CycleControl
 from tf2mon.cycle import Cycle
+from tf2mon.ui import UI
 
 
 class LogLevelControl(CycleControl):
@@ -26,10 +27,13 @@ class LogLevelControl(CycleControl):
     def start(self) -> None:
         """Set logging level based on `--verbose`."""
 
+        assert isinstance(tf2mon.ui, UI)
         tf2mon.ui.logsink.set_verbose(tf2mon.options.verbose)
         self.cycle.start(self.enum.__dict__[tf2mon.ui.logsink.level])
 
     def handler(self, _match: Match[str] | None) -> None:
+        if not isinstance(tf2mon.ui, UI):
+            return  # headless
         tf2mon.ui.logsink.set_level(self.items[self.cycle.next])
         tf2mon.ui.show_status()
 
@@ -51,9 +55,12 @@ class LogLocationControl(CycleControl):
 
     def start(self) -> None:
         self.cycle.start(self.enum.__dict__[tf2mon.options.log_location])
+        assert isinstance(tf2mon.ui, UI)
         tf2mon.ui.logsink.set_location(self.items[self.cycle.value])
 
     def handler(self, _match: Match[str] | None) -> None:
+        if not isinstance(tf2mon.ui, UI):
+            return  # headless
         tf2mon.ui.logsink.set_location(self.items[self.cycle.cycle])
         tf2mon.ui.show_status()
 
@@ -74,5 +81,7 @@ class ResetPaddingControl(Control):
     name = "RESET-PADDING"
 
     def handler(self, _match: Match[str] | None) -> None:
+        if not isinstance(tf2mon.ui, UI):
+            return  # headless
         tf2mon.ui.logsink.reset_padding()
         _logger.info("padding reset")
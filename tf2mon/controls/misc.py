@@ -5,6 +5,7 @@ from typing import Match
 import tf2mon
 from tf2mon.control import BoolControl, Control
 from tf2mon.cycle import Cycle
+from tf2mon.ui import UI
 
 
 class DebugFlagControl(BoolControl):
@@ -20,6 +21,8 @@ class ShowDebugControl(Control):
     name = "SHOW-DEBUG"
 
     def handler(self, _match: Match[str] | None) -> None:
+        if not isinstance(tf2mon.ui, UI):
+            return  # headless
         tf2mon.ui.show_journal("help", " Grid ".center(80, "-"))
         tf2mon.ui.show_journal("help", str(tf2mon.ui.grid))
         for box in tf2mon.ui.grid.boxes:
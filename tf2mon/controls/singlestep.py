@@ -2,13 +2,18 @@
 
 import re
 import threading
+import time
 from typing import Callable, Match, Pattern
 
 from loguru import logger
 
 import tf2mon
+from tf2mon._logger import ENABLED
 from tf2mon.control import Control
 
+# Seconds between displays of fast-forward progress.
+PROGRESS_INTERVAL = 0.5
+
 
 class SingleStepControl(Control):
     """Single-step control."""
@@ -20,6 +25,12 @@ class SingleStepControl(Control):
     wait: Callable[[float | None], bool] | None = None
     _event: threading.Event | None = None
 
+    # until single-stepping starts, play without rendering.
+    is_fast_forward: bool = False
+    _ff_time: float = 0.0
+    _ff_lineno: int = 0
+    _ff_shown: float = 0.0
+
     def start(self) -> None:
         self._event = threading.Event()
         self.clear = self._event.clear
@@ -38,8 +49,13 @@ class SingleStepControl(Control):
             self.start_single_stepping()
         else:
             self.stop_single_stepping()
+            if tf2mon.options.rewind and (
+                tf2mon.options.breakpoint is not None or tf2mon.options.search
+            ):
+                self.start_fast_forward()
 
     def start_single_stepping(self) -> None:
+        self.stop_fast_forward()
         self.is_stepping = True
         assert self._event
         self._event.clear()
@@ -78,6 +94,47 @@ class SingleStepControl(Control):
             self.pattern = re.compile(pattern, flags)
             logger.log("ADMIN", f"set search={self.pattern}")
 
+    def start_fast_forward(self) -> None:
+        """Play without rendering, writing cfg files or `PER_LINE_LEVELS` logging.
+
+        Until single-stepping starts (at a breakpoint, injected `SINGLE-STEP`
+        or search hit), or the end of the logfile.
+        """
+
+        assert tf2mon.conlog
+        self.is_fast_forward = True
+        self._ff_time = self._ff_shown = time.monotonic()
+        self._ff_lineno = tf2mon.conlog.lineno
+        ENABLED.suspend()
+        logger.log("ADMIN", "fast-forward")
+
+    def stop_fast_forward(self) -> None:
+        """Stop fast-forwarding, and redraw everything."""
+
+        if not self.is_fast_forward:
+            return
+        self.is_fast_forward = False
+        ENABLED.suspend(False)
+        logger.log("ADMIN", f"fast-forwarded {self.fast_forward_status()}")
+        tf2mon.MsgQueuesControl.send()
+        tf2mon.ChatsControl.refresh()
+        tf2mon.ui.update_display()
+
+    def fast_forward_status(self) -> str:
+        """Return fast-forward progress; lineno and lines/sec."""
+
+        assert tf2mon.conlog
+        nlines = tf2mon.conlog.lineno - self._ff_lineno
+        elapsed = time.monotonic() - self._ff_time
+        return f"to line {tf2mon.conlog.lineno} at {nlines / max(elapsed, 1e-6):,.0f} lines/sec"
+
+    def show_progress(self) -> None:
+        """Display fast-forward progress, at most every `PROGRESS_INTERVAL` seconds."""
+
+        if (now := time.monotonic()) - self._ff_shown >= PROGRESS_INTERVAL:
+            self._ff_shown = now
+            tf2mon.ui.show_progress()
+
 
 class SingleStepStartControl(Control):
     """Start single-stepping."""
@@ -7,6 +7,8 @@ from typing import Match
 import tf2mon
 from tf2mon.control import CycleControl
 from tf2mon.cycle import Cycle
+from tf2mon.steamid import accountid
+from tf2mon.ui import UI
 
 
 class SortOrderControl(CycleControl):
@@ -17,7 +19,10 @@ class SortOrderControl(CycleControl):
     cycle = Cycle("_t_soc", enum)
     items = {
         enum.AGE: lambda user: (user.age, user.username_upper),
-        enum.STEAMID: lambda user: (user.steamid.id if user.steamid else 0, user.username_upper),
+        enum.STEAMID: lambda user: (
+            accountid(user.steamid) if user.steamid else 0,
+            user.username_upper,
+        ),
         enum.K: lambda user: (-user.nkills, user.username_upper),
         enum.KD: lambda user: (-user.kdratio, -user.nkills, user.username_upper),
         enum.CONN: lambda user: (user.elapsed, user.username_upper),
@@ -26,11 +31,14 @@ class SortOrderControl(CycleControl):
 
     def start(self) -> None:
         self.cycle.start(self.enum.__dict__[tf2mon.options.sort_order])
+        assert isinstance(tf2mon.ui, UI)
         tf2mon.ui.scoreboard.set_sort_order(self.cycle.value.name)
         assert self.cycle.value.name == tf2mon.options.sort_order
 
     def handler(self, _match: Match[str] | None) -> None:
         _ = self.cycle.next
+        if not isinstance(tf2mon.ui, UI):
+            return  # headless
         tf2mon.ui.scoreboard.set_sort_order(self.cycle.value.name)
         tf2mon.ui.update_display()
 
@@ -0,0 +1,170 @@
+"""Duel scores of one game."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterator
+
+from tf2mon.role import WeaponState
+from tf2mon.user import UserHandle
+
+
+class DuelMatrix:
+    """Number of times each user killed each other user, in one game.
+
+    Kills among users in the game are held in one dense square matrix,
+    indexed by slot; each user is given a slot at their first kill or
+    death, and the matrix grows as needed. When a user is archived, their
+    kills are moved to a sparse table and their slot is reused; so the
+    matrix is sized by the users in the game, not all who have been.
+    Counts by weapon are held in a sparse side table, as most pairs of
+    users never meet. Everything else (k/d ratio against an opponent,
+    list of opponents) is derived on demand.
+    """
+
+    def __init__(self, capacity: int = 32) -> None:
+        """Create empty matrix with room for `capacity` users."""
+
+        self._capacity = capacity
+        self._kills = array("I", bytes(4 * capacity * capacity))
+        self._slots: dict[UserHandle, int] = {}
+        self._handles: list[UserHandle | None] = []  # by slot; None if free.
+        self._free: list[int] = []
+        # kills of, or by, archived users.
+        self._archived: dict[tuple[UserHandle, UserHandle], int] = {}
+        self._archived_opponents: dict[UserHandle, set[UserHandle]] = {}
+        self._weapons: dict[tuple[UserHandle, UserHandle], dict[WeaponState, int]] = {}
+
+    def _slot(self, user: UserHandle) -> int:
+        """Return slot of `user`, giving them one if they have none."""
+
+        if (slot := self._slots.get(user)) is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                slot = len(self._handles)
+                self._handles.append(None)
+                if slot >= self._capacity:
+                    self._grow(slot)
+            self._slots[user] = slot
+            self._handles[slot] = user
+        return slot
+
+    def _grow(self, slot: int) -> None:
+        """Make room for `slot`."""
+
+        capacity = self._capacity
+        while capacity <= slot:
+            capacity *= 2
+
+        kills = array("I", bytes(4 * capacity * capacity))
+        old = self._capacity
+        for row in range(old):
+            kills[row * capacity : row * capacity + old] = self._kills[
+                row * old : row * old + old
+            ]
+
+        self._capacity = capacity
+        self._kills = kills
+
+    def add_kill(
+        self, killer: UserHandle, victim: UserHandle, weapon_state: WeaponState | None
+    ) -> None:
+        """Count `killer` killing `victim` with `weapon_state`."""
+
+        killer_slot, victim_slot = self._slot(killer), self._slot(victim)  # may grow.
+        self._kills[killer_slot * self._capacity + victim_slot] += 1
+
+        if weapon_state is not None:
+            by_weapon = self._weapons.setdefault((killer, victim), {})
+            by_weapon[weapon_state] = by_weapon.get(weapon_state, 0) + 1
+
+    def nkills(self, killer: UserHandle, victim: UserHandle) -> int:
+        """Return number of times `killer` killed `victim`."""
+
+        nkills = self._archived.get((killer, victim), 0)
+        if (killer_slot := self._slots.get(killer)) is not None and (
+            victim_slot := self._slots.get(victim)
+        ) is not None:
+            nkills += self._kills[killer_slot * self._capacity + victim_slot]
+        return nkills
+
+    def duel(self, user: UserHandle, opponent: UserHandle) -> tuple[int, int]:
+        """Return number of kills and deaths of `user` against `opponent`."""
+
+        return self.nkills(user, opponent), self.nkills(opponent, user)
+
+    def kdratio(self, user: UserHandle, opponent: UserHandle) -> float:
+        """Return kill/death ratio of `user` against `opponent`."""
+
+        _k, _d = self.duel(user, opponent)
+        return float(_k) if not _d else _k / _d
+
+    def opponents(self, user: UserHandle) -> Iterator[UserHandle]:
+        """Yield handles of users that `user` killed or was killed by, in handle order."""
+
+        opponents = set(self._archived_opponents.get(user, ()))
+
+        if (slot := self._slots.get(user)) is not None:
+            kills = self._kills
+            capacity = self._capacity
+            row = slot * capacity
+            for other, opponent in enumerate(self._handles):
+                if opponent is not None and (
+                    kills[row + other] or kills[other * capacity + slot]
+                ):
+                    opponents.add(opponent)
+
+        yield from sorted(opponents)
+
+    def archive(self, user: UserHandle) -> None:
+        """Move the kills of archived `user` to the sparse table, and free their slot."""
+
+        if (slot := self._slots.pop(user, None)) is None:
+            return
+
+        kills = self._kills
+        capacity = self._capacity
+        for other, opponent in enumerate(self._handles):
+            if opponent is None:
+                continue
+            for pair, i in (
+                ((user, opponent), slot * capacity + other),
+                ((opponent, user), other * capacity + slot),
+            ):
+                if count := kills[i]:
+                    kills[i] = 0
+                    self._archived[pair] = self._archived.get(pair, 0) + count
+                    self._archived_opponents.setdefault(user, set()).add(opponent)
+                    self._archived_opponents.setdefault(opponent, set()).add(user)
+
+        self._handles[slot] = None
+        self._free.append(slot)
+
+    def pop_weapons(self, user: UserHandle) -> array[int]:
+        """Remove and return counts by weapon state of all duels of `user`.
+
+        Returned as a flat array of (killer, victim, weapon_state, count)
+        quads, for `push_weapons`; kill counts remain, see `archive`.
+        """
+
+        packed = array("I")
+        for opponent in list(self.opponents(user)):
+            for killer, victim in ((user, opponent), (opponent, user)):
+                for weapon_state, count in self._weapons.pop((killer, victim), {}).items():
+                    packed.extend((killer, victim, weapon_state, count))
+        return packed
+
+    def push_weapons(self, packed: array[int]) -> None:
+        """Add counts by weapon state returned by `pop_weapons`."""
+
+        for i in range(0, len(packed), 4):
+            killer, victim, weapon_state, count = packed[i : i + 4]
+            by_weapon = self._weapons.setdefault((UserHandle(killer), UserHandle(victim)), {})
+            state = WeaponState(weapon_state)
+            by_weapon[state] = by_weapon.get(state, 0) + count
+
+    def weapons(self, killer: UserHandle, victim: UserHandle) -> dict[WeaponState, int]:
+        """Return number of times `killer` killed `victim`, by weapon state."""
+
+        return self._weapons.get((killer, victim), {})
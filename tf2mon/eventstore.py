@@ -0,0 +1,512 @@
+"""Append-only columnar store of the kills, chats, captures and status samples of every game.
+
+    DIR/strings.txt             names, weapons and capture points; id is line number + 1
+    DIR/YYYY-MM-DD/TABLE.COLUMN one file per column, partitioned by (local) day
+
+Each numeric column file is a packed `array` of its typecode, appended
+to by `array.tofile`; each text column file (chat messages) is one line
+per row. The rows of a partition are those complete in all of its table's
+columns, so a flush torn by a crash loses only its own rows.
+
+Queries read whole columns and aggregate them at C speed, with `bytes`
+masks (`translate`), `itertools.compress`, `array.index` and
+`collections.Counter`; only the rows selected are touched in Python.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import time
+from array import array
+from collections import Counter
+from itertools import compress
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple
+
+from loguru import logger
+
+from tf2mon.steamid import accountid
+from tf2mon.texttable import TextColumn, TextTable
+
+if TYPE_CHECKING:
+    from tf2mon.chat import Chat
+    from tf2mon.conlog import Conlog
+    from tf2mon.user import User
+
+STRINGS = "strings.txt"
+
+# Rows buffered before they are appended to the store.
+FLUSH_ROWS = 10_000
+
+# Column typecodes, by table; "s" is a text column.
+SCHEMA: dict[str, tuple[tuple[str, str], ...]] = {
+    "kills": (
+        ("time", "d"),
+        ("killer", "I"),  # accountid; 0 if not (yet) known.
+        ("victim", "I"),
+        ("killer_name", "I"),  # string id.
+        ("victim_name", "I"),
+        ("weapon", "I"),  # string id of `weapon_state_name`; e.g. "scout +crit scattergun".
+        ("flags", "B"),
+    ),
+    "chats": (
+        ("time", "d"),
+        ("steamid", "I"),
+        ("name", "I"),
+        ("flags", "B"),
+        ("msg", "s"),
+    ),
+    "captures": (
+        ("time", "d"),
+        ("steamid", "I"),
+        ("name", "I"),
+        ("point", "I"),
+        ("team", "B"),  # `Team` value; 0 if not known.
+        ("flags", "B"),
+    ),
+    "status": (
+        ("time", "d"),
+        ("steamid", "I"),
+        ("name", "I"),
+        ("userid", "I"),
+        ("elapsed", "I"),
+        ("ping", "I"),
+    ),
+}
+
+# `flags` bits.
+KILL_CRIT = 1
+KILL_BY_ME = 2
+KILL_OF_ME = 4
+CHAT_TEAM = 1
+CHAT_DEAD = 2
+CHAT_BY_ME = 4
+CAPTURE_DEFENDED = 1
+
+
+def _bit(bit: int) -> bytes:
+    """Return `bytes.translate` table that maps `flags` to 1 where `bit` is set, else 0."""
+
+    return bytes(int(bool(x & bit)) for x in range(256))
+
+
+def _lines(path: Path) -> list[str]:
+    """Return the complete lines of text file `path`; split on newlines only.
+
+    Not by `splitlines`, which also splits on the form feeds, line and
+    paragraph separators... that player names and chat messages may
+    contain; nor with universal newlines. A last line without a newline
+    (torn by a crash) is dropped.
+    """
+
+    return path.read_bytes().decode("utf-8").split("\n")[:-1]
+
+
+_BY_ME = _bit(KILL_BY_ME)
+_OF_ME = _bit(KILL_OF_ME)
+
+
+def _rows(column: array[int], value: int) -> list[int]:
+    """Return indexes of rows of `column` equal to `value`.
+
+    Scans by `array.index`, at C speed; costs Python only per match.
+    """
+
+    rows: list[int] = []
+    index = -1
+    with contextlib.suppress(ValueError):
+        while True:
+            index = column.index(value, index + 1)
+            rows.append(index)
+    return rows
+
+
+class EventStoreWriter:
+    """Append the events of every game to an `EventStore`.
+
+    Rows are buffered, and appended to the partition of their day when
+    `flush_rows` are buffered, when their day changes, and at the end of
+    each game (`rotate`). Rows are timed by `conlog.timestamp`, if TF2
+    logs timestamps, else by the clock.
+
+    Events from lines already written (replayed after seeking backward)
+    are not written again; a game replayed again by another run is.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, directory: Path, conlog: Conlog, flush_rows: int = FLUSH_ROWS) -> None:
+        """Prepare to append to store `directory`; created on first flush."""
+
+        self.directory = directory.expanduser()
+        self.conlog = conlog
+        self.flush_rows = flush_rows
+
+        self._strings: dict[str, int] = {"": 0}
+        path = self.directory / STRINGS
+        if path.exists():
+            lines = _lines(path)
+            for text in lines:
+                self._strings.setdefault(text, len(self._strings))
+            # drop a torn last string, rather than append to it; no row refers to it.
+            with open(path, "r+b") as file:
+                file.truncate(sum(len(x.encode("utf-8")) + 1 for x in lines))
+        self._new_strings: list[str] = []
+
+        self._columns: dict[str, list[array[float] | array[int] | list[str]]] = {
+            table: [[] if code == "s" else array(code) for _, code in columns]
+            for table, columns in SCHEMA.items()
+        }
+        self._nrows = 0
+        self._day = ""
+        self._day_start = self._day_end = 0.0
+
+        self._lineno = 0  # of last write.
+        self._done = 0  # lines before this were written.
+        self._closed = False
+
+    def _string_id(self, text: str) -> int:
+        """Return id of `text`, defining it if new."""
+
+        if (string_id := self._strings.get(text)) is None:
+            string_id = self._strings[text] = len(self._strings)
+            self._new_strings.append(text)
+        return string_id
+
+    def _time(self) -> float | None:
+        """Return time of the row about to be appended, else None to skip it."""
+
+        if self._closed:
+            return None
+
+        lineno = self.conlog.lineno
+        if lineno != self._lineno:
+            self._done = max(self._done, self._lineno)
+            self._lineno = lineno
+        if lineno <= self._done:
+            return None
+
+        now = self.conlog.timestamp or time.time()
+        if not self._day_start <= now < self._day_end:
+            self.flush()
+            tm = time.localtime(now)
+            self._day = time.strftime("%Y-%m-%d", tm)
+            self._day_start = time.mktime((tm.tm_year, tm.tm_mon, tm.tm_mday, 0, 0, 0, 0, 0, -1))
+            self._day_end = time.mktime(
+                (tm.tm_year, tm.tm_mon, tm.tm_mday + 1, 0, 0, 0, 0, 0, -1)
+            )
+        return now
+
+    def _append(self, table: str, *values: float | int | str) -> None:
+        """Append row of `values` to `table`."""
+
+        for column, value in zip(self._columns[table], values):
+            column.append(value)  # type: ignore[arg-type]
+        self._nrows += 1
+        if self._nrows >= self.flush_rows:
+            self.flush()
+
+    def kill(self, killer: User, victim: User, weapon: str, crit: bool, me: User) -> None:
+        """Append kill of `victim` by `killer`."""
+
+        if (now := self._time()) is None:
+            return
+        flags = (
+            (KILL_CRIT if crit else 0)
+            | (KILL_BY_ME if killer is me else 0)
+            | (KILL_OF_ME if victim is me else 0)
+        )
+        self._append(
+            "kills",
+            now,
+            accountid(killer.steamid) if killer.steamid else 0,
+            accountid(victim.steamid) if victim.steamid else 0,
+            self._string_id(killer.username),
+            self._string_id(victim.username),
+            self._string_id(" ".join(weapon.split())),  # without column padding.
+            flags,
+        )
+
+    def chat(self, chat: Chat, dead: bool, me: User) -> None:
+        """Append `chat`."""
+
+        if (now := self._time()) is None:
+            return
+        user = chat.user
+        flags = (
+            (CHAT_TEAM if chat.teamflag else 0)
+            | (CHAT_DEAD if dead else 0)
+            | (CHAT_BY_ME if user is me else 0)
+        )
+        self._append(
+            "chats",
+            now,
+            accountid(user.steamid) if user.steamid else 0,
+            self._string_id(user.username),
+            flags,
+            chat.msg,
+        )
+
+    def capture(self, user: User, point: str, defended: bool) -> None:
+        """Append capture, or defense, of `point` by `user`."""
+
+        if (now := self._time()) is None:
+            return
+        self._append(
+            "captures",
+            now,
+            accountid(user.steamid) if user.steamid else 0,
+            self._string_id(user.username),
+            self._string_id(point),
+            user.team.value if user.team else 0,
+            CAPTURE_DEFENDED if defended else 0,
+        )
+
+    def status(self, user: User) -> None:
+        """Append sample of `user`'s `status` row."""
+
+        if (now := self._time()) is None:
+            return
+        self._append(
+            "status",
+            now,
+            accountid(user.steamid) if user.steamid else 0,
+            self._string_id(user.username),
+            user.userid,
+            user.elapsed,
+            user.ping,
+        )
+
+    def flush(self) -> None:
+        """Append buffered rows to the store."""
+
+        if not self._nrows:
+            return
+
+        if self._new_strings:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / STRINGS, "a", encoding="utf-8", newline="") as file:
+                file.write("".join(x + "\n" for x in self._new_strings))
+            self._new_strings.clear()
+
+        partition = self.directory / self._day
+        partition.mkdir(parents=True, exist_ok=True)
+        for table, columns in self._columns.items():
+            if not columns[0]:
+                continue
+            for (name, _), column in zip(SCHEMA[table], columns):
+                path = partition / f"{table}.{name}"
+                if isinstance(column, list):
+                    with open(path, "a", encoding="utf-8", newline="") as text:
+                        text.write("".join(x + "\n" for x in column))
+                else:
+                    with open(path, "ab") as data:
+                        column.tofile(data)
+                del column[:]
+
+        logger.debug(f"Appended {self._nrows} rows to `{partition}`")
+        self._nrows = 0
+
+    def rotate(self) -> None:
+        """End of game; flush."""
+
+        self.flush()
+
+    def close(self) -> None:
+        """Flush, and write nothing more."""
+
+        self.flush()
+        self._closed = True
+
+
+class Opponent(NamedTuple):
+    """Duels of an opponent against `player_name`."""
+
+    steamid: int  # 0 if never known.
+    name: str  # most used.
+    nkills: int  # of me.
+    ndeaths: int  # by me.
+    kdratio: float
+
+
+class WeaponCount(NamedTuple):
+    """Number of kills with a weapon state."""
+
+    weapon: str
+    nkills: int
+    percent: float
+
+
+class HourCount(NamedTuple):
+    """Number of kills and deaths in an hour."""
+
+    hour: str  # "YYYY-MM-DD HH:00", local.
+    nkills: int
+    ndeaths: int
+
+
+class EventStore:
+    """Read and query the columns of an event store."""
+
+    opponents_table = TextTable(
+        [
+            TextColumn(-10, "STEAMID"),
+            TextColumn(-6, "K"),
+            TextColumn(-6, "D"),
+            TextColumn(6.2, "KD"),
+            TextColumn(0, "NAME"),
+        ]
+    )
+    weapon_states_table = TextTable(
+        [
+            TextColumn(-8, "K"),
+            TextColumn(6.1, "PCT"),
+            TextColumn(0, "WEAPON"),
+        ]
+    )
+    kill_rate_table = TextTable(
+        [
+            TextColumn(16, "HOUR"),
+            TextColumn(-6, "K"),
+            TextColumn(-6, "D"),
+        ]
+    )
+
+    def __init__(self, directory: Path, since: str | None = None) -> None:
+        """Open store `directory`; only days on or after `since` (`YYYY-MM-DD`), if given."""
+
+        self.directory = directory.expanduser()
+        if not self.directory.is_dir():
+            raise FileNotFoundError(f"No event store `{self.directory}`")
+        self.since = since
+
+    @property
+    def days(self) -> list[Path]:
+        """Return the partitions queried, in order."""
+
+        return sorted(
+            x
+            for x in self.directory.iterdir()
+            if x.is_dir() and (not self.since or x.name >= self.since)
+        )
+
+    @functools.cached_property
+    def strings(self) -> list[str]:
+        """Return strings, by id."""
+
+        path = self.directory / STRINGS
+        return ["", *(_lines(path) if path.exists() else [])]
+
+    def columns(self, table: str, names: Iterable[str]) -> dict[str, array[Any]]:
+        """Return numeric columns `names` of `table`, over all days queried."""
+
+        typecodes = dict(SCHEMA[table])
+        result: dict[str, array[Any]] = {x: array(typecodes[x]) for x in names}
+
+        for day in self.days:
+            nrows = self._nrows(day, table)
+            for name, column in result.items():
+                if not nrows:
+                    break
+                data = (day / f"{table}.{name}").read_bytes()
+                column.frombytes(data[: nrows * column.itemsize])
+        return result
+
+    def texts(self, table: str, name: str) -> list[str]:
+        """Return text column `name` of `table`, over all days queried."""
+
+        result: list[str] = []
+        for day in self.days:
+            if nrows := self._nrows(day, table):
+                result.extend(_lines(day / f"{table}.{name}")[:nrows])
+        return result
+
+    @staticmethod
+    def _nrows(day: Path, table: str) -> int:
+        """Return number of rows of `table` complete in all of its columns in partition `day`."""
+
+        nrows = None
+        for name, code in SCHEMA[table]:
+            path = day / f"{table}.{name}"
+            if not path.exists():
+                return 0
+            if code == "s":
+                with open(path, "rb") as file:
+                    count = sum(x.count(b"\n") for x in iter(lambda: file.read(1 << 20), b""))
+            else:
+                count = path.stat().st_size // array(code).itemsize
+            nrows = count if nrows is None else min(nrows, count)
+        return nrows or 0
+
+    def top_opponents(self, count: int) -> list[Opponent]:
+        """Return `count` opponents with the best k/d against `player_name`.
+
+        Opponents are counted by steamid; by name until their steamid was known.
+        """
+
+        kills = self.columns(
+            "kills", ("killer", "victim", "killer_name", "victim_name", "flags")
+        )
+        flags = kills["flags"].tobytes()
+        by_me = flags.translate(_BY_ME)
+        of_me = flags.translate(_OF_ME)
+        by_me_counts = Counter(
+            zip(compress(kills["victim"], by_me), compress(kills["victim_name"], by_me))
+        )
+        of_me_counts = Counter(
+            zip(compress(kills["killer"], of_me), compress(kills["killer_name"], of_me))
+        )
+
+        # {steamid or -name: [nkills, ndeaths, Counter(names)]}
+        totals: dict[int, tuple[list[int], Counter[int]]] = {}
+        for index, counts in ((0, of_me_counts), (1, by_me_counts)):
+            for (steamid, name), n in counts.items():
+                key = steamid or -name
+                if not (total := totals.get(key)):
+                    total = totals[key] = ([0, 0], Counter())
+                total[0][index] += n
+                total[1][name] += n
+
+        opponents = []
+        for key, ((nkills, ndeaths), names) in totals.items():
+            kdratio = float(nkills) if not ndeaths else nkills / ndeaths
+            name = self.strings[names.most_common(1)[0][0]]
+            opponents.append(Opponent(max(key, 0), name, nkills, ndeaths, kdratio))
+
+        opponents.sort(key=lambda x: (-x.kdratio, -x.nkills - x.ndeaths, x.name))
+        return opponents[:count]
+
+    def weapon_states(self, steamid: int | None = None) -> list[WeaponCount]:
+        """Return number of kills by weapon state; of all kills, or by `steamid` (accountid)."""
+
+        kills = self.columns("kills", ("killer", "weapon"))
+        weapons = kills["weapon"]
+        if steamid:
+            counts = Counter(map(weapons.__getitem__, _rows(kills["killer"], steamid)))
+        else:
+            counts = Counter(weapons)
+
+        total = sum(counts.values())
+        return [
+            WeaponCount(self.strings[weapon], n, 100 * n / total)
+            for weapon, n in counts.most_common()
+        ]
+
+    def kill_rate(self, steamid: int) -> list[HourCount]:
+        """Return number of kills and deaths of `steamid` (accountid) in each hour they had any."""
+
+        kills = self.columns("kills", ("time", "killer", "victim"))
+        times = kills["time"]
+        counts = []
+        for column in (kills["killer"], kills["victim"]):
+            counts.append(Counter(int(times[x] // 3600) for x in _rows(column, steamid)))
+
+        return [
+            HourCount(
+                time.strftime("%Y-%m-%d %H:00", time.localtime(hour * 3600)),
+                counts[0][hour],
+                counts[1][hour],
+            )
+            for hour in sorted(counts[0].keys() | counts[1].keys())
+        ]
@@ -35,6 +35,8 @@ class GameCaptureEvent(GameEvent):
                 level = "DEF"
 
             user.dirty = True
+            if tf2mon.event_store:
+                tf2mon.event_store.capture(user, capture_pt, action != "captured")
 
             assert user.team
             level += user.team.name
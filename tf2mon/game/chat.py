@@ -22,30 +22,27 @@ class GameChatEvent(GameEvent):
 
     def handler(self, match: Match[str]) -> None:
 
-        _dead, teamflag, username, msg = match.groups()
+        dead, teamflag, username, msg = match.groups()
 
         user = tf2mon.users[UserKey(username)]
         chat = Chat(user, bool(teamflag), msg)
 
         user.chats.append(chat)
         tf2mon.ChatsControl.append(chat)
+        if tf2mon.event_store:
+            tf2mon.event_store.chat(chat, bool(dead), tf2mon.users.me)
+        if tf2mon.chat_history:
+            tf2mon.chat_history.append(chat)
 
         level = "TEAMCHAT" if chat.teamflag else "CHAT"
         if user.team:
             level += user.team.name
         logger.log(level, f"{user} {msg}")
 
-        # if this is a team chat, then we know we're on the same team, and
-        # if one of us knows which team we're on and the other doesn't, we
-        # can assign.
+        # if this is a team chat, then we know we're on the same team.
 
         if chat.teamflag and user != tf2mon.users.me:
-            # we're on the same team
-            if not user.team:
-                if tf2mon.users.my.team:
-                    user.team = tf2mon.users.my.team
-            elif not tf2mon.users.my.team:
-                tf2mon.users.my.team = user.team
+            tf2mon.users.same_team(user, tf2mon.users.my)
 
         # inspect msg
         if is_racist_text(chat.msg):
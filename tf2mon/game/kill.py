@@ -1,12 +1,14 @@
+import time
 from typing import Match
 
 from loguru import logger
 
 import tf2mon
+from tf2mon._logger import ENABLED
 from tf2mon.gameevent import GameEvent
-from tf2mon.role import Role, get_role_weapon_state
+from tf2mon.role import Role, get_role_weapon_state, weapon_state_name
 from tf2mon.spammer import Spammer
-from tf2mon.user import Kill, UserKey, WeaponState
+from tf2mon.user import UserKey
 
 
 class GameKillEvent(GameEvent):
@@ -27,15 +29,6 @@ class GameKillEvent(GameEvent):
         killer.last_victim = victim
         victim.last_killer = killer
 
-        # do most calculations now (once);
-        # to avoid calculating when rendering scoreboard (often).
-
-        killer.opponents[victim.key] = victim
-        victim.opponents[killer.key] = killer
-
-        killer.victims[victim.key] = victim
-        victim.killers[killer.key] = killer
-
         # totals ---------------------------------------------------------------
 
         killer.nkills += 1
@@ -51,65 +44,46 @@ class GameKillEvent(GameEvent):
         _d = victim.ndeaths
         victim.kdratio = float(_k) if not _d else _k / _d
 
-        # subtotals by opponent-------------------------------------------------
+        # weapon_state ---------------------------------------------------------
 
-        if victim.key not in killer.nkills_by_opponent:
-            killer.nkills_by_opponent[victim.key] = 0
-        killer.nkills_by_opponent[victim.key] += 1
-
-        if killer.key not in victim.ndeaths_by_opponent:
-            victim.ndeaths_by_opponent[killer.key] = 0
-        victim.ndeaths_by_opponent[killer.key] += 1
-
-        _k = killer.nkills_by_opponent.get(victim.key, 0)
-        _d = killer.ndeaths_by_opponent.get(victim.key, 0)
-        killer.kdratio_by_opponent[victim.key] = float(_k) if not _d else _k / _d
+        crit = bool(s_crit)
+        killer.role, weapon_state = get_role_weapon_state(killer.role, weapon, crit, killer.perk)
+        killer.weapon_state = weapon_state
+        if killer.role == Role.sniper:
+            killer.nsnipes += 1
+
+        tf2mon.users.kills.append(
+            time.time(),
+            killer.handle,
+            victim.handle,
+            weapon_state,
+            crit,
+            (killer.nkills, killer.ndeaths),
+            (victim.nkills, victim.ndeaths),
+        )
 
-        _k = victim.nkills_by_opponent.get(killer.key, 0)
-        _d = victim.ndeaths_by_opponent.get(killer.key, 0)
-        victim.kdratio_by_opponent[killer.key] = float(_k) if not _d else _k / _d
+        if tf2mon.event_store:
+            tf2mon.event_store.kill(
+                killer, victim, weapon_state_name(weapon_state), crit, tf2mon.users.me
+            )
 
-        # subtotal opponents by weapon_state -----------------------------------
+        # subtotals by opponent, and by weapon_state ---------------------------
 
-        crit = bool(s_crit)
-        role, weapon_state = get_role_weapon_state(killer.role, weapon, crit, killer.perk)
-        if role:
-            killer.role = role
-            killer.weapon_state = WeaponState(weapon_state)
-            if killer.role == Role.sniper:
-                killer.nsnipes += 1
-        else:
-            role = killer.role
-            if weapon not in ("player", "world"):
-                logger.error(f"cannot map {weapon} for {killer} {role}")
-
-        kill = Kill(killer.snap_stats(), victim.snap_stats())
-        killer.kills.append(kill)
-        victim.deaths.append(kill)
-
-        if not role and weapon not in ("player", "world"):
-            logger.error(f"cannot map {weapon} for {killer} {role}")
-
-        if victim.key not in killer.nkills_by_opponent_by_weapon:
-            # contains a hash of counts by weapon_state
-            killer.nkills_by_opponent_by_weapon[victim.key] = {}
-        assert killer.weapon_state
-        if weapon_state not in killer.nkills_by_opponent_by_weapon[victim.key]:
-            killer.nkills_by_opponent_by_weapon[victim.key][killer.weapon_state] = 0
-        killer.nkills_by_opponent_by_weapon[victim.key][killer.weapon_state] += 1
+        tf2mon.users.duels.add_kill(killer.handle, victim.handle, weapon_state)
 
         #
         level = "KILL"
         if killer.team:
             level += killer.team.name
 
-        logger.log(
-            level,
-            "killer {!r} victim {!r} weapon {!r}",
-            killer.moniker,
-            victim.moniker,
-            weapon_state,
-        )
+        if ENABLED[level]:
+            logger.log(
+                level,
+                "killer {!r} victim {!r} weapon {!r}",
+                killer.moniker,
+                victim.moniker,
+                weapon_state_name(weapon_state),
+            )
 
         if killer == tf2mon.users.me:
             if tf2mon.TauntFlagControl.value:
@@ -117,7 +91,4 @@ class GameKillEvent(GameEvent):
         elif victim == tf2mon.users.me and tf2mon.ThroeFlagControl.value:
             self.spammer.throe(killer, weapon, s_crit)
 
-        if not victim.team and killer.team:
-            victim.team = killer.opposing_team
-        elif not killer.team and victim.team:
-            killer.team = victim.opposing_team
+        tf2mon.users.opposite_teams(killer, victim)
@@ -3,8 +3,9 @@ from typing import Match
 from loguru import logger
 
 import tf2mon
+from tf2mon._logger import ENABLED
 from tf2mon.gameevent import GameEvent
-from tf2mon.steamid import parse_steamid
+from tf2mon.steamid import accountid, parse_steamid
 from tf2mon.user import Team
 
 
@@ -37,9 +38,9 @@ class GameLobbyEvent(GameEvent):
             # if we've seen this steamid before...
             if old_team != team:
                 # ...and
-                logger.warning(f"{steamid.id} change team `{old_team}` to `{team}`")
-        else:
-            logger.log("ADDLOBBY", f"{team} {steamid.id}")
+                logger.warning(f"{accountid(steamid)} change team `{old_team}` to `{team}`")
+        elif ENABLED["ADDLOBBY"]:
+            logger.log("ADDLOBBY", f"{team} {accountid(steamid)}")
 
         #
         tf2mon.users.teams_by_steamid[steamid] = team
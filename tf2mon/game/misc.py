@@ -48,7 +48,7 @@ class GameTeamsSwitchedEvent(GameEvent):
     pattern = "^Teams have been switched"
 
     def handler(self, _match: Match[str] | None) -> None:
-        pass  # tf2mon.users.switch_teams()
+        tf2mon.users.switch_teams()
 
 
 class GameUserSwitchedEvent(GameEvent):
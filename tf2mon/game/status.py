@@ -3,9 +3,10 @@ from typing import Match
 from loguru import logger
 
 import tf2mon
+from tf2mon._logger import ENABLED
 from tf2mon.gameevent import GameEvent
-from tf2mon.steamid import BOT_STEAMID, parse_steamid
-from tf2mon.user import UserKey
+from tf2mon.steamid import BOT_STEAMID, accountid, parse_steamid
+from tf2mon.user import User, UserKey
 
 
 class GameStatusEvent(GameEvent):
@@ -21,32 +22,55 @@ class GameStatusEvent(GameEvent):
     def handler(self, match: Match[str]) -> None:
 
         # pylint: disable=too-many-branches
-        # pylint: disable=too-many-locals
 
         s_userid, username, s_steamid, s_elapsed, ping = match.groups()
 
         tf2mon.ui.notify_operator = False
 
+        # Each push repeats every row, usually changed only in the elapsed
+        # and ping columns; then there is nothing to reconcile or log.
+        row = (s_userid, username, s_steamid)
+        if (
+            (user := tf2mon.users.find_username(username))
+            and user.status_row == row
+            and user.is_active
+            and user.steamplayer
+        ):
+            tf2mon.users.mark_seen(user)
+            self._set_elapsed(user, s_elapsed)
+            user.ping = int(ping)
+            if not user.team and (team := tf2mon.users.teams_by_steamid.get(user.steamid or 0)):
+                user.team = team
+            if tf2mon.event_store:
+                tf2mon.event_store.status(user)
+            return
+
         if not (steamid := parse_steamid(s_steamid)):
             return  # invalid
 
         userid = int(s_userid)
         user = None
 
-        if steamid != BOT_STEAMID and (user := tf2mon.users.users_by_steamid.get(steamid)):
+        if steamid != BOT_STEAMID and (user := tf2mon.users.find_steamid(steamid)):
             if user.username and user.username != username:
-                logger.warning(f"{steamid.id} change username `{user.username}` to `{username}`")
+                logger.warning(
+                    f"{accountid(steamid)} change username `{user.username}` to `{username}`"
+                )
                 user.username = username
                 if user.player:
                     user.player.track_appearance(username)
 
             if user.userid and user.userid != userid:
-                logger.warning(f"{steamid.id} change userid `{user.userid}` to `{userid}`")
+                logger.warning(
+                    f"{accountid(steamid)} change userid `{user.userid}` to `{userid}`"
+                )
                 user.userid = userid
 
         if not user:
             user = tf2mon.users[UserKey(username)]
 
+        tf2mon.users.mark_seen(user)
+        user.status_row = row
         user.dirty = True
 
         if not user.userid:
@@ -54,39 +78,48 @@ class GameStatusEvent(GameEvent):
 
         if not user.steamid:
             user.steamid = steamid
-            tf2mon.users.users_by_steamid[steamid] = user
 
         #
+        self._set_elapsed(user, s_elapsed)
+        user.ping = int(ping)
+        if tf2mon.event_store:
+            tf2mon.event_store.status(user)
+        if ENABLED["STATUS"]:
+            logger.log("STATUS", user)
+
+        #
+        if not user.team and (team := tf2mon.users.teams_by_steamid.get(steamid)):
+            user.team = team
+
+        #
+        if not user.steamplayer:
+            user.vet()
+
+    @staticmethod
+    def _set_elapsed(user: User, s_elapsed: str) -> None:
+        """Set `user.elapsed` and `user.s_elapsed` from `s_elapsed`; mark dirty if changed."""
+
         mdy = s_elapsed.split(":")
         if len(mdy) == 2:
             _h, _m, _s = 0, int(mdy[0]), int(mdy[1])
-            user.elapsed = (_m * 60) + _s
         elif len(mdy) == 3:
             _h, _m, _s = int(mdy[0]), int(mdy[1]), int(mdy[2])
-            user.elapsed = (_h * 3600) + (_m * 60) + _s
         else:
             _h, _m, _s = 0, 0, 0
-            user.elapsed = 0
+
+        user.elapsed = (_h * 3600) + (_m * 60) + _s
 
         # hh:mm:ss
         #     0:00
         _ss = f"{_s:02}"
         if not _h:
             _mm = f"{_m:5}"
-            user.s_elapsed = _mm + ":" + _ss
+            formatted = _mm + ":" + _ss
         else:
             _hh = f"{_h:2}"
             _mm = f"{_m:02}"
-            user.s_elapsed = _hh + ":" + _mm + ":" + _ss
-
-        #
-        user.ping = int(ping)
-        logger.log("STATUS", user)
+            formatted = _hh + ":" + _mm + ":" + _ss
 
-        #
-        if not user.team and (team := tf2mon.users.teams_by_steamid.get(steamid)):
-            user.team = team
-
-        #
-        if not user.steamplayer:
-            user.vet()
+        if formatted != user.s_elapsed:
+            user.s_elapsed = formatted
+            user.dirty = True
@@ -0,0 +1,195 @@
+"""Index of the games in a console logfile, to replay one without reading those before it.
+
+A game starts when the `player_name` connects (`GameConnectedEvent` calls
+`reset_game`). The index lists where each game starts, and what the
+`status` command logged of its server, and is cached beside the logfile
+(`SUFFIX`). The cache is extended when the logfile grows, and rebuilt
+when it shrinks (`--trunc-con-logfile`) or `player_name` changes.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Iterator
+
+from loguru import logger
+
+from tf2mon.texttable import TextColumn, TextTable
+
+SUFFIX = ".games.json"
+
+_VERSION = 1
+
+_RE_TIMESTAMP = re.compile(rb"^(\d{2}/\d{2}/\d{4} - \d{2}:\d{2}:\d{2}): ")
+_RE_HOSTNAME = re.compile(rb"^hostname: (.*)")
+_RE_MAP = re.compile(rb"^map\s+: (\S+)")
+_RE_PLAYERS = re.compile(rb"^players : (.*)")
+
+
+@dataclass(slots=True)
+class GameBoundary:
+    """Where a game starts in the console logfile, and what is known of it."""
+
+    lineno: int  # of the line on which `player_name` connected.
+    offset: int  # of that line.
+    time: str = ""  # of that line; when TF2 logs timestamps (`con_timestamp 1`).
+    hostname: str = ""
+    map: str = ""
+    players: str = ""  # "20 humans, 0 bots (32 max)"
+
+
+class GameIndex:
+    """Index of the games in a console logfile."""
+
+    table = TextTable(
+        [
+            TextColumn(-4, "GAME"),
+            TextColumn(-8, "LINENO"),
+            TextColumn(21, "TIME"),
+            TextColumn(20, "MAP"),
+            TextColumn(28, "PLAYERS"),
+            TextColumn(0, "HOSTNAME"),
+        ]
+    )
+
+    def __init__(self, path: Path, player_name: str) -> None:
+        """Create empty index of the games in console logfile `path`."""
+
+        self.path = path.expanduser()
+        self.cache_path = self.path.with_name(self.path.name + SUFFIX)
+        self.player_name = player_name
+        self.games: list[GameBoundary] = []
+        self._offset = 0  # scanned, up to this (start of a line).
+        self._lineno = 0  # scanned, through this.
+
+    @classmethod
+    def load(cls, path: Path, player_name: str) -> GameIndex:
+        """Return index of console logfile `path`; from its cache, updated, and cached again."""
+
+        index = cls(path, player_name)
+        with contextlib.suppress(OSError, ValueError, KeyError, TypeError):
+            index._load_cache()
+        if index.update() or not index.cache_path.exists():
+            index.save()
+        return index
+
+    def _load_cache(self) -> None:
+
+        cache = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        if cache["version"] != _VERSION or cache["player_name"] != self.player_name:
+            return
+        if cache["offset"] > self.path.stat().st_size:
+            logger.info(f"`{self.path}` was truncated; rebuilding `{self.cache_path}`")
+            return
+        self.games = [GameBoundary(**x) for x in cache["games"]]
+        self._offset = cache["offset"]
+        self._lineno = cache["lineno"]
+
+    def save(self) -> None:
+        """Write index to its cache."""
+
+        cache = {
+            "version": _VERSION,
+            "player_name": self.player_name,
+            "offset": self._offset,
+            "lineno": self._lineno,
+            "games": [asdict(x) for x in self.games],
+        }
+        try:
+            self.cache_path.write_text(json.dumps(cache, indent=1), encoding="utf-8")
+        except OSError as err:
+            logger.warning(f"Can't write `{self.cache_path}`: {err}")
+
+    def update(self) -> bool:
+        """Scan logfile from where last scanned to its end; return True if anything was."""
+
+        start = self._offset
+        with open(self.path, "rb") as file:
+            file.seek(self._offset)
+            for offset, line in self._lines(file, self._offset):
+                self._lineno += 1
+                self._scan(line, offset, self._lineno)
+                self._offset = offset + len(line)
+        return self._offset != start
+
+    @staticmethod
+    def _lines(file: IO[bytes], offset: int) -> Iterator[tuple[int, bytes]]:
+        """Yield offset and text of each complete line in `file`, read from `offset`.
+
+        Lines end as they do when `Conlog` reads them (universal newlines).
+        """
+
+        for chunk in file:  # split at "\n" only.
+            if not chunk.endswith(b"\n"):
+                return  # being written.
+            if b"\r" not in chunk[:-2]:
+                yield offset, chunk
+                offset += len(chunk)
+            else:
+                for line in chunk.splitlines(keepends=True):
+                    yield offset, line
+                    offset += len(line)
+
+    def _scan(self, line: bytes, offset: int, lineno: int) -> None:
+        """Index `line`, if it starts a game or describes its server."""
+
+        if not (
+            b" connected" in line
+            or b"hostname: " in line
+            or b"map " in line
+            or b"players : " in line
+        ):
+            return
+
+        text = line.rstrip(b"\r\n")
+        _time = ""
+        if match := _RE_TIMESTAMP.match(text):
+            _time = match.group(1).decode()
+            text = text[match.end() :]
+
+        if text == f"{self.player_name} connected".encode():
+            self.games.append(GameBoundary(lineno, offset, _time))
+        elif not self.games:
+            return
+        elif match := _RE_HOSTNAME.match(text):
+            self.games[-1].hostname = self.games[-1].hostname or _decode(match.group(1))
+        elif match := _RE_MAP.match(text):
+            self.games[-1].map = self.games[-1].map or _decode(match.group(1))
+        elif match := _RE_PLAYERS.match(text):
+            self.games[-1].players = self.games[-1].players or _decode(match.group(1))
+
+    def game(self, number: int) -> tuple[GameBoundary, int | None]:
+        """Return game `number` (from 1; or from -1, the last), and the lineno that ends it.
+
+        Raise `IndexError` if there is no such game.
+        """
+
+        if number == 0:
+            raise IndexError(number)
+        index = number - 1 if number > 0 else len(self.games) + number
+        if not 0 <= index < len(self.games):
+            raise IndexError(number)
+        end = self.games[index + 1].lineno if index + 1 < len(self.games) else None
+        return self.games[index], end
+
+    def format(self) -> Iterator[str]:
+        """Yield lines of a table of the games."""
+
+        yield self.table.formatted_header.rstrip()
+        for number, game in enumerate(self.games, start=1):
+            yield self.table.format_detail(
+                number,
+                game.lineno,
+                game.time,
+                game.map,
+                game.players,
+                game.hostname,
+            ).rstrip()
+
+
+def _decode(text: bytes) -> str:
+    return text.decode(errors="replace").strip()
@@ -0,0 +1,230 @@
+"""Import external cheater lists (TF2BD playerlist json) into the `players` table."""
+
+from __future__ import annotations
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+from loguru import logger
+
+from tf2mon.database import Database
+from tf2mon.player import Player, forget_known_steamids, known_steamids
+from tf2mon.playeralias import PlayerAlias, forget_banned_aliases
+from tf2mon.steamid import accountid, steamid64
+
+# Characters read from the file at a time.
+CHUNK_SIZE = 1 << 16
+
+# Rows upserted per transaction.
+BATCH_SIZE = 10_000
+
+# TF2BD attribute to `players` column (playerlist.official).
+ATTRIBUTES = {
+    "cheater": ("_cheater", Player.CHEATER),
+    "suspicious": ("_suspect", Player.SUSPECT),
+    "exploiter": ("_exploiter", Player.EXPLOITER),
+    "racist": ("_racist", Player.RACIST),
+}
+
+# Columns written by the importer; all others (tf2mon, defcon6) are left alone.
+COLUMNS = ("_cheater", "_suspect", "_exploiter", "_racist", "_last_name", "_s_last_time")
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+class _Reader:
+    """Decode json values one at a time from a file, reading it in chunks."""
+
+    def __init__(self, file: IO[str], chunk_size: int) -> None:
+
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> None:
+        """Read next chunk, discarding what has been consumed."""
+
+        if not (data := self._file.read(self._chunk_size)):
+            self._eof = True
+        self._buf = self._buf[self._pos :] + data
+        self._pos = 0
+
+    def peek(self) -> str:
+        """Skip whitespace and return next character, or "" at end of file."""
+
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buf) or self._eof:
+                return self._buf[self._pos : self._pos + 1]
+            self._fill()
+
+    def expect(self, char: str) -> None:
+        """Consume `char`, which must be next."""
+
+        if (found := self.peek()) != char:
+            raise ValueError(f"Expected {char!r}, found {found or 'end of file'!r}")
+        self._pos += 1
+
+    def skip(self, char: str) -> None:
+        """Consume `char`, if next."""
+
+        if self.peek() == char:
+            self._pos += 1
+
+    def value(self) -> Any:
+        """Decode and return next value."""
+
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # a number, or `true` etc., may continue into the next chunk.
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+
+def iter_playerlist(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[dict[str, Any]]:
+    """Yield entries of the `players` array of TF2BD playerlist json file `path`.
+
+    The file is parsed incrementally, one entry at a time, so memory use
+    does not depend on the number of entries.
+    """
+
+    with open(path.expanduser(), encoding="utf-8") as file:
+        reader = _Reader(file, chunk_size)
+        reader.expect("{")
+        while reader.peek() != "}":
+            key = reader.value()
+            reader.expect(":")
+            if key == "players":
+                reader.expect("[")
+                while reader.peek() != "]":
+                    yield reader.value()
+                    reader.skip(",")
+                reader.expect("]")
+            else:
+                reader.value()
+            reader.skip(",")
+
+
+def parse_entry(entry: dict[str, Any]) -> tuple[int, list[str], str, str] | None:
+    """Return `(steamid, attrs, last_name, s_last_time)` of playerlist `entry`.
+
+    `attrs` are values for the `players` columns in `ATTRIBUTES`, in order.
+    Return None if `entry` has no valid steamid, or no known attributes.
+    """
+
+    if not (steamid := steamid64(entry.get("steamid"))):
+        return None
+
+    attributes = set(entry.get("attributes") or [])
+    if not attributes.intersection(ATTRIBUTES):
+        return None
+    attrs = [value if x in attributes else "" for x, (_, value) in ATTRIBUTES.items()]
+
+    last_name = s_last_time = ""
+    if isinstance(last_seen := entry.get("last_seen"), dict):
+        last_name = str(last_seen.get("player_name") or "")
+        if seconds := last_seen.get("time"):
+            s_last_time = time.strftime("%FT%T", time.localtime(int(seconds)))
+
+    return accountid(steamid), attrs, last_name, s_last_time
+
+
+def import_playerlist(
+    path: Path,
+    replace: bool = False,
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """Upsert the entries of TF2BD playerlist json file `path` into `players`.
+
+    Only the playerlist.official columns (`COLUMNS`) are written; locally
+    set tf2mon and defcon6 attributes are preserved. When merging (the
+    default) an existing attribute is kept if the list does not set it;
+    with `replace` the list's attributes overwrite those previously
+    imported. The last name is updated only if seen more recently, and
+    is recorded as a `PlayerAlias`. Return number of entries imported.
+    """
+
+    # pylint: disable=too-many-locals
+
+    db = Database()
+    assert db
+
+    if replace:
+        merge = ", ".join(f"{x}=excluded.{x}" for x, _ in ATTRIBUTES.values())
+    else:
+        merge = ", ".join(
+            f"{x}=case when excluded.{x} != '' then excluded.{x} else players.{x} end"
+            for x, _ in ATTRIBUTES.values()
+        )
+    # new rows get "" in the columns not written, for `Player.display_level` etc.
+    others = _other_columns()
+    placeholders = ",".join(["?"] * (1 + len(COLUMNS)) + ["''"] * len(others))
+    upsert = (
+        f"insert into {Player.__tablename__}(steamid, {', '.join(COLUMNS + others)})"
+        f" values({placeholders})"
+        f" on conflict(steamid) do update set {merge},"
+        " _last_name=case when excluded._s_last_time > ifnull(players._s_last_time, '')"
+        " then excluded._last_name else players._last_name end,"
+        " _s_last_time=max(excluded._s_last_time, ifnull(players._s_last_time, ''))"
+    )
+    alias = f"insert or ignore into {PlayerAlias.__tablename__} values(?,?,?,?)"
+
+    started = time.perf_counter()
+    nread = nimported = 0
+    rows: list[tuple[Any, ...]] = []
+
+    def _flush() -> None:
+        db.executemany(upsert, rows)
+        db.executemany(alias, [(row[0], row[5], row[6], row[6]) for row in rows if row[5]])
+        db.connection.commit()
+        rate = nimported / max(time.perf_counter() - started, 1e-9)
+        logger.info(f"Imported {nimported} of {nread} entries ({rate:.0f} rows/sec)")
+        rows.clear()
+
+    for entry in iter_playerlist(path):
+        nread += 1
+        if (parsed := parse_entry(entry)) is None:
+            continue
+        steamid, attrs, last_name, s_last_time = parsed
+        rows.append((steamid, *attrs, last_name, s_last_time))
+        nimported += 1
+        if len(rows) >= batch_size:
+            _flush()
+
+    _flush()
+    forget_banned_aliases()
+    forget_known_steamids()
+    known_steamids()
+    return nimported
+
+
+def _other_columns() -> tuple[str, ...]:
+    """Return names of `players` columns not written by the importer."""
+
+    db = Database()
+    assert db
+
+    db.execute(f"select name from pragma_table_info('{Player.__tablename__}')")
+    return tuple(x for (x,) in db.fetchall() if x != "steamid" and x not in COLUMNS)
+
+
+def print_playerlist(path: Path) -> None:
+    """Print the entries of TF2BD playerlist json file `path`."""
+
+    for entry in iter_playerlist(path):
+        if (parsed := parse_entry(entry)) is not None:
+            steamid, attrs, last_name, s_last_time = parsed
+            print(steamid, ",".join(x for x in attrs if x), s_last_time, repr(last_name))
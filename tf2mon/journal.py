@@ -0,0 +1,219 @@
+"""Journal of parsed game events, to replay a game without parsing its console logfile.
+
+A journal is a sequence of length-prefixed binary records:
+
+    record  = length:u32 kind:u8 payload[length]
+    STRING  = utf-8 text; the next string id
+    TYPE    = utf-8 name of `GameEvent` class; the next type id
+    EVENT   = type:u16 lineno:u32 timestamp:f64 fields:u32[]
+
+Each `EVENT` field is 0 for a group that did not participate in the match,
+else 1 + the id of a `STRING` defined earlier in the file. Strings (user
+names, weapons, steamids) are written once per file, and are the same `str`
+objects each time they are read back.
+
+Only game events are journaled; the operator's commands are not. One file
+is written per game (`JournalWriter.rotate` is called by `reset_game`).
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+from array import array
+from pathlib import Path
+from typing import IO, Iterator, Match
+
+from loguru import logger
+
+from tf2mon.gameevent import GameEvent
+
+MAGIC = b"TF2MONJ1"
+SUFFIX = ".tf2j"
+
+_RECORD = struct.Struct("<IB")
+_EVENT = struct.Struct("<HId")
+
+_STRING = 0
+_TYPE = 1
+_EVENT_KIND = 2
+
+
+class JournalMatch:
+    """Stand-in for the `re.Match` passed to `GameEvent.handler`.
+
+    `group(0)` is the whole match only for patterns without groups, whose
+    match is journaled as their only field.
+    """
+
+    __slots__ = ("_groups", "_groupindex")
+
+    def __init__(self, groups: tuple[str | None, ...], groupindex: dict[str, int]) -> None:
+        """Create match of `groups`, named by `groupindex`."""
+
+        self._groups = groups
+        self._groupindex = groupindex
+
+    def groups(self) -> tuple[str | None, ...]:
+        """Return all groups."""
+
+        return self._groups
+
+    def _group(self, key: int | str) -> str | None:
+
+        index = self._groupindex[key] if isinstance(key, str) else key
+        if index == 0:
+            return self._groups[0] if len(self._groups) == 1 else None
+        return self._groups[index - 1]
+
+    def group(self, *keys: int | str) -> str | None | tuple[str | None, ...]:
+        """Return group, or tuple of groups, by number or name."""
+
+        if len(keys) <= 1:
+            return self._group(keys[0] if keys else 0)
+        return tuple(self._group(x) for x in keys)
+
+    def __getitem__(self, key: int | str) -> str | None:
+        return self._group(key)
+
+    def groupdict(self) -> dict[str, str | None]:
+        """Return named groups."""
+
+        return {x: self._groups[i - 1] for x, i in self._groupindex.items()}
+
+
+class JournalWriter:
+    """Append parsed game events to a journal file in a directory, one file per game."""
+
+    def __init__(self, directory: Path) -> None:
+        """Prepare to write journals to `directory`; files are opened on first write."""
+
+        self.directory = directory.expanduser()
+        self.path: Path | None = None
+        self._file: IO[bytes] | None = None
+        self._strings: dict[str, int] = {}
+        self._types: dict[str, int] = {}
+        self._closed = False
+        self._lineno = 0  # last written.
+
+    def _open(self) -> IO[bytes]:
+        """Open and return next journal file."""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = time.strftime("%Y%m%d-%H%M%S")
+        path = self.directory / f"{stem}{SUFFIX}"
+        nth = 1
+        while path.exists():
+            nth += 1
+            path = self.directory / f"{stem}-{nth}{SUFFIX}"
+
+        logger.info(f"Writing `{path}`")
+        self.path = path
+        self._file = open(path, "wb")  # noqa
+        self._file.write(MAGIC)
+        self._strings.clear()
+        self._types.clear()
+        return self._file
+
+    def _record(self, file: IO[bytes], kind: int, payload: bytes) -> None:
+        file.write(_RECORD.pack(len(payload), kind))
+        file.write(payload)
+
+    def _string_ref(self, file: IO[bytes], value: str | None) -> int:
+        """Return field reference to `value`, defining it if new."""
+
+        if value is None:
+            return 0
+        if (ref := self._strings.get(value)) is None:
+            self._record(file, _STRING, value.encode())
+            ref = self._strings[value] = len(self._strings) + 1
+        return ref
+
+    def write(
+        self, event: GameEvent, match: Match[str], lineno: int, timestamp: float | None
+    ) -> None:
+        """Append `event`, parsed from line `lineno` as `match`, to the journal.
+
+        The event is timed by the `timestamp` logged with its line, else,
+        if TF2 does not log timestamps (`con_timestamp 0`), by the clock.
+        Events from lines already written (replayed after seeking backward)
+        are not written again.
+        """
+
+        if self._closed or lineno <= self._lineno:
+            return
+        self._lineno = lineno
+        file = self._file or self._open()
+
+        name = event.__class__.__name__
+        if (type_id := self._types.get(name)) is None:
+            self._record(file, _TYPE, name.encode())
+            type_id = self._types[name] = len(self._types)
+
+        groups = match.groups() or (match.group(0),)
+        refs = array("I", [self._string_ref(file, x) for x in groups])
+        if timestamp is None:
+            timestamp = time.time()
+        self._record(file, _EVENT_KIND, _EVENT.pack(type_id, lineno, timestamp) + refs.tobytes())
+
+    def rotate(self) -> None:
+        """Start a new file with the next event written."""
+
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        """Close the journal; nothing more will be written."""
+
+        self.rotate()
+        self._closed = True
+
+
+def iter_journal(
+    path: Path,
+    events: list[GameEvent],
+) -> Iterator[tuple[GameEvent, JournalMatch, int, float]]:
+    """Yield `(event, match, lineno, timestamp)` for each event in journal `path`.
+
+    Journaled events are looked up in `events` by class name.
+    """
+
+    data = path.expanduser().read_bytes()
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a journal")
+
+    events_by_name = {x.__class__.__name__: x for x in events}
+    strings: list[str | None] = [None]
+    types: list[tuple[GameEvent, dict[str, int]]] = []
+
+    pos, end = len(MAGIC), len(data)
+    while pos < end:
+        if pos + _RECORD.size > end:
+            raise ValueError(f"Truncated record at offset {pos}")
+        length, kind = _RECORD.unpack_from(data, pos)
+        pos += _RECORD.size
+        payload = data[pos : pos + length]
+        if len(payload) != length:
+            raise ValueError(f"Truncated record at offset {pos - _RECORD.size}")
+        pos += length
+
+        if kind == _EVENT_KIND:
+            type_id, lineno, timestamp = _EVENT.unpack_from(payload)
+            refs = array("I")
+            refs.frombytes(payload[_EVENT.size :])
+            event, groupindex = types[type_id]
+            match = JournalMatch(tuple(strings[x] for x in refs), groupindex)
+            yield event, match, lineno, timestamp
+
+        elif kind == _STRING:
+            strings.append(payload.decode())
+
+        elif kind == _TYPE:
+            name = payload.decode()
+            if (event := events_by_name.get(name)) is None:
+                raise ValueError(f"Unknown event {name!r}")
+            types.append((event, dict(event._re.groupindex)))  # noqa: protected-access
+
+        else:
+            raise ValueError(f"Unknown record kind {kind} at offset {pos - length}")
@@ -0,0 +1,198 @@
+"""Columnar ledger of the kills in one game."""
+
+from __future__ import annotations
+
+import struct
+import tempfile
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from tf2mon.role import WeaponState
+from tf2mon.user import UserHandle
+
+# Rows held in memory before the oldest are spilled to disk.
+MAX_ROWS = 100_000
+
+
+@dataclass(slots=True)
+class Kill:
+    """A row of the `KillLedger`; stats are as of the time of the kill."""
+
+    # pylint: disable=too-many-instance-attributes
+    timestamp: float
+    killer: UserHandle
+    victim: UserHandle
+    weapon_state: WeaponState
+    crit: bool
+    killer_nkills: int
+    killer_ndeaths: int
+    victim_nkills: int
+    victim_ndeaths: int
+
+
+class KillLedger:
+    """Columnar ledger of the kills in one game.
+
+    Each column is a parallel `array`, and users are referenced by handle,
+    so a row costs a few dozen bytes and holds no references to `User`s.
+    When `max_rows` is given, the oldest half of the rows are spilled to a
+    temporary file whenever that many are held in memory; spilled rows
+    remain readable, by row number, from the file.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    _record = struct.Struct("<dIIIBIIII")
+
+    def __init__(self, max_rows: int | None = MAX_ROWS, spill_dir: Path | None = None) -> None:
+        """Create empty ledger."""
+
+        self.max_rows = max_rows
+        self.spill_dir = spill_dir
+
+        self.timestamp = array("d")
+        self.killer = array("I")
+        self.victim = array("I")
+        self.weapon_state = array("I")
+        self.crit = array("B")
+        self.killer_nkills = array("I")
+        self.killer_ndeaths = array("I")
+        self.victim_nkills = array("I")
+        self.victim_ndeaths = array("I")
+
+        self._columns = (
+            self.timestamp,
+            self.killer,
+            self.victim,
+            self.weapon_state,
+            self.crit,
+            self.killer_nkills,
+            self.killer_ndeaths,
+            self.victim_nkills,
+            self.victim_ndeaths,
+        )
+
+        # row number of most recent kill and death, by user.
+        self._last_kill: dict[UserHandle, int] = {}
+        self._last_death: dict[UserHandle, int] = {}
+
+        self._first = 0  # row number of first row held in memory.
+        self._spill: IO[bytes] | None = None
+
+    def __len__(self) -> int:
+        return self._first + len(self.timestamp)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Return state to pickle; with the rows spilled, instead of the spill file."""
+
+        state = self.__dict__.copy()
+        if self._spill:
+            self._spill.seek(0)
+            state["_spill"] = self._spill.read()
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore pickled state; spilled rows to a spill file of its own."""
+
+        spilled = state.pop("_spill")
+        self.__dict__.update(state)
+        self._spill = None
+        if spilled:
+            # pylint: disable=consider-using-with
+            self._spill = tempfile.TemporaryFile(prefix="tf2mon-kills-", dir=self.spill_dir)
+            self._spill.write(spilled)
+
+    def append(
+        self,
+        timestamp: float,
+        killer: UserHandle,
+        victim: UserHandle,
+        weapon_state: WeaponState,
+        crit: bool,
+        killer_stats: tuple[int, int],
+        victim_stats: tuple[int, int],
+    ) -> int:
+        """Append a kill and return its row number.
+
+        `killer_stats` and `victim_stats` are `(nkills, ndeaths)` as of the kill.
+        """
+
+        if self.max_rows and len(self.timestamp) >= self.max_rows:
+            self._spill_rows(len(self.timestamp) // 2)
+
+        row = len(self)
+        self.timestamp.append(timestamp)
+        self.killer.append(killer)
+        self.victim.append(victim)
+        self.weapon_state.append(weapon_state)
+        self.crit.append(crit)
+        self.killer_nkills.append(killer_stats[0])
+        self.killer_ndeaths.append(killer_stats[1])
+        self.victim_nkills.append(victim_stats[0])
+        self.victim_ndeaths.append(victim_stats[1])
+
+        self._last_kill[killer] = row
+        self._last_death[victim] = row
+        return row
+
+    def __getitem__(self, row: int) -> Kill:
+        """Return `Kill` at `row`."""
+
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+
+        values: tuple[Any, ...]
+        if row >= self._first:
+            i = row - self._first
+            values = tuple(column[i] for column in self._columns)
+        else:
+            assert self._spill
+            self._spill.seek(row * self._record.size)
+            values = self._record.unpack(self._spill.read(self._record.size))
+            self._spill.seek(0, 2)
+
+        return Kill(
+            values[0],
+            UserHandle(values[1]),
+            UserHandle(values[2]),
+            WeaponState(values[3]),
+            bool(values[4]),
+            *values[5:],
+        )
+
+    def last_kill(self, user: UserHandle) -> Kill | None:
+        """Return most recent kill by `user`."""
+
+        row = self._last_kill.get(user)
+        return self[row] if row is not None else None
+
+    def last_death(self, user: UserHandle) -> Kill | None:
+        """Return most recent death of `user`."""
+
+        row = self._last_death.get(user)
+        return self[row] if row is not None else None
+
+    @property
+    def nspilled(self) -> int:
+        """Return number of rows spilled to disk."""
+
+        return self._first
+
+    def _spill_rows(self, nrows: int) -> None:
+        """Move the oldest `nrows` rows held in memory to the spill file."""
+
+        if not self._spill:
+            # pylint: disable=consider-using-with
+            self._spill = tempfile.TemporaryFile(prefix="tf2mon-kills-", dir=self.spill_dir)
+
+        pack = self._record.pack
+        self._spill.write(
+            b"".join(pack(*values) for values in zip(*(x[:nrows] for x in self._columns)))
+        )
+        for column in self._columns:
+            del column[:nrows]
+        self._first += nrows
@@ -0,0 +1,183 @@
+"""Buffered logger sink to the curses log window."""
+
+from __future__ import annotations
+
+import contextlib
+import curses
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import libcurses
+from loguru import logger
+
+# Most records held between frames; older records are dropped.
+MAXLEN = 1000
+
+# Seconds between frames.
+FRAME_INTERVAL = 0.05
+
+
+@dataclass(slots=True)
+class LogRecord:
+    """Formatted logger record, and the number of times it was repeated."""
+
+    time: str
+    location: str
+    level: str
+    message: str
+    count: int = 1
+
+    def repeats(self, other: LogRecord) -> bool:
+        """Return True if `other` repeats this record."""
+
+        return (self.message, self.level, self.location) == (
+            other.message,
+            other.level,
+            other.location,
+        )
+
+
+class LogBuffer:
+    """Records not yet displayed.
+
+    A record identical to the one before it is counted, not added. When
+    `maxlen` records are held, the oldest is dropped to make room, and
+    counted, so that logging never waits on the display.
+    """
+
+    def __init__(self, maxlen: int = MAXLEN) -> None:
+        """Create empty buffer."""
+
+        self._records: deque[LogRecord] = deque(maxlen=maxlen)
+        self._ndropped = 0
+        self._lock = threading.Lock()
+
+    def append(self, record: LogRecord) -> None:
+        """Add `record` to buffer."""
+
+        with self._lock:
+            if self._records and (last := self._records[-1]).repeats(record):
+                last.count += 1
+                last.time = record.time
+                return
+            if len(self._records) == self._records.maxlen:
+                self._ndropped += 1
+            self._records.append(record)
+
+    def drain(self) -> tuple[list[LogRecord], int]:
+        """Remove and return records, and number dropped, since last drained."""
+
+        with self._lock:
+            records, ndropped = list(self._records), self._ndropped
+            self._records.clear()
+            self._ndropped = 0
+        return records, ndropped
+
+
+class LogSink(libcurses.LogSink):
+    """Logger sink to curses window, displayed at most once per frame.
+
+    Records are buffered (see `LogBuffer`) rather than drawn one at a
+    time, and the buffer is displayed by `flush`, at most once every
+    `FRAME_INTERVAL` seconds; by `UI.update_display`, and by a thread of
+    its own when the game is idle.
+    """
+
+    def __init__(self, logwin: curses.window, maxlen: int = MAXLEN) -> None:
+        """Begin logging to `logwin`."""
+
+        # before `super` adds the sink.
+        self.buffer = LogBuffer(maxlen)
+        self._flushed = 0.0
+        self._flush_lock = threading.Lock()
+        self._closed = False
+
+        super().__init__(logwin)
+        threading.Thread(name="LOGSINK", target=self._tick, daemon=True).start()
+
+    def _sink(self, msg: str) -> None:
+        """Not public."""
+
+        _time, location, level, message = msg.split(self.delim, maxsplit=3)
+        self.buffer.append(LogRecord(_time, location, level, message))
+
+    def _tick(self) -> None:
+        """Flush every frame."""
+
+        while not self._closed:
+            time.sleep(FRAME_INTERVAL)
+            self.flush()
+
+    def close(self) -> None:
+        """Stop logging to the window; e.g., after curses has ended.
+
+        Records not yet displayed are dropped; they were logged to the other sinks.
+        """
+
+        with self._flush_lock:  # wait for any flush in progress.
+            self._closed = True
+            if self._id is not None:
+                logger.remove(self._id)
+                self._id = None
+
+    def flush(self) -> None:
+        """Display buffered records, unless displayed within this frame."""
+
+        if not self._flush_lock.acquire(blocking=False):
+            return  # another thread is flushing.
+
+        try:
+            if self._closed or (now := time.monotonic()) - self._flushed < FRAME_INTERVAL:
+                return
+            self._flushed = now
+
+            records, ndropped = self.buffer.drain()
+            if not records and not ndropped:
+                return
+
+            with contextlib.suppress(curses.error), libcurses.core.preserve_cursor():
+                if ndropped:
+                    self._addrecord(
+                        LogRecord(records[0].time, "", "WARNING", f"{ndropped} dropped")
+                    )
+                for record in records:
+                    self._addrecord(record)
+                self.logwin.noutrefresh()
+        finally:
+            self._flush_lock.release()
+
+    def _addrecord(self, record: LogRecord) -> None:
+        """Write `record` to window."""
+
+        color = self._colormap[record.level]
+        delim = self.delim
+
+        location = record.location
+        _len = len(location)
+        self._padloc = max(self._padloc, _len)
+        location += " " * (self._padloc - _len)
+
+        level = record.level
+        _len = len(level)
+        self._padlev = max(self._padlev, _len)
+        level += " " * (self._padlev - _len)
+
+        message = record.message.rstrip()
+        if record.count > 1:
+            message += f" (x {record.count})"
+
+        win = self.logwin
+        if sum(win.getyx()):
+            win.addch("\n")
+        win.addstr(record.time, color)
+        win.addch(delim)
+
+        if location:
+            win.addstr(location, color)
+            win.addch(delim)
+
+        win.addstr(level, color)
+        win.addch(delim)
+        win.addstr(message, color)
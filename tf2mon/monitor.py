@@ -2,6 +2,7 @@
 
 import curses
 import re
+import sqlite3
 import threading
 from pathlib import Path
 
@@ -10,12 +11,22 @@ from loguru import logger
 
 import tf2mon
 import tf2mon.game
+from tf2mon._logger import ENABLED
+from tf2mon.chathistory import ChatHistory, ChatHistoryWriter
+from tf2mon.checkpoint import Checkpoints
 from tf2mon.conlog import Conlog
 from tf2mon.database import Database
+from tf2mon.eventstore import EventStoreWriter
+from tf2mon.gameevent import GameEvent
+from tf2mon.gameindex import GameIndex
+from tf2mon.journal import JournalWriter, iter_journal
 from tf2mon.pkg import APPNAME
-from tf2mon.player import Player
+from tf2mon.player import Player, known_steamids
+from tf2mon.playeralias import PlayerAlias
 from tf2mon.racist import load_racist_data
+from tf2mon.renderer import HeadlessRenderer
 from tf2mon.role import load_weapons_data
+from tf2mon.steamid import accountid
 from tf2mon.steamplayer import SteamPlayer
 from tf2mon.ui import UI
 
@@ -23,16 +34,52 @@ from tf2mon.ui import UI
 class Monitor:
     """Team Fortress 2 Console Monitor."""
 
+    def __init__(self) -> None:
+        """Create Monitor."""
+
+        # game state, to seek backward; when there's an admin console.
+        self.checkpoints: Checkpoints | None = None
+        # line to seek to, requested by admin console; see `seek`.
+        self._seek_lineno: int | None = None
+
     def run(self) -> None:
         """Run the Monitor."""
-        libcurses.wrapper(self._run)
-
-    def _run(self, win: curses.window) -> None:
+        if tf2mon.options.headless:
+            self._run_headless()
+        else:
+            try:
+                libcurses.wrapper(self._run)
+            finally:
+                # curses has ended; log the reports that follow to stderr only.
+                if isinstance(ui := getattr(tf2mon, "ui", None), UI):
+                    ui.logsink.close()
+        if tf2mon.journal:
+            tf2mon.journal.close()
+        if tf2mon.event_store:
+            tf2mon.event_store.close()
+        if tf2mon.chat_history:
+            tf2mon.chat_history.close()
+
+    def _init(self) -> None:
         """Complete initialization; post CLI, options now available."""
 
         tf2mon.conlog = Conlog(tf2mon.options)
+        if tf2mon.options.game:
+            index = GameIndex.load(tf2mon.conlog.path, str(tf2mon.config.get("player_name")))
+            tf2mon.conlog.select_game(*index.game(tf2mon.options.game))
+        if tf2mon.options.journal:
+            tf2mon.journal = JournalWriter(tf2mon.options.journal)
+        if tf2mon.options.event_store:
+            tf2mon.event_store = EventStoreWriter(tf2mon.options.event_store, tf2mon.conlog)
+        if tf2mon.options.chat_history:
+            tf2mon.chat_history = ChatHistoryWriter(tf2mon.options.chat_history, tf2mon.conlog)
         load_weapons_data(Path(__file__).parent / "data" / "weapons.csv")
         load_racist_data(Path(__file__).parent / "data" / "racist.txt")
+
+    def _run(self, win: curses.window) -> None:
+        """Run the Monitor in curses window `win`."""
+
+        self._init()
         tf2mon.ui = UI(win)
         tf2mon.controller.start()
         tf2mon.reset_game()
@@ -49,33 +96,68 @@ class Monitor:
         # Read from keyboard/mouse, write to display.
         self.admin()
 
+    def _run_headless(self) -> None:
+        """Play the game to the end of the conlog, without curses; then print a summary.
+
+        Only the game loop's single-step gate is started, not the controls that
+        need curses or that write to TF2 (no `cfg` files are written; the kicks
+        and spams queues are reported in the summary instead).
+        """
+
+        self._init()
+        renderer = HeadlessRenderer()
+        tf2mon.ui = renderer
+        tf2mon.SingleStepControl.start()
+        tf2mon.reset_game()
+        self.game()
+        renderer.print_summary(tf2mon.options.json)
+
     def game(self) -> None:
         """Read console log file and play game."""
 
-        Database(tf2mon.options.database, [Player, SteamPlayer])
+        Database(tf2mon.options.database, [Player, SteamPlayer, PlayerAlias])
+        known_steamids()
+
+        if tf2mon.options.replay_journal:
+            self.replay_journal(tf2mon.options.replay_journal)
+            return
+
         assert tf2mon.conlog
         tf2mon.conlog.open()  # waits until it exists; then opens and returns.
         stepper = tf2mon.SingleStepControl
+        events = [
+            x
+            for x in tf2mon.game.events + tf2mon.controller.controls
+            if hasattr(x, "search") and x.search
+        ]
+        if tf2mon.options.follow:
+            self.checkpoints = checkpoints = Checkpoints()
+            checkpoints.take()
 
         while (line := tf2mon.conlog.readline()) is not None:
+            if self._seek_lineno is not None:
+                self._seek()
+                continue
+
+            if stepper.is_fast_forward and tf2mon.conlog.is_eof:
+                stepper.stop_fast_forward()  # caught up with `--follow`.
+
             # conlog.readline does not return excluded lines.
             if not line:
                 continue
 
             event, match = None, None
-            for event in [
-                x
-                for x in tf2mon.game.events + tf2mon.controller.controls
-                if hasattr(x, "search") and x.search
-            ]:
+            for event in events:
                 assert event.search
                 if match := event.search(line):
                     break
             else:
-                logger.log("ignore", tf2mon.conlog.last_line)
+                if ENABLED["ignore"]:
+                    logger.log("ignore", tf2mon.conlog.last_line)
                 continue
 
-            logger.log("regex", match)
+            if ENABLED["regex"]:
+                logger.log("regex", match)
 
             if hasattr(event, "start_stepping") and event.start_stepping:
                 logger.log("ADMIN", f"break on {event.__class__.__name__}")
@@ -88,8 +170,9 @@ class Monitor:
                 stepper.start_single_stepping()
 
             level = "nextline" if stepper.is_stepping else "logline"
-            logger.log(level, "-" * 80)
-            logger.log(level, tf2mon.conlog.last_line)
+            if ENABLED[level]:
+                logger.log(level, "-" * 80)
+                logger.log(level, tf2mon.conlog.last_line)
 
             # check gate
             assert stepper.wait
@@ -100,9 +183,93 @@ class Monitor:
 
             if hasattr(event, "handler"):
                 event.handler(match)
+                if tf2mon.journal and isinstance(event, GameEvent):
+                    tf2mon.journal.write(
+                        event, match, tf2mon.conlog.lineno, tf2mon.conlog.timestamp
+                    )
+                if tf2mon.options.check_indexes:
+                    for error in tf2mon.users.check_indexes():
+                        logger.critical(f"line {tf2mon.conlog.lineno}: {error}")
+                if self.checkpoints and self.checkpoints.is_due():
+                    self.checkpoints.take()
+                if stepper.is_fast_forward:
+                    stepper.show_progress()
+                    continue
                 tf2mon.MsgQueuesControl.send()
                 tf2mon.ui.update_display()
 
+        stepper.stop_fast_forward()  # end of logfile.
+
+    def seek(self, lineno: int) -> None:
+        """Ask the game to seek to line `lineno`, and single-step there."""
+
+        if not self.checkpoints:
+            logger.error("no checkpoints; can't seek")
+            return
+
+        self._seek_lineno = max(1, lineno)
+        assert tf2mon.conlog
+        tf2mon.conlog.interrupt()  # if waiting at eof.
+        assert tf2mon.SingleStepControl.set
+        tf2mon.SingleStepControl.set()  # if waiting to step.
+
+    def _seek(self) -> None:
+        """Restore the checkpoint before `_seek_lineno`, and fast-forward to it."""
+
+        assert self.checkpoints
+        assert self._seek_lineno is not None
+        lineno, self._seek_lineno = self._seek_lineno, None
+        stepper = tf2mon.SingleStepControl
+
+        checkpoint_lineno = self.checkpoints.restore(lineno)
+        logger.log("ADMIN", f"seek line {lineno} from line {checkpoint_lineno}")
+
+        assert tf2mon.conlog
+        tf2mon.conlog.uninject_cmd("SINGLE-STEP", lineno)
+        stepper.set_single_step_lineno(lineno)
+        stepper.stop_single_stepping()
+        stepper.start_fast_forward()
+
+    def replay_journal(self, path: Path) -> None:
+        """Play game from journal `path`, instead of parsing the console logfile."""
+
+        logger.info(f"Reading `{path}`")
+        assert tf2mon.conlog
+
+        for event, match, lineno, timestamp in iter_journal(path, tf2mon.game.events):
+            tf2mon.conlog.lineno = lineno
+            tf2mon.conlog.timestamp = timestamp
+            event.handler(match)  # type: ignore[arg-type]
+            tf2mon.MsgQueuesControl.send()
+            tf2mon.ui.update_display()
+
+    def search_chats(self, arg: str) -> None:
+        """Show latest chats in `--chat-history` that match `[#USERID] [QUERY]`."""
+
+        if not tf2mon.options.chat_history:
+            logger.error("chats needs --chat-history")
+            return
+
+        steamids = []
+        if arg.startswith("#"):
+            userid, _, arg = arg[1:].partition(" ")
+            user = tf2mon.users.users_by_userid.get(int(userid)) if userid.isdigit() else None
+            if not user or not user.steamid:
+                logger.error(f"no steamid of userid {userid!r}")
+                return
+            steamids.append(accountid(user.steamid))
+
+        try:
+            history = ChatHistory(tf2mon.options.chat_history)
+            matches = history.search(arg.strip(), steamids, limit=tf2mon.options.max_chats)
+        except (OSError, sqlite3.Error) as err:
+            logger.error(err)
+            return
+
+        for line in history.format(matches):
+            tf2mon.ui.show_journal("help", line)
+        history.close()
+
     def admin(self) -> None:
         """Admin console read-evaluate-process-loop."""
 
@@ -149,6 +316,9 @@ class Monitor:
             if "breakpoint".find(cmd) == 0 and arg and arg.isdigit():
                 stepper.set_single_step_lineno(int(arg))
 
+            elif "back".find(cmd) == 0 and arg and arg.isdigit():
+                self.seek(tf2mon.conlog.lineno - int(arg))
+
             elif cmd[0] == "/":
                 pattern = cmd[1:]
                 if arg:
@@ -158,6 +328,12 @@ class Monitor:
             elif "continue".find(cmd) == 0 or "go".find(cmd) == 0 or "run".find(cmd) == 0:
                 stepper.stop_single_stepping()
 
+            elif "chats".find(cmd) == 0 and len(cmd) > 1:
+                self.search_chats(arg or "")
+
+            elif "goto".find(cmd) == 0 and arg and arg.isdigit():
+                self.seek(int(arg))
+
             elif "kick".find(cmd) == 0 and arg and arg.isdigit():
                 tf2mon.users.kick_userid(int(arg), Player.CHEATER)
 
@@ -0,0 +1,114 @@
+"""Similarity index over usernames, for detecting name-stealing clones."""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Generic, Hashable, TypeVar
+
+from fuzzywuzzy import fuzz  # type: ignore
+
+_K = TypeVar("_K", bound=Hashable)
+
+
+def _bigrams(name: str) -> Counter[str]:
+    return Counter(name[i : i + 2] for i in range(len(name) - 1))
+
+
+class NameIndex(Generic[_K]):
+    """Find names similar to a given name, without scoring every name.
+
+    Similarity is `fuzz.ratio`, which is `200 * M / (la + lb)` where `M`
+    is the number of matching characters of names of lengths `la` and
+    `lb`; `M` is at most their longest common subsequence. Two filters,
+    both exact (they never reject a name `fuzz.ratio` would accept), pick
+    the candidates that are scored:
+
+    Length:     `M <= min(la, lb)`, so names whose lengths differ too
+                much cannot match.
+    Bigrams:    each character not in the common subsequence breaks at
+                most one bigram of it in each name, so the names share at
+                least `3 * M - 1 - (la + lb)` bigrams; an inverted index
+                counts the bigrams each name shares with the query.
+    """
+
+    def __init__(self) -> None:
+        """Create empty index."""
+
+        self._names: dict[_K, tuple[int, str]] = {}  # (seqno, name) by key
+        self._keys_by_length: dict[int, set[_K]] = {}
+        self._postings: dict[str, dict[_K, int]] = {}  # count of bigram by key
+        self._seqno = 0
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, key: _K) -> bool:
+        return key in self._names
+
+    def get(self, key: _K) -> str | None:
+        """Return name with `key`, else None."""
+
+        item = self._names.get(key)
+        return item[1] if item else None
+
+    def add(self, key: _K, name: str) -> None:
+        """Add, or replace, `name` with `key`."""
+
+        if key in self._names:
+            self.remove(key)
+
+        self._names[key] = (self._seqno, name)
+        self._seqno += 1
+        self._keys_by_length.setdefault(len(name), set()).add(key)
+        for bigram, count in _bigrams(name).items():
+            self._postings.setdefault(bigram, {})[key] = count
+
+    def remove(self, key: _K) -> None:
+        """Remove name with `key`, if present."""
+
+        if (item := self._names.pop(key, None)) is None:
+            return
+        name = item[1]
+
+        keys = self._keys_by_length[len(name)]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_length[len(name)]
+
+        for bigram in _bigrams(name):
+            posting = self._postings[bigram]
+            del posting[key]
+            if not posting:
+                del self._postings[bigram]
+
+    def search(self, name: str, threshold: int = 80) -> list[tuple[_K, int]]:
+        """Return `(key, ratio)` of names whose `fuzz.ratio` with `name` exceeds `threshold`.
+
+        Results are in the order names were added.
+        """
+
+        # ratio > threshold, after rounding, requires M / (la + lb) > fraction.
+        fraction = (threshold + 0.5) / 200
+        len_a = len(name)
+
+        shared: dict[_K, int] = {}
+        for bigram, count in _bigrams(name).items():
+            for key, other in self._postings.get(bigram, {}).items():
+                shared[key] = shared.get(key, 0) + min(count, other)
+
+        candidates: list[_K] = []
+        for len_b, keys in self._keys_by_length.items():
+            total = len_a + len_b
+            if min(len_a, len_b) < fraction * total:
+                continue
+            if (need := math.ceil(3 * fraction * total) - 1 - total) <= 0:
+                candidates.extend(keys)
+            else:
+                candidates.extend(x for x in keys if shared.get(x, 0) >= need)
+
+        results = []
+        for key in sorted(candidates, key=lambda x: self._names[x][0]):
+            if (ratio := fuzz.ratio(name, self._names[key][1])) > threshold:
+                results.append((key, ratio))
+        return results
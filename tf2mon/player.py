@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-import json
 import time
 from dataclasses import dataclass
 
 from loguru import logger
 
 from tf2mon.database import Database, DatabaseTable
+from tf2mon.playeralias import PlayerAlias, add_banned_aliases
+from tf2mon.steamidset import SteamidSet
 
 
 @dataclass
@@ -44,7 +45,7 @@ class Player(DatabaseTable):
     milenko: str = ""
     last_name: str = ""
     s_last_time: str = ""
-    names: str = ""
+    names: str = ""  # no longer used; migrated to `PlayerAlias`
 
     # Attributes.
     # base
@@ -75,8 +76,7 @@ class Player(DatabaseTable):
         assert db
 
         db.execute(
-            f"create table if not exists {cls.__tablename__}"
-            """(
+            f"create table if not exists {cls.__tablename__}" """(
                 steamid integer primary key,
                 bot text,
                 friends text,
@@ -128,7 +128,14 @@ class Player(DatabaseTable):
 
     @classmethod
     def fetch_steamid(cls, steamid: int) -> Player | None:
-        """Return `Player` for given steamid, else None if not found."""
+        """Return `Player` for given steamid, else None if not found.
+
+        Most steamids are not in the table; they are answered from
+        `known_steamids` without querying the database.
+        """
+
+        if steamid not in known_steamids():
+            return None
 
         db = Database()
         assert db
@@ -151,26 +158,30 @@ class Player(DatabaseTable):
         self.s_prev_time = self.s_last_time
         self.s_last_time = self.strftime()
 
-        aliases = list(self.aliases)  # deserialize
-
-        if self.last_name not in aliases:
+        if self.last_name and PlayerAlias.track(
+            self.steamid, self.last_name, self.s_prev_time or self.s_last_time
+        ):
             logger.log(level, f"{leader}: adding last_name `{self.last_name}`")
-            aliases.append(self.last_name)
         self.last_name = name
 
-        if name not in aliases:
+        if PlayerAlias.track(self.steamid, name, self.s_last_time):
             logger.log(level, f"{leader}: adding alias `{name}`")
-            aliases.append(name)
 
-        self.names = json.dumps({"json": aliases})  # serialize
         self.upsert()
 
+    def upsert(self) -> None:
+        """Update or Insert this row into the table, and index aliases if banned."""
+
+        super().upsert()
+        known_steamids().add(self.steamid)
+        if self.is_banned:
+            add_banned_aliases(self.steamid, self.aliases)
+
     @property
     def aliases(self) -> list[str]:
         """Return list of names used by this account."""
 
-        ret: list[str] = json.loads(self.names).get("json", []) if self.names else []
-        return ret
+        return [x.name for x in PlayerAlias.fetch_steamid(self.steamid)]
 
     def strftime(self, seconds: int | None = None) -> str:
         """Return time formatted as a string."""
@@ -234,3 +245,33 @@ class Player(DatabaseTable):
         player.setattrs(attrs)
         player.track_appearance(name)
         return player
+
+
+# Steamids of all `Player`s; loaded on first use.
+_KNOWN_STEAMIDS: SteamidSet | None = None
+
+
+def known_steamids() -> SteamidSet:
+    """Return steamids of all `Player`s, loading them if not loaded."""
+
+    global _KNOWN_STEAMIDS  # pylint: disable=global-statement
+
+    if _KNOWN_STEAMIDS is None:
+        db = Database()
+        assert db
+
+        db.execute(f"select steamid from {Player.__tablename__}")
+        _KNOWN_STEAMIDS = SteamidSet(x for (x,) in db)
+        logger.info(
+            f"Loaded {len(_KNOWN_STEAMIDS)} steamids of players"
+            f" ({_KNOWN_STEAMIDS.nbytes} bytes)"
+        )
+
+    return _KNOWN_STEAMIDS
+
+
+def forget_known_steamids() -> None:
+    """Discard the steamids, to be reloaded on next use; e.g., after a bulk import."""
+
+    global _KNOWN_STEAMIDS  # pylint: disable=global-statement
+    _KNOWN_STEAMIDS = None
@@ -0,0 +1,181 @@
+"""Table of `PlayerAlias`es; the names used by `Player`s."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from loguru import logger
+
+from tf2mon.database import Database, DatabaseTable
+from tf2mon.nameindex import NameIndex
+
+
+@dataclass
+class PlayerAlias(DatabaseTable):
+    """A name used by a `Player`."""
+
+    __tablename__ = "player_aliases"
+
+    # database columns
+    steamid: int  # primary key, with name
+    name: str
+    first_seen: str = ""
+    last_seen: str = ""
+
+    @classmethod
+    def create_table(cls) -> None:
+        """Execute create table statement, and migrate aliases from `players.names`."""
+
+        db = Database()
+        assert db
+
+        db.execute(
+            "select name from sqlite_master where type='table' and name=?", (cls.__tablename__,)
+        )
+        exists = db.fetchone() is not None
+
+        db.execute(
+            f"create table if not exists {cls.__tablename__}" """(
+                steamid integer,
+                name text,
+                first_seen text,
+                last_seen text,
+                primary key (steamid, name)
+            )""",
+        )
+        db.execute(
+            f"create index if not exists {cls.__tablename__}_name"
+            f" on {cls.__tablename__}(name)"
+        )
+
+        if not exists:
+            cls._migrate()
+        db.connection.commit()
+
+    @classmethod
+    def _migrate(cls) -> None:
+        """Copy aliases from the json `players.names` column, and last names."""
+
+        db = Database()
+        assert db
+
+        db.execute("select name from sqlite_master where type='table' and name='players'")
+        if not db.fetchone():
+            return
+
+        db.execute(f"insert or ignore into {cls.__tablename__}" """
+            select players.steamid, names.value, s_last_time, s_last_time
+            from players, json_each(players.names, '$.json') as names
+            where json_valid(players.names) and names.value != ''
+            union all
+            select steamid, last_name, s_last_time, s_last_time
+            from players where last_name != ''
+            union all
+            select steamid, _last_name, _s_last_time, _s_last_time
+            from players where _last_name != ''
+            """)
+        logger.info(f"Migrated {db.rowcount} aliases to `{cls.__tablename__}`")
+
+    @classmethod
+    def track(cls, steamid: int, name: str, when: str) -> bool:
+        """Record `steamid` using `name` at time `when`; return True if new alias."""
+
+        db = Database()
+        assert db
+
+        db.execute(
+            f"insert or ignore into {cls.__tablename__} values(?,?,?,?)",
+            (steamid, name, when, when),
+        )
+        if not (is_new := db.rowcount == 1):
+            db.execute(
+                f"update {cls.__tablename__} set last_seen=? where steamid=? and name=?",
+                (when, steamid, name),
+            )
+        db.connection.commit()
+        return is_new
+
+    @classmethod
+    def fetch_steamid(cls, steamid: int) -> list[PlayerAlias]:
+        """Return aliases of `steamid`, in order first recorded."""
+
+        db = Database()
+        assert db
+
+        db.execute(
+            f"select * from {cls.__tablename__} where steamid=? order by rowid", (steamid,)
+        )
+        return [cls(*tuple(row)) for row in db.fetchall()]
+
+    @classmethod
+    def fetch_name(cls, name: str) -> list[PlayerAlias]:
+        """Return every player's use of exactly `name`."""
+
+        db = Database()
+        assert db
+
+        db.execute(f"select * from {cls.__tablename__} where name=?", (name,))
+        return [cls(*tuple(row)) for row in db.fetchall()]
+
+
+# Aliases of banned players, keyed by (steamid, name); loaded on first use.
+_BANNED_ALIASES: NameIndex[tuple[int, str]] | None = None
+
+# Columns of `players` that make a player banned; see `Player.is_banned`.
+_BANNED_COLUMNS = (
+    "racist",
+    "_racist",
+    "cheater",
+    "_cheater",
+    "exploiter",
+    "_exploiter",
+    "bot",
+    "friends",
+    "tacobot",
+)
+
+
+def _load_banned_aliases() -> NameIndex[tuple[int, str]]:
+    """Load aliases of banned players into an index."""
+
+    global _BANNED_ALIASES  # pylint: disable=global-statement
+
+    db = Database()
+    assert db
+
+    _BANNED_ALIASES = NameIndex()
+    banned = " or ".join(f"players.{x} != ''" for x in _BANNED_COLUMNS)
+    db.execute(
+        f"select aliases.steamid, aliases.name from {PlayerAlias.__tablename__} as aliases"
+        f" join players on players.steamid = aliases.steamid where {banned}"
+    )
+    for steamid, name in db.fetchall():
+        _BANNED_ALIASES.add((steamid, name), name)
+
+    logger.info(f"Loaded {len(_BANNED_ALIASES)} aliases of banned players")
+    return _BANNED_ALIASES
+
+
+def forget_banned_aliases() -> None:
+    """Discard the index, to be reloaded on next use; e.g., after a bulk import."""
+
+    global _BANNED_ALIASES  # pylint: disable=global-statement
+    _BANNED_ALIASES = None
+
+
+def add_banned_aliases(steamid: int, names: list[str]) -> None:
+    """Add `names` of banned player `steamid` to the index, if loaded."""
+
+    if _BANNED_ALIASES is not None:
+        for name in names:
+            _BANNED_ALIASES.add((steamid, name), name)
+
+
+def search_banned_aliases(name: str, threshold: int = 90) -> list[tuple[int, str, int]]:
+    """Return `(steamid, alias, ratio)` of banned players' aliases similar to `name`."""
+
+    if not Database():
+        return []
+
+    index = _BANNED_ALIASES if _BANNED_ALIASES is not None else _load_banned_aliases()
+    return [(steamid, alias, ratio) for (steamid, alias), ratio in index.search(name, threshold)]
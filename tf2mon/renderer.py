@@ -0,0 +1,150 @@
+"""Renderers; what the game displays, and how."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+import tf2mon
+
+if TYPE_CHECKING:
+    from tf2mon.chat import Chat
+    from tf2mon.player import Player
+    from tf2mon.user import User
+
+
+class Renderer:
+    """What the game (events, users and controls) displays.
+
+    This base class displays nothing; `UI` renders to curses, and
+    `HeadlessRenderer` to the log and a final summary.
+    """
+
+    notify_operator = False
+    sound_alarm = False
+
+    def update_display(self) -> None:
+        """Update display."""
+
+    def show_status(self) -> None:
+        """Update status line."""
+
+    def show_progress(self) -> None:
+        """Display status line now; while fast-forwarding, nothing else is."""
+
+    def refresh_kicks(self) -> None:
+        """Display kicks queue."""
+
+    def refresh_spams(self) -> None:
+        """Display spams queue."""
+
+    def show_chat(self, chat: Chat) -> None:
+        """Display `chat`."""
+
+    def show_journal(self, level: str, line: str) -> None:
+        """Display `line` in some pseudo "journal" window."""
+
+    def popup(self, level: str, text: str) -> None:
+        """Display `text` in a popup window."""
+
+    def user_color(self, user: User, color: int) -> int:
+        """Return `color` to display `user`."""
+
+        return color
+
+    def getline(self, prompt: str | None = None) -> str | None:
+        """Read and return next line from keyboard; None at end of file."""
+
+        return None
+
+    def show_player_intel(self, player: Player) -> None:
+        """Display what we know about `player`."""
+
+        level = player.display_level
+        leader = f"{level}: {player.steamid}"
+
+        self.show_journal(
+            level,
+            f"{leader}: name: `{player.last_name}`",
+        )
+
+        for alias in [x for x in player.aliases if x != player.last_name]:
+            self.show_journal(
+                level,
+                f"{leader}: alias: `{alias}`",
+            )
+
+        self.show_journal(
+            level,
+            # pylint: disable=protected-access
+            f"{leader}: prev={player.s_prev_time} {player._s_prev_time}",
+        )
+
+        self.show_journal(
+            level,
+            f"{leader}: attrs={[x for x in player.getattrs() if x]}",
+        )
+
+
+class HeadlessRenderer(Renderer):
+    """Render to the log only, and summarize the game at the end (`--headless`)."""
+
+    def show_journal(self, level: str, line: str) -> None:
+        """Log `line`."""
+
+        logger.log(level, line)
+
+    @staticmethod
+    def summary() -> dict[str, Any]:
+        """Return summary of the game; its users, kills and flagged players."""
+
+        users = tf2mon.users
+        _users = []
+        for user in users.users_by_handle:
+            team = users.teams.team(user.handle)
+            _users.append(
+                {
+                    "username": user.username,
+                    "userid": user.userid,
+                    "steamid": user.steamid,
+                    "team": team.name if team else None,
+                    "level": user.display_level,
+                    "kills": user.nkills,
+                    "deaths": user.ndeaths,
+                    "kdratio": round(user.kdratio, 2),
+                }
+            )
+
+        assert tf2mon.conlog
+        return {
+            "lines": tf2mon.conlog.lineno,
+            "kills": len(users.kills),
+            "users": _users,
+            "flagged": [x for x in _users if x["level"] not in ("", "user")],
+            "kicks": list(tf2mon.KicksControl.msgs),
+            "spams": list(tf2mon.SpamsControl.msgs),
+        }
+
+    def print_summary(self, as_json: bool = False) -> None:
+        """Print summary of the game, as text or json."""
+
+        summary = self.summary()
+        if as_json:
+            print(json.dumps(summary, indent=4))
+            return
+
+        print(f"{summary['lines']} lines, {summary['kills']} kills")
+        print(f"{'username':25} {'steamid':>17} {'team':4} {'K':>4} {'D':>4} {'KD':>6} level")
+        for user in sorted(summary["users"], key=lambda x: (-x["kills"], x["username"])):
+            print(
+                f"{user['username']:25.25} {user['steamid'] or '':>17} {user['team'] or '':4}"
+                f" {user['kills']:4} {user['deaths']:4} {user['kdratio']:6.2f} {user['level']}"
+            )
+        for user in summary["flagged"]:
+            print(f"flagged {user['level']}: {user['username']!r} {user['steamid'] or ''}")
+        for msg in summary["kicks"]:
+            print(f"kicks: {msg}")
+        for msg in summary["spams"]:
+            print(f"spams: {msg}")
@@ -1,19 +1,32 @@
 """Role (job, function, position) of `User`."""
 
 import csv
+from collections import Counter
 from enum import Enum
 from pathlib import Path
-from typing import Tuple
+from typing import NewType, Tuple
 
 from loguru import logger
 
 Role = Enum("Role", "scout soldier pyro demo heavy engineer medic sniper spy unknown")
 
+# Interned (role, weapon, crit, perk) combination; see `weapon_state_name`.
+WeaponState = NewType("WeaponState", int)
+
 _ROLE_BY_WEAPON: dict[str, Role] = {}
 
+# Registry of weapon states. Mapped weapons are keyed by (weapon, crit, perk),
+# unmapped weapons by (weapon, crit, perk, role), as their role is a guess.
+_WEAPON_STATE_BY_KEY: dict[tuple[str, bool, str] | tuple[str, bool, str, Role], WeaponState] = {}
+_WEAPON_STATE_ROLES: list[Role] = []
+_WEAPON_STATE_NAMES: list[str] = []
+
+# Number of kills by weapons not in `weapons.csv`.
+UNMAPPED_WEAPONS: Counter[str] = Counter()
+
 
 def load_weapons_data(path: Path) -> None:
-    """Load weapons data from `path`."""
+    """Load weapons data from `path`, and register their weapon states."""
 
     global _ROLE_BY_WEAPON  # pylint: disable=global-statement
 
@@ -23,21 +36,29 @@ def load_weapons_data(path: Path) -> None:
             weapon: Role.__dict__[role_name] for role_name, weapon in csv.reader(_f)
         }
 
+    _WEAPON_STATE_BY_KEY.clear()
+    _WEAPON_STATE_ROLES.clear()
+    _WEAPON_STATE_NAMES.clear()
+    UNMAPPED_WEAPONS.clear()
 
-def get_role_weapon_state(
-    default_role: Role, weapon: str, crit: bool, perk: str
-) -> Tuple[Role, str]:
-    """Return role and hashable key for given weapon_state.
+    for weapon, role in _ROLE_BY_WEAPON.items():
+        for crit in (False, True):
+            _register((weapon, crit, ""), role, weapon, crit, "")
 
-    Also used as the formatted display value by scoreboard.
-    """
 
-    role = _ROLE_BY_WEAPON.get(weapon, default_role)
+def _register(
+    key: tuple[str, bool, str] | tuple[str, bool, str, Role],
+    role: Role,
+    weapon: str,
+    crit: bool,
+    perk: str,
+) -> WeaponState:
+    """Register and return new weapon state."""
 
     s_crit = "+crit" if crit else ""
     s_perk = "+" + perk if perk else ""
 
-    weapon_state = " ".join(
+    name = " ".join(
         [
             f"{role.name:8}",  # 8=len("engineer")
             f"{s_crit:5}",  # 5=len("+crit")
@@ -46,4 +67,43 @@ def get_role_weapon_state(
         ]
     ).rstrip()
 
-    return role, weapon_state
+    state = _WEAPON_STATE_BY_KEY[key] = WeaponState(len(_WEAPON_STATE_NAMES))
+    _WEAPON_STATE_ROLES.append(role)
+    _WEAPON_STATE_NAMES.append(name)
+    return state
+
+
+def get_role_weapon_state(
+    default_role: Role, weapon: str, crit: bool, perk: str
+) -> Tuple[Role, WeaponState]:
+    """Return role and interned weapon state for given weapon, crit and perk.
+
+    Weapons not in `weapons.csv` are assumed to be used by `default_role`,
+    and are counted in `UNMAPPED_WEAPONS`; except "player" and "world".
+    """
+
+    if (state := _WEAPON_STATE_BY_KEY.get((weapon, crit, perk))) is not None:
+        return _WEAPON_STATE_ROLES[state], state
+
+    if (role := _ROLE_BY_WEAPON.get(weapon)) is not None:
+        # mapped weapon, with a perk.
+        return role, _register((weapon, crit, perk), role, weapon, crit, perk)
+
+    if weapon not in ("player", "world"):  # not weapons; e.g., suicides, falls.
+        UNMAPPED_WEAPONS[weapon] += 1
+        if UNMAPPED_WEAPONS[weapon] == 1:
+            logger.error(f"cannot map {weapon} for {default_role}")
+
+    if (state := _WEAPON_STATE_BY_KEY.get((weapon, crit, perk, default_role))) is None:
+        state = _register((weapon, crit, perk, default_role), default_role, weapon, crit, perk)
+
+    return default_role, state
+
+
+def weapon_state_name(state: WeaponState) -> str:
+    """Return formatted display value of weapon `state`.
+
+    Also used by scoreboard.
+    """
+
+    return _WEAPON_STATE_NAMES[state]
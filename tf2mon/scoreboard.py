@@ -6,6 +6,7 @@ import libcurses
 
 import tf2mon
 from tf2mon.player import Player
+from tf2mon.steamid import accountid
 from tf2mon.texttable import TextColumn, TextTable
 from tf2mon.user import Team, User
 
@@ -77,14 +78,14 @@ class Scoreboard:
 
         libcurses.clear_mouse_handlers()
 
-        users = list(tf2mon.users.sorted())
-        team1 = [x for x in users if x.team == Team.BLU]
-        team2 = [x for x in users if x.team == Team.RED]
+        key = tf2mon.SortOrderControl.value
+        team1 = sorted(tf2mon.users.team_users(Team.BLU), key=key)
+        team2 = sorted(tf2mon.users.team_users(Team.RED), key=key)
 
         # Fill in whatever space is left on the scoreboards with users
         # whose team is unknown; doesn't matter which side they're
         # displayed on.
-        unassigned = [x for x in users if not x.team]
+        unassigned = sorted(tf2mon.users.team_users(None), key=key)
         nusers = self.win1.getmaxyx()[0] - 1
         while len(team1) < nusers and len(unassigned) > 0:
             team1.append(unassigned.pop(0))
@@ -132,7 +133,7 @@ class Scoreboard:
 
                 _steam_id = 0
                 if user.steamid:
-                    _steam_id = user.steamid.id
+                    _steam_id = accountid(user.steamid)
 
                 _personastate = ""
                 if _sp and _sp.personastate:
@@ -1,25 +1,72 @@
-"""Docstring."""
+"""Steam ids.
+
+Steamids are held as plain 64-bit `int`s; a `SteamID` is materialized
+only when needed for display. Database tables are keyed by `accountid`.
+"""
+
+import functools
+import re
 
 from loguru import logger
 from steam.steamid import SteamID  # type: ignore[import-untyped]
 
-__all__ = ["SteamID"]
+__all__ = [
+    "BOT_STEAMID",
+    "SteamID",
+    "accountid",
+    "community_url",
+    "parse_steamid",
+    "steamid64",
+]
+
+BOT_STEAMID: int = SteamID(1).as_64
+
+# 64-bit id of account 0 of the individual type in the public universe.
+_INDIVIDUAL = 76561197960265728
+
+# `[U:1:N]`; an individual account in the public universe.
+_STEAM3 = re.compile(r"\[U:1:([1-9][0-9]{0,9})\]")
 
-BOT_STEAMID = SteamID(1)
 
+def steamid64(value: str | int | None) -> int | None:
+    """Return 64-bit id of steamid `value`, in any form `SteamID` takes, else None if invalid."""
+
+    if isinstance(value, str) and (match := _STEAM3.fullmatch(value)):
+        if (account := int(match[1])) < 1 << 32:
+            return _INDIVIDUAL + account
+        return None
+
+    try:
+        steamid = SteamID(value)
+    except (TypeError, ValueError):
+        return None
+    return steamid.as_64 if steamid.is_valid() else None
 
-def parse_steamid(s_steamid: str) -> SteamID:
-    """Parse and return `SteamID` from STATUS and LOBBY lines.
 
-    Return `None` if invalid, or `BOT_STEAMID` if gamebot.
+@functools.lru_cache(maxsize=1024)
+def parse_steamid(s_steamid: str) -> int | None:
+    """Parse and return 64-bit steamid from STATUS and LOBBY lines.
+
+    Return `None` if invalid, or `BOT_STEAMID` if gamebot. The same few
+    dozen steamids repeat on every `status`, so results are cached.
     """
 
     if s_steamid == "BOT":
         return BOT_STEAMID
 
-    steamid = SteamID(s_steamid)
-    if not steamid.is_valid():
+    if not (steamid := steamid64(s_steamid)):
         logger.error(f"invalid steamid {s_steamid}")
-        return None
 
     return steamid
+
+
+def accountid(steamid: int) -> int:
+    """Return account number (`SteamID.id`) of 64-bit `steamid`."""
+
+    return steamid & 0xFFFFFFFF
+
+
+def community_url(account: int) -> str:
+    """Return profile url of individual account number `account`."""
+
+    return f"https://steamcommunity.com/profiles/{_INDIVIDUAL + account}"
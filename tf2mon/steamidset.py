@@ -0,0 +1,47 @@
+"""Compact set of steamids."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+
+class SteamidSet:
+    """Compact set of steamids, held as a sorted `array` of 64-bit ints.
+
+    Costs 8 bytes per steamid (8MB per million), against ~60 for a `set`
+    of `int`s; membership is a binary search. Adding is a `memmove` of
+    the tail of the array, which is fine for the occasional kick; build
+    a new set for bulk changes.
+    """
+
+    def __init__(self, steamids: Iterable[int] = ()) -> None:
+        """Create set of `steamids`."""
+
+        self._steamids = array("q", sorted(set(steamids)))
+
+    def __len__(self) -> int:
+        return len(self._steamids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._steamids)
+
+    def __contains__(self, steamid: object) -> bool:
+        if not isinstance(steamid, int):
+            return False
+        i = bisect_left(self._steamids, steamid)
+        return i < len(self._steamids) and self._steamids[i] == steamid
+
+    def add(self, steamid: int) -> None:
+        """Add `steamid` to set."""
+
+        i = bisect_left(self._steamids, steamid)
+        if i == len(self._steamids) or self._steamids[i] != steamid:
+            self._steamids.insert(i, steamid)
+
+    @property
+    def nbytes(self) -> int:
+        """Return number of bytes used by the steamids."""
+
+        return self._steamids.buffer_info()[1] * self._steamids.itemsize
@@ -6,7 +6,7 @@ import time
 from dataclasses import dataclass
 
 from tf2mon.database import Database, DatabaseTable
-from tf2mon.steamid import BOT_STEAMID, SteamID
+from tf2mon.steamid import BOT_STEAMID, accountid, community_url
 
 
 @dataclass
@@ -31,8 +31,7 @@ class SteamPlayer(DatabaseTable):
 
     def __post_init__(self) -> None:
 
-        steamid = SteamID(self.steamid)
-        if self.profileurl and self.profileurl == steamid.community_url + "/":
+        if self.profileurl and self.profileurl == community_url(self.steamid) + "/":
             # for asthetics only; to avoid clutter
             self.profileurl = ""  # indicate long noisy determinable value
 
@@ -83,4 +82,4 @@ class SteamPlayer(DatabaseTable):
     def is_gamebot(self) -> bool:
         """Return True if this is a legitimate game BOT; not a hacker."""
 
-        return self.steamid == BOT_STEAMID.id  # type: ignore[no-any-return]
+        return self.steamid == accountid(BOT_STEAMID)
@@ -2,11 +2,11 @@
 
 import time
 
-import steam.webapi  # type: ignore
 from loguru import logger
 
-from tf2mon.steamid import BOT_STEAMID, SteamID
+from tf2mon.steamid import BOT_STEAMID, SteamID, accountid
 from tf2mon.steamplayer import SteamPlayer
+from tf2mon.transport import Transport
 
 MAX_AGE = 2 * 60 * 60
 
@@ -20,10 +20,9 @@ class SteamWebAPI:
     def __init__(self, webapi_key: str):
         """Initialize interface."""
 
-        if webapi_key:
-            self._webapi = steam.webapi.WebAPI(key=webapi_key)
-        else:
-            self._webapi = None
+        self._webapi_key = webapi_key
+        self.transport = Transport()
+        if not webapi_key:
             logger.warning("Running without `webapi_key`")
 
         self._nbots = 0
@@ -37,7 +36,7 @@ class SteamWebAPI:
 
         now = int(time.time())
 
-        if steamid == BOT_STEAMID.id:
+        if steamid == accountid(BOT_STEAMID):
             # create a dummy steamid for this bot; (not a hacker, a real game bot)
             self._nbots += 1
             return SteamPlayer(
@@ -90,11 +89,21 @@ class SteamWebAPI:
 
     def _get_player_summaries(self, steamids: list[SteamID]) -> list[dict[str, str]]:
 
-        if not self._webapi:
+        if not self._webapi_key:
             return []
 
-        jdoc = self._webapi.call(
-            "ISteamUser.GetPlayerSummaries", steamids=",".join([str(x.as_64) for x in steamids])
+        jdoc = self.transport.get(
+            "ISteamUser/GetPlayerSummaries/v2",
+            {
+                "key": self._webapi_key,
+                "steamids": ",".join([str(x.as_64) for x in steamids]),
+            },
         )
+        if not jdoc:
+            return []
 
-        return list(jdoc["response"]["players"])
+        try:
+            return list(jdoc["response"]["players"])
+        except (KeyError, TypeError) as err:
+            logger.warning(f"GetPlayerSummaries: unexpected response {jdoc!r}: {err!r}")
+            return []
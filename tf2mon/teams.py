@@ -0,0 +1,164 @@
+"""Infer users' teams from what is known of some and how they relate."""
+
+from __future__ import annotations
+
+from array import array
+
+from tf2mon.user import Team, UserHandle
+
+# team by bit, and bit by team.
+_TEAMS = (Team.BLU, Team.RED)
+_BITS = {Team.BLU: 0, Team.RED: 1}
+
+_NO_NODE = 0xFFFFFFFF
+
+
+class TeamInference:
+    """Infer users' teams from "same team" and "opposite team" constraints.
+
+    Users are nodes of a union-find forest, and each node records whether
+    it is on the same team as its parent (parity 0) or the opposite team
+    (parity 1). Constraints (team chats, kills) merge components; a team
+    learned for any member (lobby, captures) is recorded at the root, so
+    the whole component resolves at once without visiting its members.
+    Components are merged smaller into larger, with path compression, so
+    work is near-linear in the number of constraints, and never recursive.
+
+    A user found on a team contradicting their component (changed teams)
+    is moved to a new node of their own; the constraints they were part of
+    remain with the rest of the component.
+
+    "Teams have been switched" flips every component with one bit.
+    """
+
+    def __init__(self) -> None:
+        """Create empty forest."""
+
+        self._parent = array("I")  # parent by node.
+        self._parity = array("B")  # parity with parent by node.
+        self._handle = array("I")  # user by node.
+        self._node = array("I")  # current node by user.
+        self._team: dict[int, int] = {}  # bit of team of root, by root.
+        self._members: dict[int, list[int]] = {}  # nodes by root.
+        self._switched = 0
+
+    def _add_node(self, handle: UserHandle) -> int:
+        """Return new node for `handle`, in a component of its own."""
+
+        node = len(self._parent)
+        self._parent.append(node)
+        self._parity.append(0)
+        self._handle.append(handle)
+        self._members[node] = [node]
+
+        while len(self._node) <= handle:
+            self._node.append(_NO_NODE)
+        self._node[handle] = node
+        return node
+
+    def _find(self, handle: UserHandle) -> tuple[int, int]:
+        """Return root of `handle`'s component, and parity with it."""
+
+        if handle >= len(self._node) or (node := self._node[handle]) >= len(self._parent):
+            node = self._add_node(handle)
+
+        parent, parity = self._parent, self._parity
+        path = []
+        while parent[node] != node:
+            path.append(node)
+            node = parent[node]
+
+        # path compression; nearest the root first.
+        bit = 0
+        for x in reversed(path):
+            bit ^= parity[x]
+            parity[x] = bit
+            parent[x] = node
+
+        return node, parity[path[0]] if path else 0
+
+    def _resolved(self, root: int) -> list[UserHandle]:
+        """Return users in component `root`."""
+
+        return [
+            UserHandle(self._handle[x])
+            for x in self._members[root]
+            if self._node[self._handle[x]] == x  # ignore users since moved.
+        ]
+
+    def team(self, handle: UserHandle) -> Team | None:
+        """Return team of `handle`, if known."""
+
+        root, parity = self._find(handle)
+        if (bit := self._team.get(root)) is None:
+            return None
+        return _TEAMS[bit ^ parity ^ self._switched]
+
+    def assign(self, handle: UserHandle, team: Team) -> list[UserHandle]:
+        """Record that `handle` is on `team`; return users whose team this changes."""
+
+        root, parity = self._find(handle)
+        bit = _BITS[team] ^ self._switched ^ parity
+
+        if (known := self._team.get(root)) is None:
+            self._team[root] = bit
+            return self._resolved(root)
+
+        if known == bit:
+            return []
+
+        # changed teams; leave the component.
+        node = self._add_node(handle)
+        self._team[node] = _BITS[team] ^ self._switched
+        return [handle]
+
+    def same(self, a: UserHandle, b: UserHandle) -> list[UserHandle]:
+        """Record that `a` and `b` are on the same team; return users whose team this resolves."""
+
+        return self._union(a, b, 0)
+
+    def opposite(self, a: UserHandle, b: UserHandle) -> list[UserHandle]:
+        """Record that `a` and `b` are on opposite teams; return users whose team this resolves."""
+
+        return self._union(a, b, 1)
+
+    def _union(self, a: UserHandle, b: UserHandle, relation: int) -> list[UserHandle]:
+
+        root_a, parity_a = self._find(a)
+        root_b, parity_b = self._find(b)
+        if root_a == root_b:
+            return []  # already related; contradictions are ignored.
+
+        team_a = self._team.get(root_a)
+        team_b = self._team.get(root_b)
+        if (
+            team_a is not None
+            and team_b is not None
+            and team_a ^ parity_a ^ team_b ^ parity_b != relation
+        ):
+            return []  # contradicts what is known; ignore.
+
+        if len(self._members[root_a]) < len(self._members[root_b]):
+            root_a, root_b = root_b, root_a
+            team_a, team_b = team_b, team_a
+
+        # attach b's root to a's root.
+        parity = relation ^ parity_a ^ parity_b
+        self._parent[root_b] = root_a
+        self._parity[root_b] = parity
+
+        resolved = []
+        if team_a is None and team_b is not None:
+            self._team[root_a] = team_b ^ parity
+            resolved = self._resolved(root_a)
+        elif team_a is not None and team_b is None:
+            resolved = self._resolved(root_b)
+
+        self._team.pop(root_b, None)
+        self._members[root_a].extend(self._members.pop(root_b))
+        return resolved
+
+    def switch(self) -> None:
+        """Switch the teams of all users."""
+
+        self._switched ^= 1
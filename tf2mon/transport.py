@@ -0,0 +1,239 @@
+"""HTTP transport for calls to the Steam Web API.
+
+Calls are made from the game thread, so every call must be bounded in
+time: keep-alive sessions avoid a TLS handshake per call, timeouts, a
+small retry budget and a deadline bound each call, and a client-side
+token bucket keeps us under Steam's daily quota and fails fast instead
+of queueing.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from collections import Counter
+from typing import Any, Callable
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+APIHOST = "https://api.steampowered.com"
+
+# Steam allows 100,000 calls per key per day.
+DAILY_QUOTA = 100_000
+
+
+class TokenBucket:
+    """Client-side rate limiter; never blocks."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Refill at `rate` tokens per second, holding at most `capacity` tokens."""
+
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._last = clock()
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take `tokens` and return True if available, else return False."""
+
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+        if self._tokens < tokens:
+            return False
+        self._tokens -= tokens
+        return True
+
+
+class LatencyHistogram:
+    """Counts of call latencies in power-of-2 millisecond buckets."""
+
+    bounds_ms = (25, 50, 100, 200, 400, 800, 1600, 3200, 6400)
+
+    def __init__(self) -> None:
+        """Create empty histogram."""
+
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.ncalls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Record a call that took `seconds`."""
+
+        msecs = seconds * 1000
+        i = 0
+        while i < len(self.bounds_ms) and msecs > self.bounds_ms[i]:
+            i += 1
+        self.counts[i] += 1
+        self.ncalls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def __str__(self) -> str:
+
+        if not self.ncalls:
+            return "n=0"
+
+        buckets = [
+            f"<={bound}ms:{count}" for bound, count in zip(self.bounds_ms, self.counts) if count
+        ]
+        if self.counts[-1]:
+            buckets.append(f">{self.bounds_ms[-1]}ms:{self.counts[-1]}")
+
+        avg = self.total / self.ncalls * 1000
+        return f"n={self.ncalls} avg={avg:.0f}ms max={self.max * 1000:.0f}ms " + " ".join(
+            buckets
+        )
+
+
+class Transport:
+    """Pooled keep-alive HTTP session with timeouts, rate limiting and retries."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    retry_statuses = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        apihost: str = APIHOST,
+        timeout: tuple[float, float] = (3.05, 10),
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 4,
+        deadline: float = 10,
+        daily_quota: int = DAILY_QUOTA,
+        burst: int = 10,
+    ) -> None:
+        """Create transport to `apihost`.
+
+        Args:
+            apihost:        scheme and host of the web service.
+            timeout:        (connect, read) timeouts, in seconds.
+            max_attempts:   retry budget per call, including the first attempt.
+            backoff:        base of exponential backoff between attempts, in seconds.
+            max_backoff:    cap on any one backoff, and on honoring `Retry-After`.
+            deadline:       total time allowed per call, including retries, in seconds.
+            daily_quota:    calls allowed per day; sets the limiter's refill rate.
+            burst:          calls allowed back-to-back before the limiter engages.
+        """
+
+        self.apihost = apihost
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.limiter = TokenBucket(daily_quota / 86400, burst)
+        self.latencies: dict[str, LatencyHistogram] = {}
+        self.errors: Counter[str] = Counter()
+        self._cooldown_until = 0.0
+        self._clock: Callable[[], float] = time.monotonic
+        self._sleep: Callable[[float], None] = time.sleep
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+
+    def get(self, endpoint: str, params: dict[str, Any]) -> Any | None:
+        """Call `endpoint` and return its decoded json document, else None on failure.
+
+        Failures are logged and counted, never raised; callers treat
+        None the same as "not found".
+        """
+
+        if self._clock() < self._cooldown_until:
+            self.errors[f"{endpoint} cooldown"] += 1
+            return None
+
+        if not self.limiter.try_acquire():
+            self.errors[f"{endpoint} ratelimited"] += 1
+            logger.warning(f"{endpoint} rate limited")
+            return None
+
+        url = f"{self.apihost}/{endpoint}/"
+        histogram = self.latencies.setdefault(endpoint, LatencyHistogram())
+        deadline = self._clock() + self.deadline
+
+        for attempt in range(self.max_attempts):
+            retry_after = None
+            start = self._clock()
+            # neither timeout may run past the deadline.
+            timeout = (
+                min(self.timeout[0], deadline - start),
+                min(self.timeout[1], deadline - start),
+            )
+            try:
+                response = self.session.get(url, params=params, timeout=timeout)
+            except requests.RequestException as err:
+                histogram.add(self._clock() - start)
+                self.errors[f"{endpoint} {err.__class__.__name__}"] += 1
+                logger.warning(f"{endpoint} attempt {attempt + 1}: {err}")
+            else:
+                histogram.add(self._clock() - start)
+                if response.status_code == 200:
+                    try:
+                        return response.json()
+                    except ValueError as err:
+                        self.errors[f"{endpoint} {err.__class__.__name__}"] += 1
+                        logger.warning(f"{endpoint} attempt {attempt + 1}: {err}")
+                        return None
+                self.errors[f"{endpoint} {response.status_code}"] += 1
+                logger.warning(f"{endpoint} attempt {attempt + 1}: {response.status_code}")
+                if response.status_code not in self.retry_statuses:
+                    return None
+                if response.status_code == 429:
+                    retry_after = self._retry_after(response)
+                    if retry_after is None:
+                        return None  # longer than we're willing to wait
+
+            if attempt + 1 < self.max_attempts:
+                delay = retry_after if retry_after is not None else self._jitter(attempt)
+                if self._clock() + delay >= deadline:
+                    self.errors[f"{endpoint} deadline"] += 1
+                    logger.warning(f"{endpoint} attempt {attempt + 1}: deadline")
+                    return None
+                self._sleep(delay)
+
+        return None
+
+    def _jitter(self, attempt: int) -> float:
+        """Return "full jitter" exponential backoff for `attempt`."""
+
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def _retry_after(self, response: requests.Response) -> float | None:
+        """Return seconds to wait before retrying a 429, else None to give up.
+
+        When the server asks us to wait longer than `max_backoff`, stop
+        calling it altogether until then.
+        """
+
+        try:
+            seconds = float(response.headers.get("Retry-After", self.backoff))
+        except ValueError:
+            seconds = self.backoff
+
+        if seconds > self.max_backoff:
+            self._cooldown_until = self._clock() + seconds
+            logger.warning(f"cooling down for {seconds} seconds")
+            return None
+        return seconds
+
+    def report(self) -> list[str]:
+        """Return lines reporting latencies and errors by endpoint."""
+
+        lines = [f"{endpoint}: {hist}" for endpoint, hist in self.latencies.items()]
+        lines.extend(f"{key}: {count} errors" for key, count in self.errors.items())
+        return lines
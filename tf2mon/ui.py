@@ -12,15 +12,17 @@ from loguru import logger
 import tf2mon
 from tf2mon.baselayout import BaseLayout
 from tf2mon.chat import Chat
-from tf2mon.player import Player
+from tf2mon.logsink import LogSink
+from tf2mon.renderer import Renderer
+from tf2mon.role import weapon_state_name
 from tf2mon.scoreboard import Scoreboard
 from tf2mon.user import Team, User
 
 # from playsound import playsound
 
 
-class UI:
-    """User Interface."""
+class UI(Renderer):
+    """User Interface; renders to curses."""
 
     # pylint: disable=too-many-instance-attributes
 
@@ -34,7 +36,7 @@ class UI:
         self.grid = libcurses.Grid(win)
 
         self.scoreboard: Scoreboard
-        self.logsink: libcurses.LogSink
+        self.logsink: LogSink
         # self.colormap: dict[str, int]
         # self.layout: BaseLayout | None = None  # set by `build_grid`.
         self.layout: BaseLayout  # set by `build_grid`.
@@ -45,7 +47,7 @@ class UI:
         # assert self.layout
 
         # begin logging to curses window, too.
-        self.logsink = libcurses.LogSink(self.layout.logger_win)
+        self.logsink = LogSink(self.layout.logger_win)
 
         # map of `loguru-level-name` to `curses-color/attr`.
         self.colormap = libcurses.get_colormap()
@@ -145,6 +147,7 @@ class UI:
         # chatwin_blu and chatwin_red are rendered from gameplay/_playerchat
         self.scoreboard.refresh()
         self.show_status()
+        self.logsink.flush()
 
         if self.popup_win:
             self.popup_win.refresh()
@@ -294,50 +297,21 @@ class UI:
         self.popup_win.w.addstr(text, self.colormap[level])
         self.popup_win.refresh()
 
-    def show_player_intel(self, player: Player) -> None:
-        """Display what we know about `player`."""
-
-        level = player.display_level
-        leader = f"{level}: {player.steamid}"
-
-        self.show_journal(
-            level,
-            f"{leader}: name: `{player.last_name}`",
-        )
-
-        for alias in [x for x in player.aliases if x != player.last_name]:
-            self.show_journal(
-                level,
-                f"{leader}: alias: `{alias}`",
-            )
-
-        self.show_journal(
-            level,
-            # pylint: disable=protected-access
-            f"{leader}: prev={player.s_prev_time} {player._s_prev_time}",
-        )
-
-        self.show_journal(
-            level,
-            f"{leader}: attrs={[x for x in player.getattrs() if x]}",
-        )
-
     def _format_duels(self, user: User) -> list[str]:
 
         lines: list[str] = []
         indent = " " * 12  # 12=len("99 and 99 vs")
 
         lines.append("Duels:")
-        for opponent in [x for x in user.opponents.values() if x.is_active]:
+        duels = tf2mon.users.duels
+        for opponent in [x for x in user.opponents if x.is_active]:
             lines.append(f"{user.duel_as_str(opponent, True)} vs {opponent.moniker}")
 
-            if opponent.key in user.nkills_by_opponent_by_weapon:
-                for weapon, count in user.nkills_by_opponent_by_weapon[opponent.key].items():
-                    lines.append(f"{indent} K {count:2} {weapon}")
+            for weapon, count in duels.weapons(user.handle, opponent.handle).items():
+                lines.append(f"{indent} K {count:2} {weapon_state_name(weapon)}")
 
-            if user.key in opponent.nkills_by_opponent_by_weapon:
-                for weapon, count in opponent.nkills_by_opponent_by_weapon[user.key].items():
-                    lines.append(f"{indent} D {count:2} {weapon}")
+            for weapon, count in duels.weapons(opponent.handle, user.handle).items():
+                lines.append(f"{indent} D {count:2} {weapon_state_name(weapon)}")
 
         return lines
 
@@ -345,6 +319,8 @@ class UI:
         """Update status line."""
 
         line = tf2mon.controller.get_status_line() + f" UID={tf2mon.users.my.userid}"
+        if (stepper := tf2mon.SingleStepControl).is_fast_forward:
+            line = f"FAST-FORWARD {stepper.fast_forward_status()} " + line
 
         try:
             self.layout.status_win.addstr(
@@ -355,6 +331,12 @@ class UI:
             pass
         self.layout.status_win.noutrefresh()
 
+    def show_progress(self) -> None:
+        """Display status line now; while fast-forwarding, nothing else is."""
+
+        with libcurses.core.preserve_cursor():
+            self.show_status()
+
     def _show_lines(self, level: str, lines: list[str], win: curses.window) -> None:
 
         win.erase()
@@ -4,9 +4,10 @@ from __future__ import annotations
 
 import re
 import time
-from dataclasses import dataclass, field
+from array import array
+from dataclasses import dataclass
 from enum import Enum
-from typing import Iterator, NewType
+from typing import TYPE_CHECKING, Iterator, NewType
 
 from loguru import logger
 
@@ -14,11 +15,15 @@ import tf2mon
 from tf2mon.chat import Chat
 from tf2mon.player import Player
 from tf2mon.racist import clean_username
-from tf2mon.role import Role
+from tf2mon.role import Role, WeaponState, weapon_state_name
+from tf2mon.steamid import accountid
 from tf2mon.steamplayer import SteamPlayer
 
+if TYPE_CHECKING:
+    from tf2mon.users import Users
+
 UserKey = NewType("UserKey", str)
-WeaponState = NewType("WeaponState", str)
+UserHandle = NewType("UserHandle", int)
 
 
 class Team(Enum):
@@ -28,14 +33,14 @@ class Team(Enum):
     BLU = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class UserStats:
     """Snapshot of stats at some point in time."""
 
     # pylint: disable=too-many-instance-attributes
-    user: User | None
-    last_killer: User | None
-    last_victim: User | None
+    user: UserHandle
+    last_killer: UserHandle | None
+    last_victim: UserHandle | None
     role: Role | None
     weapon_state: WeaponState | None
     nkills: int
@@ -44,26 +49,80 @@ class UserStats:
     # timestamp: float
 
 
-@dataclass
-class Kill:
-    """A Kill."""
-
-    killer: UserStats  # snapshot of killer at time of kill
-    victim: UserStats  # snapshot of victim at time of death
-    timestamp: float = field(default=0, init=False)
+@dataclass(slots=True)
+class ArchivedUser:
+    """Lightweight record of a `User` who has left the game.
 
-    def __post_init__(self) -> None:
-        """Initialize data and other attributes."""
+    Holds what is needed to restore the user if they reconnect; see
+    `Users.archive` and `Users.restore`.
+    """
 
-        if not self.timestamp:
-            self.timestamp = time.time()
+    # pylint: disable=too-many-instance-attributes
+    handle: UserHandle
+    username: str
+    userid: int
+    steamid: int | None
+    role: Role
+    display_level: str
+    nsnipes: int
+    ncaptures: int
+    ndefenses: int
+    nkills: int
+    ndeaths: int
+    kdratio: float
+    # (killer, victim, weapon_state, count) quads; see `DuelMatrix.pop_weapons`.
+    weapons: array[int]
 
 
 class User:
-    """A user of the game."""
+    """A user of the game.
+
+    Slotted, and other users are referenced by `UserHandle`, to keep the
+    many users of a long session small, and free of reference cycles
+    between users.
+    """
 
     # pylint: disable=too-many-instance-attributes
 
+    __slots__ = (
+        "handle",
+        "_users",
+        "_username",
+        "_clean_username",
+        "username_upper",
+        "_userid",
+        "_steamid",
+        "elapsed",
+        "s_elapsed",
+        "ping",
+        "status_row",
+        "last_scoreboard_line",
+        "dirty",
+        "_n_status_checks",
+        "nsnipes",
+        "role",
+        "weapon_state",
+        "ncaptures",
+        "ndefenses",
+        "chats",
+        "display_level",
+        "selected",
+        "perk",
+        "_last_killer",
+        "_last_victim",
+        "nkills",
+        "ndeaths",
+        "kdratio",
+        "actions",
+        "steamplayer",
+        "age",
+        "player",
+        "pending_attrs",
+        "_cloner",
+        "_clonee",
+        "cheater_chat_seen",
+    )
+
     _re_cheater_chats = re.compile(
         "|".join(
             [
@@ -73,12 +132,20 @@ class User:
         )
     )
 
-    _max_status_checks = 2
+    # Number of `Users.check_status` intervals a user may go unseen.
+    _max_status_checks = 1
+
+    def __init__(self, username: str, handle: UserHandle, users: Users) -> None:
+        """Create `User`.
 
-    def __init__(self, username: str) -> None:
-        """Create `User`."""
+        `handle` is a small integer, unique and stable for the life of the
+        game, assigned by `users`; it keys all per-opponent data, which
+        `users` holds.
+        """
 
-        self.username = username.replace(";", ".")
+        self.handle = handle
+        self._users = users
+        self._username = username.replace(";", ".")  # @username.setter
         self._clean_username = clean_username(self.username)
 
         # too strict?
@@ -88,16 +155,18 @@ class User:
 
         #
         self.username_upper = username.upper()
-        self.userid = 0  # from status command
-        self.steamid = None  # from status and tf_lobby_debug commands
-        self._team: Team | None = None  # @team.setter
+        self._userid = 0  # @userid.setter; from status command
+        # @steamid.setter; from status and tf_lobby_debug commands
+        self._steamid: int | None = None
         self.elapsed: int = 0
         self.s_elapsed: str = ""
         self.ping = 0
+        # (userid, username, steamid) columns of last `status` row; see `GameStatusEvent`.
+        self.status_row: tuple[str, str, str] | None = None
         self.last_scoreboard_line = ""
         self.dirty = True
 
-        self.n_status_checks = 0
+        self._n_status_checks = 0  # @n_status_checks.setter
         self.nsnipes = 0
         self.role = Role.unknown
         self.weapon_state: WeaponState | None = None
@@ -108,26 +177,14 @@ class User:
         self.selected = False
         self.perk = ""
 
-        #
-        self.opponents: dict[UserKey, User] = {}
-        self.victims: dict[UserKey, User] = {}
-        self.killers: dict[UserKey, User] = {}
-
-        self.last_killer: User | None = None
-        self.last_victim: User | None = None
+        # @last_killer.setter, @last_victim.setter
+        self._last_killer: UserHandle | None = None
+        self._last_victim: UserHandle | None = None
 
-        self.kills: list[Kill] = []
-        self.deaths: list[Kill] = []
         self.nkills = 0
         self.ndeaths = 0
         self.kdratio: float = 0
 
-        # "by" as in "lookup by", "for each", "per".
-        self.nkills_by_opponent: dict[UserKey, int] = {}
-        self.ndeaths_by_opponent: dict[UserKey, int] = {}
-        self.kdratio_by_opponent: dict[UserKey, float] = {}
-        self.nkills_by_opponent_by_weapon: dict[UserKey, dict[WeaponState, int]] = {}
-
         # list of non-kill actions performed, like capture/defend.
         self.actions: list[str] = []
 
@@ -146,8 +203,9 @@ class User:
         # notify the operator asap to `TF2MON-PUSH` steamids to us.
         # Careful, this might be a legitimate name-change, not a cheating name-stealer.
 
-        self.cloner: User | None = None  # when this user is being cloned
-        self.clonee: User | None = None  # when this user is the name-stealing clone
+        # @cloner.setter, @clonee.setter
+        self._cloner: UserHandle | None = None  # when this user is being cloned
+        self._clonee: UserHandle | None = None  # when this user is the name-stealing clone
 
         self.cheater_chat_seen = False
 
@@ -159,17 +217,127 @@ class User:
         self.cheater_chat_seen = bool(self._re_cheater_chats.search(chat.msg))
         return self.cheater_chat_seen
 
+    def _user(self, handle: UserHandle | None) -> User | None:
+        """Return user with `handle`, or None if none or archived."""
+
+        if handle is None:
+            return None
+        user = self._users.users_by_handle[handle]
+        return user if isinstance(user, User) else None
+
+    @property
+    def last_killer(self) -> User | None:
+        """Return user who most recently killed this user."""
+        return self._user(self._last_killer)
+
+    @last_killer.setter
+    def last_killer(self, user: User | None) -> None:
+        self._last_killer = user.handle if user else None
+
+    @property
+    def last_victim(self) -> User | None:
+        """Return user most recently killed by this user."""
+        return self._user(self._last_victim)
+
+    @last_victim.setter
+    def last_victim(self, user: User | None) -> None:
+        self._last_victim = user.handle if user else None
+
+    @property
+    def cloner(self) -> User | None:
+        """Return user cloning this user's name."""
+        return self._user(self._cloner)
+
+    @cloner.setter
+    def cloner(self, user: User | None) -> None:
+        self._cloner = user.handle if user else None
+
+    @property
+    def clonee(self) -> User | None:
+        """Return user whose name this user cloned."""
+        return self._user(self._clonee)
+
+    @clonee.setter
+    def clonee(self, user: User | None) -> None:
+        self._clonee = user.handle if user else None
+
+    @property
+    def username(self) -> str:
+        """Return user's name."""
+        return self._username
+
+    @username.setter
+    def username(self, username: str) -> None:
+        """Rename user, and maintain `Users.users_by_username` and `Users.names`."""
+
+        index = self._users.users_by_username
+        if index.get(key := UserKey(self._username)) is self:
+            del index[key]
+        index.setdefault(UserKey(username), self)  # unless another user has that name.
+        self._username = username
+        if self.handle in self._users.names:
+            self._users.names.add(self.handle, username)
+
+    @property
+    def userid(self) -> int:
+        """Return user's server-assigned userid."""
+        return self._userid
+
+    @userid.setter
+    def userid(self, userid: int) -> None:
+        """Set userid, and maintain `Users.users_by_userid`."""
+
+        index = self._users.users_by_userid
+        if self._userid and index.get(self._userid) is self:
+            del index[self._userid]
+        self._userid = userid
+        if userid:
+            index[userid] = self
+
     @property
-    def key(self) -> UserKey:
-        """Return readable hashable key."""
+    def steamid(self) -> int | None:
+        """Return user's 64-bit steamid."""
+        return self._steamid
+
+    @steamid.setter
+    def steamid(self, steamid: int | None) -> None:
+        """Set steamid, and maintain `Users.users_by_steamid`."""
+
+        index = self._users.users_by_steamid
+        if self._steamid and index.get(self._steamid) is self:
+            del index[self._steamid]
+        self._steamid = steamid
+        if steamid:
+            index[steamid] = self
 
-        return UserKey(f"{self.userid}-{self._clean_username[:15]}")
+    @property
+    def n_status_checks(self) -> int:
+        """Return number of `status` checks this user has been missing from."""
+        return self._n_status_checks
+
+    @n_status_checks.setter
+    def n_status_checks(self, n_status_checks: int) -> None:
+        """Set number of missed checks, and maintain `Users` activity indexes."""
+
+        was_active = self.is_active
+        self._n_status_checks = n_status_checks
+        if was_active != self.is_active:
+            if was_active:
+                del self._users.active[self.handle]
+                del self._users.active_by_team[self.team][self.handle]
+                self._users.inactive[self.handle] = self
+                self._users.names.remove(self.handle)
+            else:
+                del self._users.inactive[self.handle]
+                self._users.active[self.handle] = self
+                self._users.active_by_team[self.team][self.handle] = self
+                self._users.names.add(self.handle, self._username)
 
     @property
     def is_active(self) -> bool:
         """Return True if user is active."""
 
-        return self.n_status_checks < self._max_status_checks
+        return self._n_status_checks < self._max_status_checks
 
     @property
     def points(self) -> int:
@@ -183,6 +351,14 @@ class User:
 
         return Team.RED if self.team == Team.BLU else Team.BLU
 
+    @property
+    def opponents(self) -> Iterator[User]:
+        """Yield users this user has killed or been killed by; except archived users."""
+
+        for handle in self._users.duels.opponents(self.handle):
+            if isinstance(user := self._users.users_by_handle[handle], User):
+                yield user
+
     @property
     def moniker(self) -> str:
         """Return name, optionally including his kill/death ratio."""
@@ -199,11 +375,10 @@ class User:
             self._clean_username, self.nkills, self.ndeaths, self.nkills / self.ndeaths
         )
 
-    def duel_as_str(self, opponent: User, formatted: bool = False) -> str:
+    def duel_as_str(self, opponent: User | ArchivedUser, formatted: bool = False) -> str:
         """Return string showing win/loss record against `opponent`."""
 
-        nkills = self.nkills_by_opponent.get(opponent.key, 0)
-        ndeaths = self.ndeaths_by_opponent.get(opponent.key, 0)
+        nkills, ndeaths = self._users.duels.duel(self.handle, opponent.handle)
         return f"{nkills:2} and {ndeaths:2}" if formatted else f"{nkills} and {ndeaths}"
 
     def __repr__(self) -> str:
@@ -215,9 +390,9 @@ class User:
         """Take and return a snapshot of current stats."""
 
         return UserStats(
-            self,
-            self.last_killer,
-            self.last_victim,
+            self.handle,
+            self._last_killer,
+            self._last_victim,
             self.role,
             self.weapon_state,
             self.nkills,
@@ -228,23 +403,17 @@ class User:
     def format_user_stats(self) -> Iterator[str]:
         """Return most recent kill and most recent death in reverse chronological order."""
 
-        kills: list[Kill] = []
-
-        if len(self.kills) > 0:
-            kills.append(self.kills[-1])
-        if len(self.deaths) > 0:
-            kills.append(self.deaths[-1])
+        ledger = self._users.kills
+        kills = [x for x in (ledger.last_kill(self.handle), ledger.last_death(self.handle)) if x]
 
         for kill in sorted(kills, key=lambda x: -x.timestamp):
-            if self == kill.killer.user:
-                opponent = kill.victim.user
+            if kill.killer == self.handle:
+                opponent = self._users.users_by_handle[kill.victim]
                 label = "[last-Victim]"
             else:
-                opponent = kill.killer.user
+                opponent = self._users.users_by_handle[kill.killer]
                 label = "[last-Killer]"
 
-            assert opponent
-
             yield " ".join(
                 [
                     time.strftime("%T", time.localtime(kill.timestamp)),
@@ -252,18 +421,67 @@ class User:
                     self.duel_as_str(opponent, formatted=True),
                     "vs",
                     f"{opponent.username:20.20}",
-                    opponent.weapon_state or "",
+                    weapon_state_name(kill.weapon_state),
                 ]
             )
 
+    def archive(self) -> ArchivedUser:
+        """Return archived record of this user, moving their duel weapons into it.
+
+        Also drop this user's heavier attributes, as `Chat`s displayed in
+        the chat windows may keep this object alive.
+        """
+
+        record = ArchivedUser(
+            self.handle,
+            self.username,
+            self._userid,
+            self._steamid,
+            self.role,
+            self.display_level,
+            self.nsnipes,
+            self.ncaptures,
+            self.ndefenses,
+            self.nkills,
+            self.ndeaths,
+            self.kdratio,
+            self._users.duels.pop_weapons(self.handle),
+        )
+
+        self.chats.clear()
+        self.actions.clear()
+        self.last_scoreboard_line = ""
+        self.steamplayer = None
+        self.player = None
+        return record
+
+    @classmethod
+    def restore(cls, record: ArchivedUser, users: Users) -> User:
+        """Return (inactive and unindexed) user restored from archived `record`."""
+
+        user = cls(record.username, record.handle, users)
+        user._userid = record.userid
+        user._steamid = record.steamid
+        user.role = record.role
+        user.display_level = record.display_level
+        user.nsnipes = record.nsnipes
+        user.ncaptures = record.ncaptures
+        user.ndefenses = record.ndefenses
+        user.nkills = record.nkills
+        user.ndeaths = record.ndeaths
+        user.kdratio = record.kdratio
+        user._n_status_checks = cls._max_status_checks
+        users.duels.push_weapons(record.weapons)
+        return user
+
     @property
     def team(self) -> Team | None:
-        """Return user's `Team`."""
-        return self._team
+        """Return user's `Team`, if known; see `Users.teams`."""
+        return self._users.teams.team(self.handle)
 
     @team.setter
     def team(self, team: Team | str) -> None:
-        """Assign this user to `team`."""
+        """Assign this user to `team`; and any users whose team this implies."""
 
         if isinstance(team, str):
             if team == Team.RED.name:
@@ -274,22 +492,7 @@ class User:
                 logger.critical(f"bad team {team!r}")
                 return
 
-        if not self.team:
-            logger.info(f"{self} joins {team}")
-
-        elif self.team != team:
-            logger.debug(f"{self} change from {self.team} to {team}")
-
-        self._team = team
-        self.dirty = True
-
-        # assign any unassigned opponents
-
-        for opponent in self.opponents.values():
-            if not opponent.team:
-                opponent.team = self.opposing_team
-            if not self.team:
-                self.team = opponent.opposing_team
+        self._users.teams_changed(self._users.teams.assign(self.handle, team))
 
     def vet(self) -> None:
         """Vet this player, whose `steamid` has just been obtained."""
@@ -297,7 +500,7 @@ class User:
         assert self.steamid
         self.dirty = True
 
-        self.steamplayer = tf2mon.steam_web_api.fetch_steamid(self.steamid.id)
+        self.steamplayer = tf2mon.steam_web_api.fetch_steamid(accountid(self.steamid))
         if self.steamplayer.is_gamebot:
             self.steamplayer.personaname = self.username
             self.pending_attrs = []
@@ -307,7 +510,7 @@ class User:
         self.age = self.steamplayer.age
 
         # known hacker?
-        self.player = Player.fetch_steamid(self.steamid.id)
+        self.player = Player.fetch_steamid(accountid(self.steamid))
         if self.player:
             # logger.log("Player", self.player.astuple())
             self.player.setattrs(self.pending_attrs)
@@ -317,7 +520,7 @@ class User:
             self.display_level = self.player.display_level
             # logger.log(self.display_level, f"{self._clean_username!r} is here")
             # bobo2
-            self.pending_attrs = None
+            self.pending_attrs = []
             if self.player.is_banned:
                 self.do_kick()
             return
@@ -326,12 +529,14 @@ class User:
         # Have we tried to kick them, but had to spool the work because
         # `steamid` wasn't available yet?
         if self.pending_attrs:
-            self.player = Player.new_player(self.steamid.id, self.pending_attrs, self.username)
+            self.player = Player.new_player(
+                accountid(self.steamid), self.pending_attrs, self.username
+            )
             # bobo1
             self.display_level = self.player.display_level
             logger.log(self.display_level, f"{self} created {self.player}")
             # bobo2
-            self.pending_attrs = None
+            self.pending_attrs = []
             if self.player.is_banned:
                 self.do_kick()
 
@@ -356,11 +561,11 @@ class User:
                 logger.info(f"{self} player {self.player} already {attr}")
         else:
             self.player = Player.new_player(
-                self.steamid.id, [attr] + self.pending_attrs, self.username
+                accountid(self.steamid), [attr] + self.pending_attrs, self.username
             )
             self.display_level = self.player.display_level
             logger.log(self.display_level, f"{self} created {self.player}")
-            self.pending_attrs = None
+            self.pending_attrs = []
 
         if self.player.is_banned:
             self.do_kick()
@@ -1,38 +1,88 @@
 """Collection of `User` objects."""
 
 import re
-from typing import Iterator
+from typing import Any, Iterator
 
-from fuzzywuzzy import fuzz  # type: ignore
 from loguru import logger
 
 import tf2mon
+from tf2mon.duels import DuelMatrix
+from tf2mon.killledger import KillLedger
+from tf2mon.nameindex import NameIndex
 from tf2mon.player import Player
+from tf2mon.playeralias import search_banned_aliases
 from tf2mon.racist import is_racist_text
-from tf2mon.user import Team, User, UserKey
+from tf2mon.teams import TeamInference
+from tf2mon.user import ArchivedUser, Team, User, UserHandle, UserKey
 
 
 class Users:
-    """Collection of `User`s."""
+    """Collection of `User`s.
+
+    Secondary indexes (`users_by_userid`, `users_by_steamid`, `active`,
+    `active_by_team`, `inactive` and `names`) are maintained by the `User`
+    setters of `userid`, `steamid`, `n_status_checks`, `team` and
+    `username`, and by `teams_changed`; `check_indexes` verifies them.
+    `users_by_username` is kept by current name by the `username` setter.
+
+    Teams are held by `teams`, which infers them from what is known of
+    some users (lobby, captures) and how users relate (team chats, kills);
+    see `same_team` and `opposite_teams`.
+
+    Users inactive for `archive_after` more pushes are archived: replaced
+    by a lightweight `ArchivedUser`, and dropped from all indexes but
+    `users_by_handle`. They are restored when they reconnect.
+    """
+
+    # Number of pushes a user may remain inactive before being archived.
+    archive_after = 5
 
     def __init__(self) -> None:
         """Initialize collection of `User`s."""
 
         self.users_by_username: dict[UserKey, User] = {}
+        self.users_by_handle: list[User | ArchivedUser] = []
+        self.duels = DuelMatrix()
+        self.kills = KillLedger()
+        self.users_by_userid: dict[int, User] = {}
         self.users_by_steamid: dict[int, User] = {}
         self.teams_by_steamid: dict[int, Team] = {}
+        # ordered sets of active users, all and by team (None is unassigned).
+        self.active: dict[UserHandle, User] = {}
+        self.active_by_team: dict[Team | None, dict[UserHandle, User]] = {
+            Team.BLU: {},
+            Team.RED: {},
+            None: {},
+        }
+        self.inactive: dict[UserHandle, User] = {}
+        # names of active users, for `_is_cheater_name`.
+        self.names: NameIndex[UserHandle] = NameIndex()
+        self.teams = TeamInference()
+        self.archived: dict[UserKey, ArchivedUser] = {}
+        self.archived_by_steamid: dict[int, ArchivedUser] = {}
+        # users seen since the last `check_status`.
+        self.seen: set[UserHandle] = set()
         self.me: User
         self.my: User
-        self._max_status_checks = 2
+        self._max_status_checks = 1
 
     def __getitem__(self, username: UserKey) -> User:
         """Create user `username` if non-existent, and return user `username`."""
 
         username = UserKey(username.replace(";", "."))
 
-        if not (user := self.users_by_username.get(username)):
-            user = User(username)
+        if not (user := self.users_by_username.get(username)) and (
+            record := self.archived.get(username)
+        ):
+            user = self.restore(record)
+
+        if not user:
+            user = User(username, UserHandle(len(self.users_by_handle)), self)
+            self.users_by_handle.append(user)
             self.users_by_username[UserKey(user.username)] = user
+            self.active[user.handle] = user
+            self.active_by_team[None][user.handle] = user
+            self.names.add(user.handle, user.username)
             logger.log("ADDUSER", user)
 
             if self._is_cheater_name(user):
@@ -41,16 +91,83 @@ class Users:
             if is_racist_text(username):
                 user.kick(Player.RACIST)
 
-        # reset inactivity counter
+            if not user.display_level:
+                self._is_banned_alias(user)
+
+        self.mark_seen(user)
+        return user
+
+    def mark_seen(self, user: User) -> None:
+        """Reset inactivity counter of `user`; now if inactive, else at next `check_status`."""
+
         if not user.is_active:
             logger.debug(f"Active again {user}")
+            user.n_status_checks = 0
+        self.seen.add(user.handle)
+
+    def find_username(self, username: str) -> User | None:
+        """Return user `username`, if not archived, else None."""
+
+        return self.users_by_username.get(UserKey(username.replace(";", ".")))
+
+    def find_steamid(self, steamid: int) -> User | None:
+        """Return user with `steamid`, restoring them if archived, else None."""
+
+        if user := self.users_by_steamid.get(steamid):
+            return user
+        if record := self.archived_by_steamid.get(steamid):
+            return self.restore(record)
+        return None
+
+    def archive(self, user: User) -> None:
+        """Replace inactive `user` with a lightweight `ArchivedUser`."""
+
+        assert not user.is_active
+        logger.debug(f"Archive {user}")
+        record = user.archive()
+        self.duels.archive(user.handle)
+
+        if self.users_by_username.get(key := UserKey(user.username)) is user:
+            del self.users_by_username[key]
+        if self.users_by_userid.get(user.userid) is user:
+            del self.users_by_userid[user.userid]
+        if user.steamid and self.users_by_steamid.get(user.steamid) is user:
+            del self.users_by_steamid[user.steamid]
+            self.archived_by_steamid[user.steamid] = record
+        del self.inactive[user.handle]
+
+        self.users_by_handle[user.handle] = record
+        self.archived[UserKey(record.username)] = record
+
+    def restore(self, record: ArchivedUser) -> User:
+        """Replace archived `record` with an active `User`, and return the user."""
+
+        user = User.restore(record, self)
+        logger.debug(f"Restore {user}")
+
+        del self.archived[UserKey(record.username)]
+        if record.steamid and self.archived_by_steamid.get(record.steamid) is record:
+            del self.archived_by_steamid[record.steamid]
+
+        self.users_by_handle[user.handle] = user
+        self.users_by_username[UserKey(user.username)] = user
+        if user.userid:
+            self.users_by_userid[user.userid] = user
+        if user.steamid:
+            self.users_by_steamid[user.steamid] = user
+        self.inactive[user.handle] = user
         user.n_status_checks = 0
         return user
 
     def active_users(self) -> Iterator[User]:
         """Yield active users (unsorted)."""
 
-        yield from [x for x in self.users_by_username.values() if x.is_active]
+        yield from self.active.values()
+
+    def team_users(self, team: Team | None) -> Iterator[User]:
+        """Yield active users on `team`, or not assigned to a team (unsorted)."""
+
+        yield from self.active_by_team[team].values()
 
     def sorted(self) -> Iterator[User]:
         """Yield active users in sort order."""
@@ -63,9 +180,8 @@ class Users:
     def kick_userid(self, userid: int, attr: str) -> None:
         """Kick `userid` reason `attr`."""
 
-        users = [x for x in self.users_by_username.values() if x.userid == userid]
-        if len(users) == 1:
-            users[0].kick(attr)
+        if user := self.users_by_userid.get(userid):
+            user.kick(attr)
         else:
             logger.error(f"bad userid {userid!r}")
 
@@ -83,20 +199,109 @@ class Users:
         We are called in response to TF2MON-PUSH; which may have came long
         before `status` finished sending everything; and we don't have a
         way to detect when `status` finishes; so we'll never be completely
-        current. That's why `_max_status_checks` should be at least 2 or 3.
+        current. Instead, users not `seen` (in `status`, or any other event)
+        since the previous call, a whole `status` ago, are counted.
         """
 
-        for user in [x for x in self.users_by_username.values() if x != self.me]:
-            was_active = user.is_active
+        inactive = list(self.inactive.values())
+
+        for user in [x for x in self.active.values() if x != self.me]:
+            if user.handle not in self.seen:
+                user.n_status_checks += 1
+                if not user.is_active:
+                    logger.log("INACTIVE", user)
+
+        for user in inactive:
             user.n_status_checks += 1
-            if was_active and not user.is_active:
-                logger.log("INACTIVE", user)
+            if user.n_status_checks >= self._max_status_checks + self.archive_after:
+                self.archive(user)
+
+        self.seen.clear()
 
     def switch_teams(self) -> None:
         """Switch teams."""
 
-        for user in self.active_users():
-            user.team = user.opposing_team
+        self.teams.switch()
+        by_team = self.active_by_team
+        by_team[Team.BLU], by_team[Team.RED] = by_team[Team.RED], by_team[Team.BLU]
+
+    def same_team(self, user: User, other: User) -> None:
+        """Record that `user` and `other` are on the same team."""
+
+        self.teams_changed(self.teams.same(user.handle, other.handle))
+
+    def opposite_teams(self, user: User, other: User) -> None:
+        """Record that `user` and `other` are on opposite teams."""
+
+        self.teams_changed(self.teams.opposite(user.handle, other.handle))
+
+    def teams_changed(self, handles: list[UserHandle]) -> None:
+        """Update indexes of users whose team `teams` has just changed or resolved."""
+
+        for handle in handles:
+            if not isinstance(user := self.users_by_handle[handle], User):
+                continue  # archived.
+
+            team = user.team
+            old_team = None
+            if user.is_active:
+                for key, members in self.active_by_team.items():
+                    if members.pop(handle, None):
+                        old_team = key
+                        break
+                self.active_by_team[team][handle] = user
+
+            if not old_team:
+                logger.info(f"{user} joins {team}")
+            else:
+                logger.debug(f"{user} change from {old_team} to {team}")
+            user.dirty = True
+
+    def check_indexes(self) -> list[str]:
+        """Rebuild secondary indexes from scratch and return any differences."""
+
+        errors: list[str] = []
+
+        def _check(name: str, actual: dict[Any, Any], expected: dict[Any, Any]) -> None:
+            if actual != expected:
+                errors.append(f"{name}: have {actual} expected {expected}")
+
+        users = [x for x in self.users_by_handle if isinstance(x, User)]
+        records = [x for x in self.users_by_handle if isinstance(x, ArchivedUser)]
+        _check(
+            "users_by_userid",
+            self.users_by_userid,
+            {x.userid: x for x in users if x.userid},
+        )
+        _check(
+            "users_by_steamid",
+            self.users_by_steamid,
+            {x.steamid: x for x in users if x.steamid},
+        )
+        _check("active", self.active, {x.handle: x for x in users if x.is_active})
+        _check(
+            "names",
+            {x.handle: self.names.get(x.handle) for x in self.users_by_handle},
+            {
+                x.handle: x.username if isinstance(x, User) and x.is_active else None
+                for x in self.users_by_handle
+            },
+        )
+        _check("inactive", self.inactive, {x.handle: x for x in users if not x.is_active})
+        _check("archived", self.archived, {UserKey(x.username): x for x in records})
+        _check(
+            "archived_by_steamid",
+            self.archived_by_steamid,
+            {x.steamid: x for x in records if x.steamid},
+        )
+        for team, actual in self.active_by_team.items():
+            _check(
+                f"active_by_team[{team}]",
+                actual,
+                {x.handle: x for x in users if x.is_active and x.team == team},
+            )
+
+        return errors
 
     re_cheater_names = re.compile(
         "|".join(
@@ -110,14 +315,27 @@ class Users:
         )
     )
 
+    def _is_banned_alias(self, user: User) -> bool:
+        """Flag `user` as suspect if their name is close to an alias of a banned player."""
+
+        if not (matches := search_banned_aliases(user.username)):
+            return False
+
+        steamid, alias, ratio = matches[0]
+        logger.log("FUZZ", f"ratio {ratio} `{user.username}` vs {steamid} `{alias}`")
+        # Only flag; their steamid will tell whether this is the same player.
+        user.display_level = "SUSPECT"
+        tf2mon.ui.notify_operator = True
+        return True
+
     def _is_cheater_name(self, user: User) -> bool:
 
         if self.re_cheater_names.search(user.username):
             return True
 
-        for _user in [x for x in self.active_users() if x.steamplayer and not x.player]:
-            ratio = fuzz.ratio(user.username, _user.username)
-            if ratio > 80:
+        for handle, ratio in self.names.search(user.username, 80):
+            _user = self.active[handle]
+            if _user.steamplayer and not _user.player:
                 logger.log("FUZZ", f"ratio {ratio} `{user.username}` vs `{_user.username}`")
                 # Careful, this might be a legitimate name-change, not a cheating name-stealer.
                 _user.cloner = user  # point the original user to the clone